@@ -0,0 +1,77 @@
+# app.py (project root)
+"""Prediction endpoint
+
+POST /predict  {"request_id": "...", "tracking": [{input row}, ...]}  -> predictions of the play(s)
+GET  /health   model version, micro-batcher and feature cache stats, latency percentiles
+Concurrent requests are collected by a MicroBatcher and predicted together by one
+PredictPipeline call; a full queue answers 503 with Retry-After instead of queueing more work.
+Tracking rows missing input columns or with non numeric values are answered 400 before batching.
+    python app.py            (serves on 0.0.0.0:8080, threaded)
+"""
+import sys
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pandas as pd
+from flask import Flask, jsonify, render_template, request
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.entity.config_entity import PredictPipelineConfig
+from src.nfl_game_competition.entity.predict_entity import PredictionRequest
+from src.nfl_game_competition.pipeline.predict_pipeline import PredictPipeline, validate_tracking
+from src.nfl_game_competition.utils.micro_batcher import MicroBatcher, QueueFullError
+
+logger = get_logger(name="nfl_game_competition.app")
+
+
+def create_app(config: PredictPipelineConfig | None = None) -> Flask:
+    config = config or PredictPipelineConfig()
+    pipeline = PredictPipeline(config)   # model loaded once, kept warm for the life of the process
+    batcher = MicroBatcher(pipeline.predict, max_batch_size=config.max_batch_size,
+                           max_wait_ms=config.max_wait_ms, max_queue_depth=config.max_queue_depth)
+    app = Flask(__name__)
+    app.config["PIPELINE"], app.config["BATCHER"] = pipeline, batcher
+
+    @app.get("/")
+    def index():
+        return render_template("index.html")
+
+    @app.post("/predict")
+    def predict():
+        payload = request.get_json(silent=True) or {}
+        if not isinstance(payload.get("tracking"), list) or not payload["tracking"]:
+            return jsonify({"error": "body must hold a non empty 'tracking' list of input rows"}), 400
+        try:
+            tracking = pd.DataFrame(payload["tracking"])
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": f"tracking rows are not a table: {e}"}), 400
+        # rejected before batching: a bad payload would otherwise fail the whole micro-batch first
+        error = validate_tracking(tracking)
+        if error is not None:
+            return jsonify({"error": error}), 400
+        try:
+            future = batcher.submit(PredictionRequest(tracking=tracking, request_id=payload.get("request_id")))
+        except QueueFullError as e:
+            return jsonify({"error": f"overloaded: {e}"}), 503, {"Retry-After": "1"}
+        try:
+            response = future.result(timeout=config.request_timeout_s)
+        except FutureTimeoutError:
+            return jsonify({"error": "prediction timed out"}), 504
+        except Exception as e:
+            logger.error(f"Prediction failed: {e}")
+            return jsonify({"error": str(e)}), 500
+        return jsonify({"request_id": response.request_id, "model_version": response.model_version,
+                        "batch_size": response.batch_size, "latency_ms": round(response.latency_ms, 3),
+                        "predictions": response.predictions.to_dict(orient="records")})
+
+    @app.get("/health")
+    def health():
+        report = pipeline.latency.report()
+        return jsonify({"model_version": pipeline.model_version, "batcher": batcher.stats(),
+                        "feature_cache": pipeline.feature_cache.stats(),
+                        "latency": {"count": report.count, "mean_ms": report.mean_ms, **report.percentiles_ms}})
+
+    return app
+
+
+if __name__ == "__main__":
+    create_app().run(host="0.0.0.0", port=int(sys.argv[1]) if len(sys.argv) > 1 else 8080, threaded=True)
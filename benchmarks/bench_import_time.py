@@ -0,0 +1,77 @@
+"""Import time budget of the entry points
+
+Imports every entry point module in a fresh interpreter (nothing cached in sys.modules), takes the
+best wall time of --repeat runs and the slowest top level imports from -X importtime. pandas is the
+floor every entry point pays; the import time on top of it (what the repo itself loads) is measured
+separately, in process. Prints one json line and exits with status 1 when an entry point is over
+--budget-s in total or over --overhead-budget-s on top of pandas, so it can gate a CI job.
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --budget-s 1.5 --overhead-budget-s 0.3 --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ENTRY_POINTS = ["main", "app", "src.nfl_game_competition.pipeline.train_pipeline",
+                "src.nfl_game_competition.pipeline.predict_pipeline"]
+# must stay out of the import of every entry point, they are loaded when a stage / model needs them
+DEFERRED = ["kaggle", "sklearn", "scipy", "joblib", "pyarrow.dataset", "pyarrow.parquet"]
+OVERHEAD_BUDGET_S = 0.5  # import time of an entry point on top of `import pandas`
+
+
+def import_once(module: str) -> dict:
+    """wall time and self-reported import profile of `import module` in a new interpreter"""
+    code = (f"import sys, json; import {module}; "
+            f"print(json.dumps(sorted(m for m in {DEFERRED!r} if m in sys.modules)))")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                            check=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"})
+    seconds = time.perf_counter() - start
+    slowest = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            depth = (len(parts[2]) - len(parts[2].lstrip()) - 1) // 2
+            if 1 <= depth <= 2:  # what the entry point pulls in, not the entry point itself
+                slowest.append((int(parts[1]), parts[2].strip()))
+    return {"seconds": seconds, "deferred_loaded": json.loads(result.stdout.strip().splitlines()[-1]),
+            "slowest_ms": {name: round(us / 1000, 1) for us, name in sorted(slowest, reverse=True)[:5]}}
+
+
+def import_overhead(module: str) -> float:
+    """seconds `import module` takes in a new interpreter after pandas is already imported"""
+    code = ("import time; import pandas; start = time.perf_counter(); "
+            f"import {module}; print(time.perf_counter() - start)")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"})
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=ENTRY_POINTS)
+    parser.add_argument("--budget-s", type=float, default=1.0)
+    parser.add_argument("--overhead-budget-s", type=float, default=OVERHEAD_BUDGET_S,
+                        help="budget of the import time on top of pandas")
+    parser.add_argument("--repeat", type=int, default=3, help="best of n, the first run also warms the os file cache")
+    args = parser.parse_args()
+
+    report, over = {}, []
+    for module in args.modules:
+        runs = [import_once(module) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        overhead = min(import_overhead(module) for _ in range(args.repeat))
+        report[module] = {"seconds": round(best["seconds"], 3), "overhead_s": round(overhead, 3),
+                          "deferred_loaded": best["deferred_loaded"], "slowest_ms": best["slowest_ms"]}
+        if best["seconds"] > args.budget_s or overhead > args.overhead_budget_s or best["deferred_loaded"]:
+            over.append(module)
+    print(json.dumps({"benchmark": "import_time", "budget_s": args.budget_s,
+                      "overhead_budget_s": args.overhead_budget_s, "over_budget": over, "modules": report}))
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
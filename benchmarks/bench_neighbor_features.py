@@ -0,0 +1,52 @@
+"""Neighbour feature throughput
+
+Synthetic frames of 22 players (11 per side), timed through compute_neighbor_features.
+    python benchmarks/bench_neighbor_features.py --frames 50000 --repeat 3
+Prints one json line: rows, frames, best seconds, rows/sec, frames/sec.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.nfl_game_competition.components.data_transformation import compute_neighbor_features
+
+
+def synthetic_frames(n_frames: int, players: int = 22, seed: int = 42) -> dict:
+    rng = np.random.default_rng(seed)
+    n = n_frames * players
+    frame = np.repeat(np.arange(n_frames), players)
+    return {"game_id": np.full(n, 2023090700, dtype=np.int64),
+            "play_id": (frame // 100).astype(np.int64),
+            "frame_id": (frame % 100).astype(np.int64),
+            "offense": np.tile(np.arange(players) < players // 2, n_frames),
+            "targeted": np.tile(np.arange(players) == 0, n_frames),
+            "x": rng.uniform(0, 120, n).astype(np.float32), "y": rng.uniform(0, 53.3, n).astype(np.float32),
+            "vx": rng.normal(0, 3, n).astype(np.float32), "vy": rng.normal(0, 3, n).astype(np.float32)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=50_000)
+    parser.add_argument("--players", type=int, default=22)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--radius", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = synthetic_frames(args.frames, args.players)
+    rows = len(data["x"])
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        compute_neighbor_features(**data, k=args.k, radius=args.radius)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(json.dumps({"benchmark": "neighbor_features", "rows": rows, "frames": args.frames,
+                      "seconds": round(best, 4), "rows_per_sec": round(rows / best),
+                      "frames_per_sec": round(args.frames / best)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Physics baseline throughput
+
+Synthetic last-frame states timed through PhysicsBaselinePredictor.predict_trajectories.
+    python -m benchmarks.bench_physics_baseline --players 1000000 --mode ca --steer 0.5
+Prints one json line: players, frames, best seconds, trajectories/sec, positions/sec.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.nfl_game_competition.pipeline.predict_pipeline import PhysicsBaselinePredictor
+
+
+def synthetic_last_frames(players: int, max_frames: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"game_id": np.full(players, 2023090700), "play_id": np.arange(players) // 22,
+                         "nfl_id": np.arange(players), "frame_id": np.ones(players, dtype=np.int16),
+                         "x": rng.uniform(0, 120, players), "y": rng.uniform(0, 53.3, players),
+                         "s": rng.uniform(0, 9, players), "a": rng.uniform(0, 4, players),
+                         "dir": rng.uniform(0, 360, players),
+                         "ball_land_x": rng.uniform(0, 120, players), "ball_land_y": rng.uniform(0, 53.3, players),
+                         "num_frames_output": rng.integers(5, max_frames + 1, players)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--max-frames", type=int, default=30)
+    parser.add_argument("--mode", default="cv", choices=["cv", "ca"])
+    parser.add_argument("--steer", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_last_frames(args.players, args.max_frames)
+    predictor = PhysicsBaselinePredictor(mode=args.mode, steer=args.steer)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        _, _, mask = predictor.predict_trajectories(df)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(json.dumps({"benchmark": "physics_baseline", "mode": args.mode, "steer": args.steer,
+                      "players": args.players, "positions": int(mask.sum()), "seconds": round(best, 4),
+                      "trajectories_per_sec": round(args.players / best),
+                      "positions_per_sec": round(int(mask.sum()) / best)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Predict pipeline latency
+
+Replays the plays of a feature store one request at a time through PredictPipeline and prints
+the latency percentiles as one json line. Needs a promoted model in models/saved_models
+(otherwise the physics baseline is timed).
+    python -m benchmarks.bench_predict_latency --feature-store artifacts/<run>/data_ingestion/feature_store/merged_data.parquet
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.nfl_game_competition.entity.predict_entity import PredictionRequest
+from src.nfl_game_competition.pipeline.predict_pipeline import PredictPipeline
+from src.nfl_game_competition.utils.common import load_feature_store, play_keys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feature-store", required=True)
+    parser.add_argument("--plays", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=1, help="plays per request")
+    args = parser.parse_args()
+
+    df = load_feature_store(args.feature_store)
+    keys = play_keys(df["game_id"].to_numpy(), df["play_id"].to_numpy())
+    plays = np.unique(keys)[:args.plays]
+    groups = [df[np.isin(keys, plays[i:i + args.batch])] for i in range(0, len(plays), args.batch)]
+
+    start = time.perf_counter()
+    pipeline = PredictPipeline()
+    warmup_ms = (time.perf_counter() - start) * 1000.0
+    start = time.perf_counter()
+    for i, tracking in enumerate(groups):
+        pipeline.predict([PredictionRequest(tracking=tracking, request_id=str(i))])
+    seconds = time.perf_counter() - start
+    report = pipeline.latency.report()
+    print(json.dumps({"benchmark": "predict_latency", "requests": len(groups), "plays_per_request": args.batch,
+                      "model_version": pipeline.model_version, "warmup_ms": round(warmup_ms, 2),
+                      "requests_per_sec": round(len(groups) / seconds, 1),
+                      "latency_ms": {k: round(v, 3) for k, v in report.percentiles_ms.items()},
+                      "mean_ms": round(report.mean_ms, 3)}))
+
+
+if __name__ == "__main__":
+    main()
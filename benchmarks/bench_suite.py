@@ -0,0 +1,277 @@
+"""Pipeline stage benchmark suite
+
+Times the ingestion / transformation stages on synthetic week files (benchmarks.synthetic_data) and
+records their peak memory. Every case runs in a fresh interpreter, so the peak resident memory of
+one case is not inherited from the one before; process pool workers are reported separately.
+Results are written as json (commit, scale, per case seconds / rows/sec / peak MB) so two commits
+can be compared, and --compare exits with status 1 when a case got slower or bigger than allowed.
+    python -m benchmarks.bench_suite --scale 1
+    python -m benchmarks.bench_suite --scale 5 --cases load_data merge_all_input_output
+    python -m benchmarks.bench_suite --scale 1 --compare artifacts/benchmarks/results/<commit>_x1.json
+
+Nothing outside --work-dir is written: the feature store, manifest, split keys and the schema the
+merge writes are all redirected there, data_schema/schema.yaml is only read.
+A new stage becomes a case by adding a (setup, run) pair to CASES.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from benchmarks.synthetic_data import META_FILE_NAME, write_weeks
+
+RESULTS_DIR = os.path.join("artifacts", "benchmarks", "results")
+DATA_DIR = os.path.join("artifacts", "benchmarks", "data")
+WORK_DIR = os.path.join("artifacts", "benchmarks", "work")
+
+
+# ---------------------------- MEMORY ----------------------------
+def _status_mb(field: str) -> Optional[float]:
+    """VmRSS / VmHWM of this process from /proc, None where /proc is not available"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak() -> None:
+    """restart the VmHWM high water mark (linux), so the peak covers only the timed call"""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _maxrss_mb(who: int) -> float:
+    import resource
+    unit = 1 if sys.platform == "darwin" else 1024  # bytes on macos, kilobytes on linux
+    return resource.getrusage(who).ru_maxrss * unit / (1 << 20)
+
+
+# ---------------------------- CASES ----------------------------
+class Context:
+    """configs of one benchmark run with every output path moved into the work dir"""
+    def __init__(self, data_dir: str, work_dir: str):
+        from src.nfl_game_competition.entity.config_entity import (TrainingPipelineConfig, DataIngestionConfig,
+                                                                   DataTransformationConfig)
+        self.data_dir, self.work_dir = data_dir, work_dir
+        pipeline_config = TrainingPipelineConfig()
+        pipeline_config.artifact_dir = work_dir
+
+        self.ingestion = DataIngestionConfig(training_pipeline_config=pipeline_config)
+        self.ingestion.feature_store_filepath = os.path.join(work_dir, "feature_store", "merged_data.parquet")
+        self.ingestion.manifest_filepath = os.path.join(work_dir, "feature_store", "ingestion_manifest.json")
+        self.ingestion.training_filepath = os.path.join(work_dir, "split", "train_keys.npy")
+        self.ingestion.testing_filepath = os.path.join(work_dir, "split", "test_keys.npy")
+        self.ingestion.generated_schema_file_path = os.path.join(work_dir, "feature_store", "feature_store_schema.yaml")
+
+        self.transformation = DataTransformationConfig(training_pipeline_config=pipeline_config)
+
+    def input_file(self) -> str:
+        return os.path.join(self.data_dir, "train", "input_2023_w01.csv")
+
+    def data_ingestion(self):
+        from src.nfl_game_competition.components.data_ingestion import DataIngestion
+        return DataIngestion(config=self.ingestion)
+
+    def ingestion_artifact(self):
+        from src.nfl_game_competition.entity.artifact_entity import DataIngestionArtifact
+        return DataIngestionArtifact(feature_store_file_path=self.ingestion.feature_store_filepath,
+                                     train_file_path=self.ingestion.training_filepath,
+                                     test_file_path=self.ingestion.testing_filepath)
+
+
+def _no_setup(ctx: Context) -> dict:
+    return {}
+
+
+def _setup_loaded_week(ctx: Context) -> dict:
+    from src.nfl_game_competition.utils.common import load_data
+    return {"df": load_data(Path(ctx.input_file()))}
+
+
+def _setup_clean_store(ctx: Context) -> dict:
+    shutil.rmtree(os.path.dirname(ctx.ingestion.feature_store_filepath), ignore_errors=True)
+    return {}
+
+
+def _setup_feature_store(ctx: Context) -> dict:
+    """feature store of the data dir, merged once and then reused through the ingestion manifest"""
+    ctx.data_ingestion()._merge_all_input_output(unzipped_dir=ctx.data_dir)
+    return {}
+
+
+def _setup_split(ctx: Context) -> dict:
+    ingestion = ctx.data_ingestion()
+    ingestion._train_test_split_and_save(ingestion._merge_all_input_output(unzipped_dir=ctx.data_dir))
+    return {}
+
+
+def _run_load_data(ctx: Context, state: dict) -> int:
+    from src.nfl_game_competition.utils.common import load_data
+    return len(load_data(Path(ctx.input_file())))
+
+
+def _run_save_data(ctx: Context, state: dict) -> int:
+    from src.nfl_game_competition.utils.common import save_data
+    save_data(Path(ctx.work_dir) / "save_data.csv", state["df"])
+    return len(state["df"])
+
+
+def _store_rows(ctx: Context) -> int:
+    """feature store rows, as recorded per week in the ingestion manifest"""
+    with open(ctx.ingestion.manifest_filepath) as manifest_file:
+        return int(sum(week["rows"] for week in json.load(manifest_file)["weeks"].values()))
+
+
+def _run_merge(ctx: Context, state: dict) -> int:
+    ctx.data_ingestion()._merge_all_input_output(unzipped_dir=ctx.data_dir)
+    return _store_rows(ctx)
+
+
+def _run_split(ctx: Context, state: dict) -> int:
+    ctx.data_ingestion()._train_test_split_and_save(Path(ctx.ingestion.feature_store_filepath))
+    return _store_rows(ctx)
+
+
+def _run_transformation(ctx: Context, state: dict) -> int:
+    import numpy as np
+    from src.nfl_game_competition.components.data_transformation import DataTransformation
+    artifact = DataTransformation(data_ingestion_artifact=ctx.ingestion_artifact(),
+                                  config=ctx.transformation).initiate_data_transformation()
+    return int(sum(np.load(os.path.join(split_dir, ctx.transformation.features_file_name), mmap_mode="r").shape[0]
+                   for split_dir in (artifact.transformed_train_dir, artifact.transformed_test_dir)))
+
+
+# name -> (untimed setup, timed run returning the rows it processed); run in this order
+CASES: Dict[str, Tuple[Callable[[Context], dict], Callable[[Context, dict], int]]] = {
+    "load_data": (_no_setup, _run_load_data),
+    "save_data": (_setup_loaded_week, _run_save_data),
+    "merge_all_input_output": (_setup_clean_store, _run_merge),
+    "train_test_split_and_save": (_setup_feature_store, _run_split),
+    "data_transformation": (_setup_split, _run_transformation),
+}
+
+
+def run_case(name: str, data_dir: str, work_dir: str) -> dict:
+    """one case in this process: setup, then the timed call with its peak memory"""
+    import resource
+    ctx = Context(data_dir, work_dir)
+    setup, run = CASES[name]
+    state = setup(ctx)
+    rss_before = _status_mb("VmRSS")
+    _reset_peak()
+    children_before = _maxrss_mb(resource.RUSAGE_CHILDREN)
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    rows = run(ctx, state)
+    seconds, cpu_seconds = time.perf_counter() - start_wall, time.process_time() - start_cpu
+    peak = _status_mb("VmHWM") or _maxrss_mb(resource.RUSAGE_SELF)
+    children = _maxrss_mb(resource.RUSAGE_CHILDREN)
+    return {"seconds": round(seconds, 3), "cpu_seconds": round(cpu_seconds, 3), "rows": rows,
+            "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+            "peak_rss_mb": round(peak, 1),
+            "peak_rss_delta_mb": round(peak - rss_before, 1) if rss_before is not None else None,
+            "children_peak_rss_mb": round(children, 1) if children > children_before else 0.0}
+
+
+# ---------------------------- SUITE ----------------------------
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ensure_data(data_dir: str, scale: float, weeks: int, seed: int) -> dict:
+    """synthetic weeks of this scale, generated once and reused while the meta file matches"""
+    meta_path = os.path.join(data_dir, META_FILE_NAME)
+    if os.path.exists(meta_path):
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+        if (meta.get("scale"), meta.get("weeks"), meta.get("seed")) == (scale, weeks, seed):
+            return meta
+    shutil.rmtree(data_dir, ignore_errors=True)
+    return write_weeks(data_dir, scale, weeks, seed)
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """cases whose time or peak memory grew by more than tolerance (0.2 = 20 %) against the baseline"""
+    regressions = []
+    for name, case in result["cases"].items():
+        before = baseline.get("cases", {}).get(name)
+        if not before or "error" in case or "error" in before:
+            continue
+        for metric in ("seconds", "peak_rss_mb"):
+            if before.get(metric) and case[metric] > before[metric] * (1.0 + tolerance):
+                regressions.append({"case": name, "metric": metric, "baseline": before[metric],
+                                    "current": case[metric], "ratio": round(case[metric] / before[metric], 3)})
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="synthetic data scale, 1 = 560,426 merged rows")
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=1, help="fresh runs per case, the fastest is kept")
+    parser.add_argument("--data-dir", default=None, help=f"week files, default {DATA_DIR}/scale_<scale>")
+    parser.add_argument("--work-dir", default=WORK_DIR)
+    parser.add_argument("--output", default=None, help=f"result json, default {RESULTS_DIR}/<commit>_x<scale>.json")
+    parser.add_argument("--compare", default=None, help="result json of an earlier commit")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed growth against --compare")
+    parser.add_argument("--run-case", default=None, help=argparse.SUPPRESS)  # child process entry
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or os.path.join(DATA_DIR, f"scale_{args.scale:g}")
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, data_dir, args.work_dir)))
+        return
+
+    data = ensure_data(data_dir, args.scale, args.weeks, args.seed)
+    shutil.rmtree(args.work_dir, ignore_errors=True)
+    os.makedirs(args.work_dir)
+    cases = {}
+    for name in [case for case in CASES if case in args.cases]:
+        runs = []
+        for _ in range(args.repeat):
+            child = subprocess.run([sys.executable, "-m", "benchmarks.bench_suite", "--run-case", name,
+                                    "--data-dir", data_dir, "--work-dir", args.work_dir],
+                                   capture_output=True, text=True)
+            if child.returncode != 0:
+                runs = [{"error": child.stderr.strip().splitlines()[-1] if child.stderr.strip() else "failed"}]
+                break
+            runs.append(json.loads(child.stdout.strip().splitlines()[-1]))
+        cases[name] = min(runs, key=lambda run: run.get("seconds", float("inf")))
+
+    commit = _commit()
+    result = {"benchmark": "suite", "commit": commit, "created": datetime.now().isoformat(timespec="seconds"),
+              "python": sys.version.split()[0], "cpus": os.cpu_count(), "data": data, "cases": cases}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        result["baseline_commit"] = baseline.get("commit")
+        result["regressions"] = compare(result, baseline, args.tolerance)
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'worktree'}_x{args.scale:g}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as output_file:
+        json.dump(result, output_file, indent=2)
+    print(json.dumps(result))
+    failed = any("error" in case for case in cases.values())
+    sys.exit(1 if failed or result.get("regressions") else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Prediction endpoint load generator
+
+Fires concurrent single-play POST /predict requests built from a local feature store and prints
+throughput, client side latency percentiles, status counts and the server micro-batcher stats
+as one json line. Without --url the app is started in-process on a free local port, so nothing
+outside this machine is needed.
+    python -m benchmarks.load_generator --feature-store <feature_store dir> --concurrency 32 --requests 2000
+    python -m benchmarks.load_generator --feature-store <dir> --max-batch-size 1     (one request, one inference)
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.nfl_game_competition.utils.common import load_feature_store, play_keys
+
+INPUT_FIELDS = ["game_id", "play_id", "nfl_id", "frame_id", "play_direction", "x", "y", "s", "a", "dir", "o",
+                "ball_land_x", "ball_land_y", "num_frames_output", "player_side", "player_role",
+                "player_to_predict"]
+
+
+def play_payloads(feature_store: str, plays: int) -> list:
+    """one json body per play of the feature store"""
+    df = load_feature_store(feature_store)
+    df = df[[c for c in INPUT_FIELDS if c in df.columns]]
+    for c in df.columns:
+        if str(df[c].dtype) in ("category", "str", "object"):
+            df[c] = df[c].astype(str)
+    keys = play_keys(df["game_id"].to_numpy(), df["play_id"].to_numpy())
+    order = np.argsort(keys, kind="stable")
+    unique, starts = np.unique(keys[order], return_index=True)
+    bounds = np.append(starts, len(order))
+    return [json.dumps({"request_id": str(i), "tracking": df.iloc[order[bounds[i]:bounds[i + 1]]].to_dict("records")}).encode()
+            for i in range(min(plays, len(unique)))]
+
+
+def start_local_server(max_batch_size: int, max_wait_ms: float, max_queue_depth: int) -> str:
+    from werkzeug.serving import make_server
+    from app import create_app
+    from src.nfl_game_competition.entity.config_entity import PredictPipelineConfig
+
+    config = PredictPipelineConfig()
+    config.max_batch_size, config.max_wait_ms, config.max_queue_depth = max_batch_size, max_wait_ms, max_queue_depth
+    server = make_server("127.0.0.1", 0, create_app(config), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feature-store", required=True)
+    parser.add_argument("--url", default=None, help="running server, default: start one in-process")
+    parser.add_argument("--plays", type=int, default=200, help="distinct plays cycled through")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-queue-depth", type=int, default=256)
+    args = parser.parse_args()
+
+    payloads = play_payloads(args.feature_store, args.plays)
+    url = args.url or start_local_server(args.max_batch_size, args.max_wait_ms, args.max_queue_depth)
+
+    def fire(i: int):
+        body = payloads[i % len(payloads)]
+        req = urllib.request.Request(f"{url}/predict", data=body, headers={"Content-Type": "application/json"})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                resp.read()
+                status = resp.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        return status, (time.perf_counter() - start) * 1000.0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(fire, range(args.requests)))
+    seconds = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    ok_latency = np.array([ms for status, ms in results if status == 200])
+    with urllib.request.urlopen(f"{url}/health", timeout=10) as resp:
+        health = json.loads(resp.read())
+    print(json.dumps({"benchmark": "load_generator", "requests": args.requests, "concurrency": args.concurrency,
+                      "max_batch_size": args.max_batch_size, "seconds": round(seconds, 3),
+                      "requests_per_sec": round(args.requests / seconds, 1),
+                      "status": {str(k): v for k, v in sorted(statuses.items())},
+                      "client_latency_ms": ({f"p{p}": round(float(v), 2) for p, v in
+                                             zip((50, 90, 99), np.percentile(ok_latency, [50, 90, 99]))}
+                                            if ok_latency.size else {}),
+                      "server": health}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Synthetic competition week files
+
+Writes train/input_<season>_wNN.csv and train/output_<season>_wNN.csv with the columns, key order and value
+ranges of the competition data (data_schema/schema.yaml), so ingestion, transformation and the
+benchmark suite run offline at any scale. Scale 1 is the 560,426 merged rows of the real train weeks.
+    python -m benchmarks.synthetic_data --out-dir artifacts/benchmarks/data/scale_1 --scale 1
+    python -m benchmarks.synthetic_data --out-dir /data/nfl_x50 --scale 50 --zip
+
+The shape follows the real weeks: 10-15 tracked players per play (passer, receivers, coverage),
+one targeted receiver plus 1-4 defenders to predict, 10-40 input frames and 5-20 output frames at
+10 Hz, players moving on smooth paths and the predicted ones heading for the ball landing spot.
+Rows are generated and appended in play chunks, so memory stays flat whatever the scale.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import date, timedelta
+from typing import Dict, Tuple
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import numpy as np
+import pandas as pd
+
+BASE_ROWS = 560_426          # merged rows of the competition train weeks, schema.yaml metadata
+BASE_WEEKS = 18
+SEASON_START = date(2023, 9, 7)
+ARCHIVE_NAME = "nfl-big-data-bowl-2026-prediction.zip"   # DATA_INGESTION_SOURCE_URL + .zip
+META_FILE_NAME = "synthetic_meta.json"
+
+INPUT_COLS = ["game_id", "play_id", "player_to_predict", "nfl_id", "frame_id", "play_direction",
+              "absolute_yardline_number", "player_name", "player_height", "player_weight", "player_birth_date",
+              "player_position", "player_side", "player_role", "x", "y", "s", "a", "dir", "o",
+              "num_frames_output", "ball_land_x", "ball_land_y"]
+OUTPUT_COLS = ["game_id", "play_id", "nfl_id", "frame_id", "x", "y"]
+
+# roster of one team: positions of the players tracked in the competition data
+OFFENSE_POSITIONS = ["QB"] * 3 + ["WR"] * 7 + ["TE"] * 4 + ["RB"] * 4 + ["FB"]
+DEFENSE_POSITIONS = ["CB"] * 7 + ["SS"] * 3 + ["FS"] * 3 + ["OLB"] * 4 + ["MLB"] * 2 + ["ILB"] * 2 + ["DE"] * 3 + ["DT"] * 2
+N_TEAMS = 32
+FIRST_NAMES = ["James", "Michael", "Chris", "David", "Marcus", "Tyler", "Jordan", "Brandon", "Justin", "Kevin",
+               "Derek", "Aaron", "Jalen", "Tony", "Ryan", "Andre", "Darius", "Cameron", "Isaiah", "Trey"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Davis", "Miller", "Wilson", "Moore", "Taylor",
+              "Anderson", "Thomas", "Jackson", "White", "Harris", "Martin", "Thompson", "Robinson", "Clark", "Lewis"]
+MAX_RECEIVERS, MAX_DEFENDERS = 5, 9
+FPS = 10.0
+
+
+def build_rosters(rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """(N_TEAMS, roster size) player attributes; an nfl_id keeps the same attributes in every week"""
+    positions = np.array(OFFENSE_POSITIONS + DEFENSE_POSITIONS)
+    n = N_TEAMS * len(positions)
+    nfl_ids = np.sort(rng.choice(np.arange(30_000, 60_000), size=n, replace=False))
+    position = np.tile(positions, N_TEAMS)
+    inches = rng.integers(68, 78, n)
+    birth = [date(1990, 1, 1) + timedelta(days=int(d)) for d in rng.integers(0, 12 * 365, n)]
+    shape = (N_TEAMS, len(positions))
+    return {"nfl_id": nfl_ids.reshape(shape),
+            "position": position.reshape(shape),
+            "name": np.array([f"{FIRST_NAMES[i]} {LAST_NAMES[j]}" for i, j in
+                              zip(rng.integers(0, len(FIRST_NAMES), n), rng.integers(0, len(LAST_NAMES), n))],
+                             dtype=object).reshape(shape),
+            "height": np.array([f"{h // 12}-{h % 12}" for h in inches], dtype=object).reshape(shape),
+            "weight": (160 + (inches - 68) * 8 + rng.integers(0, 60, n)).reshape(shape),
+            "birth_date": np.array([d.isoformat() for d in birth], dtype=object).reshape(shape)}
+
+
+def _segment_cumsum(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """cumulative sum restarting at every segment of the given lengths"""
+    total = np.cumsum(values)
+    starts = np.cumsum(lengths) - lengths
+    offsets = np.repeat(total[starts] - values[starts], lengths)
+    return total - offsets
+
+
+def _plays(n_plays: int, week: int, rng: np.random.Generator, season: int = SEASON_START.year) -> pd.DataFrame:
+    """play level attributes, in (game_id, play_id) order"""
+    games = int(min(99, max(16, np.ceil(n_plays / 50))))
+    game_of_play = np.sort(rng.integers(0, games, n_plays))
+    kickoff = SEASON_START.replace(year=season) + timedelta(days=7 * (week - 1))
+    # ids as YYYYMMDDNN, the game number makes them unique within the week
+    game_ids = np.array([int(kickoff.strftime("%Y%m%d")) * 100 + g for g in range(games)], dtype=np.int64)
+    gaps = rng.integers(1, 41, n_plays)
+    first = np.r_[True, game_of_play[1:] != game_of_play[:-1]]
+    play_id = 50 + _segment_cumsum(gaps, np.diff(np.r_[np.flatnonzero(first), n_plays]))
+    if play_id.max() >= 1 << 14:
+        raise ValueError("scale too large: play ids exceed the packed key range, use more weeks")
+    n_out = rng.integers(5, 21, n_plays)
+    return pd.DataFrame({"game": game_of_play, "game_id": game_ids[game_of_play], "play_id": play_id,
+                         "offense_team": rng.integers(0, N_TEAMS, n_plays),
+                         "defense_shift": rng.integers(1, N_TEAMS, n_plays),
+                         "play_direction": rng.choice(np.array(["left", "right"], dtype=object), n_plays),
+                         "yardline": rng.integers(10, 111, n_plays),
+                         "n_out": n_out, "n_in": rng.integers(np.maximum(n_out, 10), 41),
+                         "n_receivers": rng.integers(3, MAX_RECEIVERS + 1, n_plays),
+                         "n_defenders": rng.integers(6, MAX_DEFENDERS + 1, n_plays),
+                         "n_coverage": rng.integers(1, 5, n_plays)})
+
+
+def _players(plays: pd.DataFrame, rosters: Dict[str, np.ndarray], rng: np.random.Generator) -> pd.DataFrame:
+    """one row per tracked player of every play"""
+    n_plays = len(plays)
+    n_offense = len(OFFENSE_POSITIONS)
+    offense = plays["offense_team"].to_numpy()
+    defense = (offense + plays["defense_shift"].to_numpy()) % N_TEAMS
+    # passer: first QB of the offense; receivers / defenders: random picks without replacement
+    receivers = 3 + np.argsort(rng.random((n_plays, n_offense - 3)), axis=1)[:, :MAX_RECEIVERS]
+    defenders = n_offense + np.argsort(rng.random((n_plays, len(DEFENSE_POSITIONS))), axis=1)[:, :MAX_DEFENDERS]
+    slots = np.concatenate([np.zeros((n_plays, 1), dtype=np.int64), receivers, defenders], axis=1)
+    team = np.concatenate([np.repeat(offense[:, None], 1 + MAX_RECEIVERS, 1),
+                           np.repeat(defense[:, None], MAX_DEFENDERS, 1)], axis=1)
+    column = np.arange(slots.shape[1])
+    n_receivers, n_defenders = plays["n_receivers"].to_numpy()[:, None], plays["n_defenders"].to_numpy()[:, None]
+    used = (column <= n_receivers) | ((column > MAX_RECEIVERS) & (column <= MAX_RECEIVERS + n_defenders))
+    role = np.where(column == 0, "Passer", np.where(column == 1, "Targeted Receiver",
+                    np.where(column <= MAX_RECEIVERS, "Other Route Runner", "Defensive Coverage")))
+    role = np.broadcast_to(role, slots.shape)
+    predict = (column == 1) | ((column > MAX_RECEIVERS) & (column <= MAX_RECEIVERS + plays["n_coverage"].to_numpy()[:, None]))
+
+    play_index = np.broadcast_to(np.arange(n_plays)[:, None], slots.shape)[used]
+    team, slot = team[used], slots[used]
+    players = pd.DataFrame({"play": play_index, "nfl_id": rosters["nfl_id"][team, slot],
+                            "player_to_predict": predict[used], "player_role": role[used],
+                            "player_side": np.where(slot < n_offense, "Offense", "Defense"),
+                            "player_name": rosters["name"][team, slot], "player_height": rosters["height"][team, slot],
+                            "player_weight": rosters["weight"][team, slot],
+                            "player_birth_date": rosters["birth_date"][team, slot],
+                            "player_position": rosters["position"][team, slot]})
+    return players.sort_values(["play", "nfl_id"], kind="stable", ignore_index=True)
+
+
+def generate_chunk(plays: pd.DataFrame, rosters: Dict[str, np.ndarray],
+                   rng: np.random.Generator) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """input / output rows of a slice of plays, both in (game_id, play_id, nfl_id, frame_id) order"""
+    players = _players(plays, rosters, rng)
+    p = players["play"].to_numpy()
+    n_players = len(players)
+    toward = np.where(plays["play_direction"].to_numpy() == "right", 1.0, -1.0)[p]
+    los = (plays["yardline"].to_numpy() + 10.0)[p]
+    offense = players["player_side"].to_numpy() == "Offense"
+    x0 = los - toward * np.where(offense, rng.uniform(0, 8, n_players), rng.uniform(-12, -1, n_players))
+    y0 = rng.uniform(5, 48.3, n_players)
+    heading = np.where(toward > 0, 90.0, 270.0) + rng.normal(0, 35, n_players)
+    speed = rng.gamma(2.0, 1.6, n_players)
+    ball_x = np.clip(plays["yardline"].to_numpy() + 10.0 + np.where(plays["play_direction"].to_numpy() == "right", 1, -1)
+                     * rng.uniform(5, 40, len(plays)), 1, 119)
+    ball_y = rng.uniform(3, 50.3, len(plays))
+
+    # input frames: speed / heading drift frame by frame, positions integrate the velocity
+    n_in = plays["n_in"].to_numpy()[p]
+    rows = np.repeat(np.arange(n_players), n_in)
+    frame = np.arange(len(rows)) - np.repeat(np.cumsum(n_in) - n_in, n_in) + 1
+    s = np.clip(speed[rows] + _segment_cumsum(rng.normal(0, 0.15, len(rows)), n_in), 0, 11)
+    direction = (heading[rows] + _segment_cumsum(rng.normal(0, 3, len(rows)), n_in)) % 360
+    radians = np.deg2rad(direction)
+    x = np.clip(x0[rows] + _segment_cumsum(s * np.sin(radians) / FPS, n_in), 0, 120)
+    y = np.clip(y0[rows] + _segment_cumsum(s * np.cos(radians) / FPS, n_in), 0, 53.3)
+    play_rows = p[rows]
+    inputs = pd.DataFrame({"game_id": plays["game_id"].to_numpy()[play_rows], "play_id": plays["play_id"].to_numpy()[play_rows],
+                           "player_to_predict": players["player_to_predict"].to_numpy()[rows],
+                           "nfl_id": players["nfl_id"].to_numpy()[rows], "frame_id": frame,
+                           "play_direction": plays["play_direction"].to_numpy()[play_rows],
+                           "absolute_yardline_number": plays["yardline"].to_numpy()[play_rows],
+                           **{c: players[c].to_numpy()[rows] for c in ["player_name", "player_height", "player_weight",
+                                                                       "player_birth_date", "player_position",
+                                                                       "player_side", "player_role"]},
+                           "x": x, "y": y, "s": s, "a": np.abs(rng.normal(1.5, 1.0, len(rows))),
+                           "dir": direction, "o": (direction + rng.normal(0, 25, len(rows))) % 360,
+                           "num_frames_output": plays["n_out"].to_numpy()[play_rows],
+                           "ball_land_x": ball_x[play_rows], "ball_land_y": ball_y[play_rows]})
+
+    # output frames of the players to predict: from the last input position towards the ball
+    last = np.cumsum(n_in) - 1
+    target = np.flatnonzero(players["player_to_predict"].to_numpy())
+    n_out = plays["n_out"].to_numpy()[p[target]]
+    out_rows = np.repeat(target, n_out)
+    step = (np.arange(len(out_rows)) - np.repeat(np.cumsum(n_out) - n_out, n_out) + 1)
+    share = step / np.repeat(n_out, n_out) * np.where(players["player_role"].to_numpy()[out_rows] == "Targeted Receiver", 1.0, 0.7)
+    start_x, start_y = x[last[out_rows]], y[last[out_rows]]
+    outputs = pd.DataFrame({"game_id": plays["game_id"].to_numpy()[p[out_rows]], "play_id": plays["play_id"].to_numpy()[p[out_rows]],
+                            "nfl_id": players["nfl_id"].to_numpy()[out_rows], "frame_id": step,
+                            "x": np.clip(start_x + (ball_x[p[out_rows]] - start_x) * share + rng.normal(0, 0.3, len(out_rows)), 0, 120),
+                            "y": np.clip(start_y + (ball_y[p[out_rows]] - start_y) * share + rng.normal(0, 0.3, len(out_rows)), 0, 53.3)})
+    return inputs, outputs
+
+
+def write_week(train_dir: str, week: int, target_rows: int, rosters: Dict[str, np.ndarray],
+               rng: np.random.Generator, chunk_plays: int = 2000, season: int = SEASON_START.year) -> Dict[str, int]:
+    """
+    one input/output week pair with about target_rows output (= merged) rows.
+    Returns:
+        dict: rows written to each file
+    """
+    # 1 targeted receiver + 1-4 defenders, 5-20 frames each: 42 output rows per play on average
+    plays = _plays(max(1, int(round(target_rows / 42.0))), week, rng, season)
+    paths = {name: os.path.join(train_dir, f"{name}_{season}_w{week:02d}.csv") for name in ("input", "output")}
+    counts = {"input": 0, "output": 0}
+    for start in range(0, len(plays), chunk_plays):
+        frames = dict(zip(("input", "output"), generate_chunk(plays.iloc[start:start + chunk_plays], rosters, rng)))
+        for name, frame in frames.items():
+            frame.to_csv(paths[name], mode="w" if start == 0 else "a", header=start == 0, index=False,
+                         float_format="%.2f")
+            counts[name] += len(frame)
+    return counts
+
+
+def write_weeks(out_dir: str, scale: float = 1.0, weeks: int = BASE_WEEKS, seed: int = 42,
+                zip_archive: bool = False, seasons: int = 1) -> dict:
+    """
+    the train folder of a competition download at `scale` times the real row count,
+    `weeks` weeks in each of `seasons` seasons starting with 2023
+    Returns:
+        dict: generation summary, also saved as out_dir/synthetic_meta.json
+    """
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    rosters = build_rosters(rng)
+    train_dir = os.path.join(out_dir, "train")
+    os.makedirs(train_dir, exist_ok=True)
+    per_week = int(round(scale * BASE_ROWS / (weeks * seasons)))
+    counts = {"input": 0, "output": 0}
+    for season in range(SEASON_START.year, SEASON_START.year + seasons):
+        for week in range(1, weeks + 1):
+            for name, rows in write_week(train_dir, week, per_week, rosters, rng, season=season).items():
+                counts[name] += rows
+    if zip_archive:
+        with ZipFile(os.path.join(out_dir, ARCHIVE_NAME), "w", ZIP_DEFLATED) as archive:
+            for file_name in sorted(os.listdir(train_dir)):
+                archive.write(os.path.join(train_dir, file_name), f"train/{file_name}")
+    meta = {"scale": scale, "weeks": weeks, "seasons": seasons, "seed": seed, "input_rows": counts["input"],
+            "output_rows": counts["output"], "seconds": round(time.perf_counter() - start, 2)}
+    with open(os.path.join(out_dir, META_FILE_NAME), "w") as meta_file:
+        json.dump(meta, meta_file)
+    return meta
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of the 560,426 real merged rows (1 - 50)")
+    parser.add_argument("--weeks", type=int, default=BASE_WEEKS)
+    parser.add_argument("--seasons", type=int, default=1, help="seasons of --weeks weeks each, from 2023")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--zip", action="store_true", help=f"also pack the weeks as {ARCHIVE_NAME}")
+    args = parser.parse_args()
+    print(json.dumps({"benchmark": "synthetic_data", **write_weeks(args.out_dir, args.scale, args.weeks,
+                                                                   args.seed, args.zip, args.seasons)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,8 +19,17 @@ if __name__ == "__main__":
         logger.error(f"An error occurred: {e}")
         raise NFLGameCompetitionException(f"Error in Data Ingestion main: {e}", sys)"""
 
+import argparse
 from src.nfl_game_competition.pipeline.train_pipeline import TrainingPipeline
 
 if __name__ == "__main__":
-    pipeline = TrainingPipeline()
+    parser = argparse.ArgumentParser(description="Run the training pipeline")
+    parser.add_argument("--resume", default=None, metavar="TIMESTAMP",
+                        help="run dir timestamp (artifacts/<TIMESTAMP>) of a failed / interrupted run to finish")
+    parser.add_argument("--profile", nargs="+", default=None, metavar="STAGE",
+                        help="stages to profile, e.g. data_ingestion model_trainer (skips their stage cache)")
+    parser.add_argument("--profiler", choices=["cprofile", "sample"], default=None,
+                        help="cprofile: profile.prof / profile.txt, sample: stack samples as profile.folded")
+    args = parser.parse_args()
+    pipeline = TrainingPipeline(resume_from=args.resume, profile_stages=args.profile, profiler=args.profiler)
     pipeline.run_pipeline()
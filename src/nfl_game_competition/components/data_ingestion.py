@@ -16,20 +16,77 @@ from src.nfl_game_competition.logger import get_logger
 from src.nfl_game_competition.exception import NFLGameCompetitionException
 from src.nfl_game_competition.entity.config_entity import TrainingPipelineConfig, DataIngestionConfig
 from src.nfl_game_competition.entity.artifact_entity import DataIngestionArtifact
-from src.nfl_game_competition.utils.common import create_directories, load_data, save_data, write_yaml
-from kaggle.api.kaggle_api_extended import KaggleApi
+from src.nfl_game_competition.utils.common import (create_directories, load_data, load_zip_member, write_yaml,
+                                                   save_feature_store, load_feature_store, save_split_keys,
+                                                   player_dim_path, input_tracking_path, split_player_dimension)
+from src.nfl_game_competition.utils.manifest import IngestionManifest
+from src.nfl_game_competition.utils.tracking_index import sorted_merge_join
+from src.nfl_game_competition.utils.instrumentation import record, step
 import subprocess
 from pathlib import Path
 import numpy as np
 import pandas as pd
-from zipfile import ZipFile
+from zipfile import ZipFile, is_zipfile
 import glob
-from sklearn.model_selection import train_test_split
-from typing import Tuple
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 
 logger = get_logger(name="nfl_game_competition.components.data_ingestion")
 
 
+# ---------------------------- PROCESS POOL WORKER ----------------------------
+# kept at module level so it can be pickled by ProcessPoolExecutor (spawn on windows)
+def _merge_week_pair(inp_file: str, out_file: str, season: int, week: int, feature_store_path: str,
+                     partition_cols: list, sort_cols: list, row_group_size: int,
+                     zip_path: Optional[str] = None, tracking_cols: Optional[list] = None) -> dict:
+    """
+    merge one input/output week pair and write it straight into its (season, week) feature store partition.
+    Only a small summary goes back to the parent process, never the dataframe.
+    With zip_path, inp_file/out_file are archive members and both are decompressed concurrently.
+    With tracking_cols, those columns of every input row (all players, not only the ones to
+    predict) go to the input tracking dataset next to the store; neighbour features need them.
+    """
+    if zip_path is None:
+        df_input  = load_data(Path(inp_file))
+        df_output = load_data(Path(out_file))
+    else:
+        with ThreadPoolExecutor(max_workers=2) as readers:
+            future_input, future_output = (readers.submit(load_zip_member, zip_path, member)
+                                           for member in (inp_file, out_file))
+            df_input, df_output = future_input.result(), future_output.result()
+    # rename ONLY target prediction columns
+    df_output = df_output.rename(columns={'x': 'target_x', 'y': 'target_y'})
+    tracking_df = df_input[[c for c in tracking_cols if c in df_input.columns]] if tracking_cols else None
+    # the week files come sorted by (game_id, play_id, nfl_id, frame_id): binary search join, no hash merge
+    merged_df = sorted_merge_join(df_input, df_output, on=['game_id', 'play_id', 'nfl_id', 'frame_id'])
+    del df_input, df_output
+    # partition keys of the feature store: week numbers restart every season
+    partition = {"season": np.int16(season), "week": np.int8(week)}
+    merged_df = merged_df.assign(**partition)
+    # plain strings recorded as object so the schema reads the same across pandas versions
+    dtypes = [(str(c), "object" if pd.api.types.is_string_dtype(t) and not isinstance(t, pd.CategoricalDtype)
+               else str(t)) for c, t in merged_df.dtypes.items()]
+    # per player attributes go to the player dimension, the feature store keeps the per frame columns
+    fact_df, player_df = split_player_dimension(merged_df)
+    del merged_df
+    player_df = player_df.assign(**partition)
+    written = save_feature_store(path=feature_store_path, data=fact_df, partition_cols=partition_cols,
+                                 sort_cols=sort_cols, row_group_size=row_group_size)
+    written += save_feature_store(path=player_dim_path(feature_store_path), data=player_df,
+                                  partition_cols=partition_cols, sort_cols=["nfl_id"])
+    if tracking_df is not None:
+        written += save_feature_store(path=input_tracking_path(feature_store_path),
+                                      data=tracking_df.assign(**partition), partition_cols=partition_cols,
+                                      sort_cols=sort_cols, row_group_size=row_group_size)
+    return {"season": season,
+            "week": week,
+            "rows": int(fact_df.shape[0]),
+            "files": [str(file_path) for file_path in written],
+            "dtypes": dtypes}
+
+
 # do changes based previos files changed
 
 class DataIngestion:
@@ -37,13 +94,24 @@ class DataIngestion:
         try:
             logger.info(f"{'>>'*20} Data Ingestion {'<<'*20}")
             self.__config = config
-            self.__kaggle_api = KaggleApi()
-            self.__kaggle_api.authenticate()
+            self.__kaggle_api = None  # authenticated on the first download, a local zip needs no credentials
+            self.__manifest = IngestionManifest(config.manifest_filepath)
             logger.info(f"Data Ingestion config: {self.__config}")
         except Exception as e:
             raise NFLGameCompetitionException(e, sys)
         
        # ---------------------------- PRIVATE INTERNAL STEPS ----------------------------
+    def _kaggle_api(self):
+        """
+        authenticated kaggle client, created on first use: the kaggle package is imported and the
+        credentials are checked only when a download is actually needed.
+        """
+        if self.__kaggle_api is None:
+            from kaggle.api.kaggle_api_extended import KaggleApi
+            self.__kaggle_api = KaggleApi()
+            self.__kaggle_api.authenticate()
+        return self.__kaggle_api
+
     def _download_nfl_data(self) -> str:
         """
         Downloads the data from kaggle competition.
@@ -65,14 +133,25 @@ class DataIngestion:
                                             )
 
             # ---- SKIP LOGIC ----
-            if os.path.exists(zip_file_expected):
+            zip_is_valid = os.path.exists(zip_file_expected) and is_zipfile(zip_file_expected)
+            if zip_is_valid and not self.__config.refresh_download:
                 logger.info(f"ZIP already exists. Skipping download → {zip_file_expected}")
+                self.__manifest.record_file(zip_file_expected)
+                self.__manifest.save()
                 return self.__config.zipped_data_filepath
+            if os.path.exists(zip_file_expected) and not zip_is_valid:
+                logger.warning(f"ZIP is incomplete or corrupt, downloading again → {zip_file_expected}")
+            self._kaggle_api()  # fail early on missing credentials, before the cli download
             cmd = ["kaggle", "competitions", "download", "-c", self.__config.data_source_url,
-                   "-p", self.__config.zipped_data_filepath,
-                   "--force"]
+                   "-p", self.__config.zipped_data_filepath]
+            # without --force kaggle only replaces a valid local zip when the remote copy is newer
+            if not zip_is_valid:
+                cmd.append("--force")
             subprocess.run(cmd, check=True)
-            logger.info(f"File downloaded successfully: {self.__config.zipped_data_filepath}")
+            changed = not self.__manifest.is_file_unchanged(zip_file_expected)
+            self.__manifest.record_file(zip_file_expected)
+            self.__manifest.save()
+            logger.info(f"File downloaded successfully: {self.__config.zipped_data_filepath}, changed: {changed}")
             return self.__config.zipped_data_filepath
         except subprocess.CalledProcessError as e:
             raise NFLGameCompetitionException(f"Kaggle CLI download failed: {e}", sys)
@@ -82,6 +161,7 @@ class DataIngestion:
     def _extract_zip_file(self, zip_file_path: str, extract_dir: str):
         """
         Extracts a zip file to the specified directory.
+        Only members that are missing on disk or whose crc/size differ from the manifest are extracted.
         Args:
             zip_file_path (str): Path to the zip file.
             extract_dir (str): Directory where the contents will be extracted.
@@ -91,83 +171,197 @@ class DataIngestion:
             logger.info(f"Starting Unzip and Extracting zip file: {zip_file_path} to dir: {extract_dir}")
             # create directory if not exist
             create_directories([extract_dir])
-            # ---- CHECK IF extraction already done ----
-            if len(os.listdir(extract_dir)) > 0:
-                logger.info(f"Unzipped folder already contains files. Skipping extraction.")
-                return Path(extract_dir)
             zip_file_name = f"{zip_file_path}/{self.__config.data_source_url}.zip"
             with ZipFile(zip_file_name, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-                
-            logger.info(f"File extracted successfully: {extract_dir}")
+                members = [member for member in zip_ref.infolist() if not member.is_dir()]
+                extracted = 0
+                for member in members:
+                    target = Path(extract_dir) / member.filename
+                    # ---- CHECK IF member already extracted (crc from zip directory, no decompression) ----
+                    member_hash = f"crc32:{member.CRC:08x}"
+                    recorded = self.__manifest.get_file(target)
+                    if (recorded and target.exists() and recorded["hash"] == member_hash
+                            and recorded["size"] == target.stat().st_size and recorded["mtime"] == target.stat().st_mtime):
+                        continue
+                    zip_ref.extract(member, extract_dir)
+                    self.__manifest.record_file(target, self.__manifest.file_state(target, content_hash=member_hash))
+                    extracted += 1
+            self.__manifest.save()
+            logger.info(f"File extracted successfully: {extract_dir}, extracted {extracted} of {len(members)} members")
             return Path(extract_dir)
         except Exception as e:
             raise NFLGameCompetitionException(e, sys) from e
 
     # have to changes means we have to merge or concat all files so write one or more methods here
-    def _merge_all_input_output(self, unzipped_dir: str) -> pd.DataFrame:
+    @staticmethod
+    def _season_week_from_filename(file_path: str) -> Tuple[int, int]:
+        """(season, week) from competition file name, e.g. input_2023_w05.csv -> (2023, 5)"""
+        match = re.search(r"_(\d{4})_w(\d+)\.csv$", os.path.basename(file_path))
+        if match is None:
+            raise NFLGameCompetitionException(f"Cannot parse season / week from file name: {file_path}", sys)
+        return int(match.group(1)), int(match.group(2))
+
+    def _find_week_pairs_on_disk(self, unzipped_dir: str) -> List[Tuple[str, str, int, int, str, str]]:
+        """
+        input/output week csv pairs of the extracted train folder.
+        Returns:
+            list: (input file, output file, season, week, input hash, output hash)
+        """
+            # find train folder dynamically
+        train_dirs = glob.glob(os.path.join(unzipped_dir, "**", "*train*"), recursive=True)
+        if not train_dirs:
+            raise NFLGameCompetitionException(f"No train folder found in {unzipped_dir}", sys)
+        train_dir = train_dirs[0]
+        logger.info(f"Train folder found: {train_dir}")
+
+        # year independent pattern
+        input_files  = sorted(glob.glob(os.path.join(train_dir, "input_*_w*.csv")))
+        output_files = sorted(glob.glob(os.path.join(train_dir, "output_*_w*.csv")))
+
+        if len(input_files) != len(output_files):
+            raise NFLGameCompetitionException("input/output count mismatch", sys)
+        return [(inp_file, out_file, *self._season_week_from_filename(inp_file),
+                 self.__manifest.record_file(inp_file)["hash"], self.__manifest.record_file(out_file)["hash"])
+                for inp_file, out_file in zip(input_files, output_files)]
+
+    def _find_week_pairs_in_zip(self, zip_file: str) -> List[Tuple[str, str, int, int, str, str]]:
+        """
+        input/output week csv pairs read from the zip directory; the member crc is the content
+        hash, identical to the one recorded for extracted files, so both modes share the manifest.
+        Returns:
+            list: (input member, output member, season, week, input hash, output hash)
+        """
+        with ZipFile(zip_file, 'r') as zip_ref:
+            members = {info.filename: f"crc32:{info.CRC:08x}" for info in zip_ref.infolist()
+                       if "train" in info.filename and not info.is_dir()}
+        pattern = lambda prefix: sorted(m for m in members
+                                        if re.fullmatch(rf"{prefix}_.*_w\d+\.csv", os.path.basename(m)))
+        input_members, output_members = pattern("input"), pattern("output")
+
+        if len(input_members) != len(output_members):
+            raise NFLGameCompetitionException("input/output count mismatch", sys)
+        return [(inp, out, *self._season_week_from_filename(inp), members[inp], members[out])
+                for inp, out in zip(input_members, output_members)]
+
+    def _merge_all_input_output(self, unzipped_dir: Optional[str] = None, zip_file: Optional[str] = None) -> Path:
         """
     short merge logic – renames only target x,y columns
+    week pairs are merged concurrently on a process pool (config.merge_workers) and every
+    finished week is written to its own season=YYYY/week=N feature store partition, so no
+    full-size concat is built and equal week numbers of different seasons never share a partition.
+    Weeks whose source hashes match the manifest and whose partition is intact are reused.
+    Args:
+        unzipped_dir (str): extracted competition data, or
+        zip_file (str): competition zip, week csvs are streamed from it without extraction
+    Returns:
+        Path: root dir of the feature store dataset
         """
         try:
             feature_store_path = Path(self.__config.feature_store_filepath)
-            # ─── SKIP MERGE IF ALREADY MERGED ─────────────────────────────
-            if feature_store_path.exists():
-                logger.info(f"Feature store already exists: {feature_store_path} → loading it directly")
-                return load_data(feature_store_path)
+            generated_schema_path = self.__config.generated_schema_file_path
+            week_pairs = (self._find_week_pairs_in_zip(zip_file) if zip_file is not None
+                          else self._find_week_pairs_on_disk(unzipped_dir))
+            if not week_pairs:
+                raise NFLGameCompetitionException(
+                    f"No input_*_w*.csv / output_*_w*.csv week pairs found in {zip_file or unzipped_dir}", sys)
+
+            # ─── SKIP WEEKS WHOSE SOURCES DID NOT CHANGE ──────────────────
+            jobs, sources_by_week = [], {}
+            for inp_file, out_file, season, week, inp_hash, out_hash in week_pairs:
+                # the store layout counts as a source: partitions written by an older layout are merged again
+                sources_by_week[season, week] = {os.path.basename(inp_file): inp_hash,
+                                                 os.path.basename(out_file): out_hash,
+                                                 "store_layout": self.__config.store_layout}
+                if self.__manifest.is_week_unchanged((season, week), sources_by_week[season, week]):
+                    continue
+                jobs.append((inp_file, out_file, season, week, str(feature_store_path), self.__config.partition_cols,
+                             self.__config.sort_cols, self.__config.row_group_size, zip_file,
+                             self.__config.input_tracking_cols))
+
+            # drop partitions of weeks that no longer exist in the source data
+            dropped_weeks = set(self.__manifest.weeks()) - set(sources_by_week)
+            for week in dropped_weeks:
+                for file_path in self.__manifest.get_week(week)["partition_files"]:
+                    shutil.rmtree(Path(file_path).parent, ignore_errors=True)
+                self.__manifest.forget_week(week)
+                logger.info(f"Week {'/'.join(map(str, week))} removed from source data, partition dropped")
+
+            self.__manifest.save()
+            # the generated schema is reused only if the manifest hash of it still matches the file
+            if not jobs and not dropped_weeks and self.__manifest.is_file_unchanged(generated_schema_path):
+                logger.info(f"All {len(sources_by_week)} weeks unchanged: {feature_store_path} → reusing it")
+                return feature_store_path
             # ─────────────────────────────────────────────────────────────
-                # find train folder dynamically
-            train_dir = glob.glob(os.path.join(unzipped_dir, "**", "*train*"), recursive=True)[0]
-            logger.info(f"Train folder found: {train_dir}")
-
-            # year independent pattern
-            input_files  = sorted(glob.glob(os.path.join(train_dir, "input_*_w*.csv")))
-            output_files = sorted(glob.glob(os.path.join(train_dir, "output_*_w*.csv")))
-
-            if len(input_files) != len(output_files):
-                raise NFLGameCompetitionException("input/output count mismatch", sys)
-
-            all_merged = []
-            for inp_file, out_file in zip(input_files, output_files):
-                df_input  = load_data(Path(inp_file))
-                df_output = load_data(Path(out_file))
-                # rename ONLY target prediction columns
-                df_output = df_output.rename(columns={'x': 'target_x', 'y': 'target_y'})
-                merged_df = pd.merge(df_input, df_output,
-                                      on=['game_id', 'play_id', 'nfl_id', 'frame_id'], how='inner')
-                all_merged.append(merged_df)
-
-            final_df = pd.concat(all_merged, ignore_index=True)
-            logger.info(f"Merged all input/output files, final shape: {final_df.shape}")
-
-            save_data(path=Path(self.__config.feature_store_filepath), data=final_df, index=False)
-            logger.info(f"Saved merged feature store file at: {self.__config.feature_store_filepath}")
-
-            # write YAML schema (before split)
-            schema = [{"name":str(c),"dtype":str(t)} for c,t in final_df.dtypes.items()]
+
+            workers = max(1, min(self.__config.merge_workers, len(jobs)))
+            logger.info(f"Merging {len(jobs)} of {len(sources_by_week)} week pairs with {workers} worker(s)")
+
+            def _record(summary: dict) -> None:
+                week = (summary["season"], summary["week"])
+                self.__manifest.record_week(week, sources_by_week[week], summary["files"], summary["rows"],
+                                            summary["dtypes"])
+                self.__manifest.save()
+                logger.info(f"Season {summary['season']} week {summary['week']} merged, rows: {summary['rows']}")
+
+            if workers == 1:
+                for job in jobs:
+                    _record(_merge_week_pair(*job))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(_merge_week_pair, *job) for job in jobs]
+                    for future in as_completed(futures):
+                        _record(future.result())
+
+            weeks = [self.__manifest.get_week(week) for week in self.__manifest.weeks()]
+            total_rows = sum(week["rows"] for week in weeks)
+            logger.info(f"Merged all input/output files into feature store: {feature_store_path}, rows: {total_rows}")
+
+            # write YAML schema of the store (before split), next to the manifest that records its hash
+            schema = [{"name":c,"dtype":t} for c,t in weeks[0]["dtypes"]]
             yaml_content = {
-                "metadata":{"rows":int(final_df.shape[0]),"columns":int(final_df.shape[1])},
+                "metadata":{"rows":int(total_rows),"columns":len(schema)},
                 "schema":schema
             }
-            logger.info(f"Saving merged feature store file at: {self.__config.schema_file_path}")
-            write_yaml(yaml_content, self.__config.schema_file_path)
+            logger.info(f"Saving feature store schema at: {generated_schema_path}")
+            write_yaml(yaml_content, generated_schema_path)
+            self.__manifest.record_file(generated_schema_path)
+            self.__manifest.save()
 
-            return final_df
+            return feature_store_path
 
         except Exception as e:
             raise NFLGameCompetitionException(e, sys) from e
         
+    def _store_rows(self) -> int:
+        """feature store rows, as recorded per week in the manifest"""
+        return int(sum(self.__manifest.get_week(week)["rows"] for week in self.__manifest.weeks()))
+
     # train test split
-    def _train_test_split_and_save(self, df: pd.DataFrame) -> Tuple[str, str]:
+    def _train_test_split_and_save(self, feature_store_path: Path) -> Tuple[str, str]:
         """
-        90/10 split with shuffle and fixed random_state; save to config paths.
+        90/10 split of plays with shuffle and fixed random_state; save to config paths.
+        Only (season, game_id, play_id) are read from the feature store and the split is stored as
+        play key arrays, so frames of one play never straddle train/test and no data is copied.
+        Every season contributes test_size of its own plays, so each season is in both splits.
         """
         try:
-            train_df, test_df = train_test_split(df, test_size=0.10, shuffle=True, random_state=42)
-            logger.info(f"Split done: train={train_df.shape}, test={test_df.shape}")
+            keys_df = load_feature_store(feature_store_path, columns=["season", "game_id", "play_id"],
+                                         schema_path=self.__config.schema_file_path)
+            plays, rows_per_play = np.unique(keys_df.to_numpy(dtype=np.int32), axis=0, return_counts=True)
+            rng = np.random.default_rng(self.__config.random_state)
+            order = rng.permutation(len(plays))
+            test_idx = []
+            for season in np.unique(plays[:, 0]):
+                season_order = order[plays[order, 0] == season]
+                test_idx.append(season_order[:int(round(len(season_order) * self.__config.test_size))])
+            test_idx = np.sort(np.concatenate(test_idx))
+            train_idx = np.setdiff1d(np.arange(len(plays)), test_idx)
+            logger.info(f"Split done: train plays={len(train_idx)} rows={rows_per_play[train_idx].sum()}, "
+                        f"test plays={len(test_idx)} rows={rows_per_play[test_idx].sum()}, "
+                        f"seasons={np.unique(plays[:, 0]).tolist()}")
 
-            save_data(self.__config.training_filepath, train_df, index=False)
-            save_data(self.__config.testing_filepath, test_df, index=False)
+            save_split_keys(self.__config.training_filepath, plays[train_idx, 1:])
+            save_split_keys(self.__config.testing_filepath, plays[test_idx, 1:])
 
             return self.__config.training_filepath, self.__config.testing_filepath
         except Exception as e:
@@ -178,15 +372,30 @@ class DataIngestion:
         try:
             logger.info(f"{'>>'*20} Data Ingestion Started:  {'<<'*20}")
 
-            zip_file_path = self._download_nfl_data()
+            with step("download") as download_step:
+                zip_file_path = self._download_nfl_data()
+                zip_file = os.path.join(zip_file_path, f"{self.__config.data_source_url}.zip")
+                download_step.record(bytes=os.path.getsize(zip_file) if os.path.exists(zip_file) else None)
             logger.info(f"Data Ingestion - data downloded done: {zip_file_path}")
-            unzip_dir = self._extract_zip_file(zip_file_path, self.__config.unzipped_data_dir)
-            logger.info(f"Data Ingestion - data downloded done: {unzip_dir}")
-            # remaining code written here with comment
-            merged_df = self._merge_all_input_output(str(unzip_dir))
-            logger.info(f"Data Ingestion - Merging input/output done. merged data shape: {merged_df.shape}")
+            if self.__config.stream_from_zip:
+                # streaming mode: week csvs are decompressed in the merge workers, nothing written to unzipped_data
+                with step("merge") as merge_step:
+                    feature_store_path = self._merge_all_input_output(zip_file=zip_file)
+                    merge_step.record(rows_out=self._store_rows())
+            else:
+                with step("extract"):
+                    unzip_dir = self._extract_zip_file(zip_file_path, self.__config.unzipped_data_dir)
+                logger.info(f"Data Ingestion - data downloded done: {unzip_dir}")
+                # remaining code written here with comment
+                with step("merge") as merge_step:
+                    feature_store_path = self._merge_all_input_output(unzipped_dir=str(unzip_dir))
+                    merge_step.record(rows_out=self._store_rows())
+            logger.info(f"Data Ingestion - Merging input/output done. feature store: {feature_store_path}")
             # train test split
-            train_filepath, test_filepath = self._train_test_split_and_save(merged_df)
+            with step("split", rows_in=self._store_rows()) as split_step:
+                train_filepath, test_filepath = self._train_test_split_and_save(feature_store_path)
+                split_step.record(train_plays=len(np.load(train_filepath)), test_plays=len(np.load(test_filepath)))
+            record(rows_out=self._store_rows(), weeks=len(self.__manifest.weeks()))
             logger.info(f"Data Ingestion - Train test split done. train: {train_filepath}, test: {test_filepath}")
             # prepare artifacts
             data_ingestion_artifact = DataIngestionArtifact(
@@ -0,0 +1,432 @@
+"""Data Transformation
+step after data ingestion: turns tracking rows into float32 feature blocks for model_trainer.
+It only needs the ingested splits, so it runs alongside data validation in the pipeline DAG.
+
+All features are computed with whole-array numpy expressions over rows sorted by
+(game_id, play_id, nfl_id, frame_id), so every player's frames form one contiguous block.
+Per player lag/diff features shift the arrays and mask the first rows of each block;
+there is no python loop or groupby().apply per group.
+Neighbour features (nearest opponents / teammates, counts within a radius) are computed on a
+padded (frame, player) grid with one pairwise distance block per chunk of frames. The grid holds
+every tracked player of a frame (the input tracking dataset next to the feature store), not only
+the merged rows of the players to predict, so training sees the same neighbours as serving.
+The physics baseline columns extrapolate every player's last input frame from the same dataset.
+The module level functions are shared with the predict pipeline.
+"""
+
+import os, sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.constants.training_pipeline_constants import (FIELD_LENGTH, FIELD_WIDTH,
+                                                                           DATA_INGESTION_INPUT_TRACKING_COLS,
+                                                                           DATA_INGESTION_PARTITION_COLS)
+from src.nfl_game_competition.entity.config_entity import DataTransformationConfig
+from src.nfl_game_competition.entity.artifact_entity import DataIngestionArtifact, DataTransformationArtifact
+from src.nfl_game_competition.utils.common import (create_directories, save_object, load_split_data,
+                                                   list_feature_store_partitions, partition_filters,
+                                                   input_tracking_path)
+from src.nfl_game_competition.utils.instrumentation import record, step
+from src.nfl_game_competition.utils.sequence_store import build_sequence_store
+from src.nfl_game_competition.utils.physics import FRAME_DT, extrapolate
+from src.nfl_game_competition.utils.tracking_index import TrackingIndex, frame_keys
+
+logger = get_logger(name="nfl_game_competition.components.data_transformation")
+
+KEY_COLS: List[str] = ["game_id", "play_id", "nfl_id", "frame_id"]
+TARGET_COLS: List[str] = ["target_x", "target_y"]
+INPUT_COLS: List[str] = [*KEY_COLS, "play_direction", "x", "y", "s", "a", "dir", "o",
+                         "ball_land_x", "ball_land_y", "num_frames_output", "player_side", "player_role"]
+
+
+# ---------------------------- VECTORIZED FEATURE ENGINE ----------------------------
+def sort_tracking(df: pd.DataFrame) -> pd.DataFrame:
+    """rows ordered by (game_id, play_id, nfl_id, frame_id); no copy if already sorted"""
+    keys = [df[c].to_numpy() for c in KEY_COLS]
+    order = np.lexsort(keys[::-1])
+    if np.all(order[1:] > order[:-1]):
+        return df.reset_index(drop=True)
+    return df.iloc[order].reset_index(drop=True)
+
+
+def player_block_ids(game_id: np.ndarray, play_id: np.ndarray, nfl_id: np.ndarray) -> np.ndarray:
+    """block number of every row of sorted data; a new block starts when the player changes"""
+    new_block = np.empty(len(game_id), dtype=bool)
+    new_block[:1] = True
+    new_block[1:] = (game_id[1:] != game_id[:-1]) | (play_id[1:] != play_id[:-1]) | (nfl_id[1:] != nfl_id[:-1])
+    return np.cumsum(new_block) - 1
+
+
+def normalize_play_direction(x: np.ndarray, y: np.ndarray, left: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """mirror positions of plays going left so every play moves towards +x; self inverse"""
+    return np.where(left, FIELD_LENGTH - x, x), np.where(left, FIELD_WIDTH - y, y)
+
+
+def normalize_angle(angle: np.ndarray, left: np.ndarray) -> np.ndarray:
+    """rotate dir / o (degrees) by 180 for plays going left"""
+    return np.where(left, np.mod(angle + 180.0, 360.0), angle)
+
+
+def _lagged_diff(values: np.ndarray, block_id: np.ndarray, lag: int) -> np.ndarray:
+    """values[i] - values[i - lag] inside a player block, 0 where the lag crosses a block start"""
+    diff = np.zeros_like(values)
+    if lag < len(values):
+        same_block = block_id[lag:] == block_id[:-lag]
+        diff[lag:] = np.where(same_block, values[lag:] - values[:-lag], 0.0)
+    return diff
+
+
+def compute_kinematic_features(df: pd.DataFrame, lags: Optional[List[int]] = None) -> Tuple[np.ndarray, List[str]]:
+    """
+    float32 feature block of tracking rows sorted by (game_id, play_id, nfl_id, frame_id).
+    Args:
+        df (pd.DataFrame): sorted rows holding INPUT_COLS
+        lags (list): frame lags of the per player diff features
+    Returns:
+        tuple: (features (n_rows, n_features) float32, feature names)
+    """
+    lags = [1, 2, 3] if lags is None else lags
+    col = lambda c: df[c].to_numpy(dtype=np.float32)
+    left = (df["play_direction"] == "left").to_numpy()
+
+    x, y = normalize_play_direction(col("x"), col("y"), left)
+    ball_x, ball_y = normalize_play_direction(col("ball_land_x"), col("ball_land_y"), left)
+    dir_deg, o_deg = normalize_angle(col("dir"), left), normalize_angle(col("o"), left)
+    s, a = col("s"), col("a")
+
+    # dir / o are clockwise from +y (field convention): x component = sin, y component = cos
+    dir_rad, o_rad = np.deg2rad(dir_deg), np.deg2rad(o_deg)
+    dir_sin, dir_cos = np.sin(dir_rad), np.cos(dir_rad)
+    o_sin, o_cos = np.sin(o_rad), np.cos(o_rad)
+
+    to_ball_x, to_ball_y = ball_x - x, ball_y - y
+    dist_to_ball = np.hypot(to_ball_x, to_ball_y)
+    safe_dist = np.where(dist_to_ball > 0, dist_to_ball, 1.0)
+
+    blocks = {
+        "x": x, "y": y, "s": s, "a": a,
+        "vx": s * dir_sin, "vy": s * dir_cos,
+        "ax": a * dir_sin, "ay": a * dir_cos,
+        "dir_sin": dir_sin, "dir_cos": dir_cos,
+        "o_sin": o_sin, "o_cos": o_cos,
+        "ball_land_x": ball_x, "ball_land_y": ball_y,
+        "dist_to_ball": dist_to_ball,
+        "bearing_to_ball_sin": to_ball_x / safe_dist, "bearing_to_ball_cos": to_ball_y / safe_dist,
+        "frame_id": col("frame_id"), "num_frames_output": col("num_frames_output"),
+    }
+
+    block_id = player_block_ids(df["game_id"].to_numpy(), df["play_id"].to_numpy(), df["nfl_id"].to_numpy())
+    for lag in lags:
+        blocks[f"dx_lag{lag}"] = _lagged_diff(x, block_id, lag)
+        blocks[f"dy_lag{lag}"] = _lagged_diff(y, block_id, lag)
+        blocks[f"ds_lag{lag}"] = _lagged_diff(s, block_id, lag)
+
+    names = list(blocks)
+    features = np.empty((len(df), len(names)), dtype=np.float32)
+    for j, name in enumerate(names):
+        features[:, j] = blocks[name]
+    return features, names
+
+
+def compute_neighbor_features(game_id: np.ndarray, play_id: np.ndarray, frame_id: np.ndarray, offense: np.ndarray,
+                              targeted: np.ndarray, x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+                              k: int = 3, radius: float = 5.0, chunk_bytes: int = 64 << 20
+                              ) -> Tuple[np.ndarray, List[str]]:
+    """
+    nearest opponents / teammates of every player in its frame.
+    Rows are grouped per (game_id, play_id, frame_id) into a padded (frames, players) grid and the
+    pairwise distances of a chunk of frames are one (chunk, P, P) array, so the only python loop
+    is over memory bounded chunks of frames, never over frames or players.
+    Args:
+        offense (np.ndarray): True for player_side == Offense
+        targeted (np.ndarray): True for player_role == Targeted Receiver
+        x, y, vx, vy (np.ndarray): positions / velocity components (play direction normalized)
+        k (int): nearest neighbours kept per side
+        radius (float): yards, players within it are counted per side
+    Returns:
+        tuple: (features (n_rows, 3k + 5) float32 in the input row order, feature names)
+    Missing neighbours get distance FIELD_LENGTH and relative velocity 0.
+    """
+    n = len(x)
+    names = ([f"opp_dist_{i + 1}" for i in range(k)] + [f"mate_dist_{i + 1}" for i in range(k)]
+             + ["opp_rel_vx", "opp_rel_vy", f"opp_within_{radius:g}", f"mate_within_{radius:g}"]
+             + [f"opp_closing_{i + 1}" for i in range(k)] + ["dist_to_targeted"])
+    if n == 0:
+        return np.empty((0, len(names)), dtype=np.float32), names
+
+    order = np.lexsort((frame_id, play_id, game_id))
+    g, p, f = game_id[order], play_id[order], frame_id[order]
+    new_frame = np.ones(n, dtype=bool)
+    new_frame[1:] = (g[1:] != g[:-1]) | (p[1:] != p[:-1]) | (f[1:] != f[:-1])
+    frame_idx = np.cumsum(new_frame) - 1
+    pos = np.arange(n) - np.flatnonzero(new_frame)[frame_idx]
+    n_frames, n_slots = int(frame_idx[-1]) + 1, int(pos.max()) + 1
+
+    def grid(values: np.ndarray, fill) -> np.ndarray:
+        out = np.full((n_frames, n_slots), fill, dtype=np.asarray(values).dtype)
+        out[frame_idx, pos] = np.asarray(values)[order]
+        return out
+
+    X, Y = grid(x.astype(np.float32), np.float32(0)), grid(y.astype(np.float32), np.float32(0))
+    VX, VY = grid(vx.astype(np.float32), np.float32(0)), grid(vy.astype(np.float32), np.float32(0))
+    OFF, VALID = grid(offense.astype(bool), False), grid(np.ones(n, dtype=bool), False)
+    TARGETED = grid(targeted.astype(bool), False)
+    not_self = ~np.eye(n_slots, dtype=bool)
+
+    out = np.empty((n_frames, n_slots, len(names)), dtype=np.float32)
+    chunk = max(1, chunk_bytes // (n_slots * n_slots * 4 * 6))
+    for c0 in range(0, n_frames, chunk):
+        sl = slice(c0, c0 + chunk)
+        dx = X[sl, None, :] - X[sl, :, None]                     # [frame, i, j] = x_j - x_i
+        dy = Y[sl, None, :] - Y[sl, :, None]
+        dist = np.hypot(dx, dy)
+        pair = VALID[sl, None, :] & VALID[sl, :, None] & not_self
+        same_side = OFF[sl, None, :] == OFF[sl, :, None]
+        opp_d = np.where(pair & ~same_side, dist, np.inf)
+        mate_d = np.where(pair & same_side, dist, np.inf)
+
+        opp_idx = np.argsort(opp_d, axis=2)[:, :, :k]
+        opp_k = np.take_along_axis(opp_d, opp_idx, axis=2)
+        mate_k = np.sort(mate_d, axis=2)[:, :, :k]
+        if opp_k.shape[2] < k:  # fewer than k other slots in every frame
+            fill = np.full(opp_k.shape[:2] + (k - opp_k.shape[2],), np.inf, dtype=np.float32)
+            opp_k, mate_k = np.concatenate([opp_k, fill], axis=2), np.concatenate([mate_k, fill], axis=2)
+            opp_idx = np.concatenate([opp_idx, np.zeros(fill.shape, dtype=opp_idx.dtype)], axis=2)
+
+        has_opp = np.isfinite(opp_k[:, :, 0])
+        nearest = opp_idx[:, :, 0]
+        rel_vx = np.where(has_opp, np.take_along_axis(VX[sl], nearest, axis=1) - VX[sl], 0.0)
+        rel_vy = np.where(has_opp, np.take_along_axis(VY[sl], nearest, axis=1) - VY[sl], 0.0)
+        # closing speed towards each of the k nearest opponents (positive = getting closer)
+        opp_dx = np.take_along_axis(dx, opp_idx, axis=2)
+        opp_dy = np.take_along_axis(dy, opp_idx, axis=2)
+        flat_idx = opp_idx.reshape(len(dx), -1)
+        opp_rvx = np.take_along_axis(VX[sl], flat_idx, axis=1).reshape(opp_idx.shape) - VX[sl][:, :, None]
+        opp_rvy = np.take_along_axis(VY[sl], flat_idx, axis=1).reshape(opp_idx.shape) - VY[sl][:, :, None]
+        finite = np.isfinite(opp_k)
+        safe_k = np.where(finite & (opp_k > 0), opp_k, 1.0)
+        closing = np.where(finite, -(opp_dx * opp_rvx + opp_dy * opp_rvy) / safe_k, 0.0)
+        # the targeted receiver itself gets 0; frames without one get FIELD_LENGTH
+        to_targeted = np.where(VALID[sl, :, None] & TARGETED[sl, None, :], dist, np.inf).min(axis=2)
+
+        out[sl] = np.concatenate([np.where(finite, opp_k, FIELD_LENGTH),
+                                  np.where(np.isfinite(mate_k), mate_k, FIELD_LENGTH),
+                                  rel_vx[..., None], rel_vy[..., None],
+                                  (opp_d <= radius).sum(axis=2)[..., None],
+                                  (mate_d <= radius).sum(axis=2)[..., None],
+                                  closing,
+                                  np.where(np.isfinite(to_targeted), to_targeted, FIELD_LENGTH)[..., None]],
+                                 axis=2)
+
+    features = np.empty((n, len(names)), dtype=np.float32)
+    features[order] = out[frame_idx, pos]
+    return features, names
+
+
+def compute_tracking_neighbor_features(tracking: pd.DataFrame, k: int = 3, radius: float = 5.0
+                                       ) -> Tuple[np.ndarray, List[str]]:
+    """
+    neighbour features of tracking rows holding every player of their frames (any row order).
+    Positions and velocities are play direction normalized exactly as in compute_kinematic_features.
+    """
+    col = lambda c: tracking[c].to_numpy(dtype=np.float32)
+    left = (tracking["play_direction"] == "left").to_numpy()
+    x, y = normalize_play_direction(col("x"), col("y"), left)
+    dir_rad = np.deg2rad(normalize_angle(col("dir"), left))
+    s = col("s")
+    return compute_neighbor_features(
+        tracking["game_id"].to_numpy(), tracking["play_id"].to_numpy(), tracking["frame_id"].to_numpy(),
+        (tracking["player_side"] == "Offense").to_numpy(), (tracking["player_role"] == "Targeted Receiver").to_numpy(),
+        x, y, s * np.sin(dir_rad), s * np.cos(dir_rad), k=k, radius=radius)
+
+
+def compute_last_frame_states(tracking: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    physics anchor of sorted tracking rows: the play direction normalized x, y, vx, vy and signed
+    speed change per second (from the previous frame, 0 when there is none) of every player's last
+    input frame, the state PhysicsBaselinePredictor extrapolates from.
+    Returns:
+        tuple: (states (n_players, 5) float32, player block of every row)
+    """
+    col = lambda c: tracking[c].to_numpy(dtype=np.float32)
+    block_id = player_block_ids(tracking["game_id"].to_numpy(), tracking["play_id"].to_numpy(),
+                                tracking["nfl_id"].to_numpy())
+    is_last = np.ones(len(tracking), dtype=bool)
+    is_last[:-1] = block_id[1:] != block_id[:-1]
+    last = np.flatnonzero(is_last)
+    prev = np.maximum(last - 1, 0)
+    has_prev = (last > 0) & (block_id[prev] == block_id[last])
+
+    left = (tracking["play_direction"] == "left").to_numpy()[last]
+    x, y = normalize_play_direction(col("x")[last], col("y")[last], left)
+    dir_rad = np.deg2rad(normalize_angle(col("dir")[last], left))
+    s = col("s")
+    accel = np.where(has_prev, s[last] - s[prev], 0.0) / FRAME_DT
+    states = np.column_stack([x, y, s[last] * np.sin(dir_rad), s[last] * np.cos(dir_rad), accel])
+    return states.astype(np.float32), block_id
+
+
+def compute_physics_features(states: np.ndarray, horizon: np.ndarray, ball_x: np.ndarray, ball_y: np.ndarray,
+                             mode: str = "ca", steer: float = 0.5) -> Tuple[np.ndarray, List[str]]:
+    """
+    physics baseline position horizon frames after the last input frame of every row's player
+    (states as in compute_last_frame_states, one per row). Training rows pair input and output
+    frame k on frame_id, so their horizon is frame_id and phys_x / phys_y is the baseline position
+    of the row's target frame. They serve as features and as the residual anchor of the trainer.
+    """
+    x, y, vx, vy, accel = states.T
+    phys_x, phys_y = extrapolate(x, y, vx, vy, np.asarray(horizon, dtype=np.float32) * FRAME_DT, accel=accel,
+                                 ball_x=ball_x, ball_y=ball_y, mode=mode, steer=steer)
+    return np.column_stack([phys_x, phys_y]), ["phys_x", "phys_y"]
+
+
+def compute_features(df: pd.DataFrame, lags: Optional[List[int]] = None, neighbors_k: int = 3,
+                     neighbor_radius: float = 5.0, physics_mode: str = "ca", physics_steer: float = 0.5,
+                     tracking: Optional[pd.DataFrame] = None) -> Tuple[np.ndarray, List[str]]:
+    """
+    kinematic, neighbour and physics baseline blocks: the full model input of sorted tracking rows.
+    tracking holds the input rows of every player of df's plays; the neighbour grid and the last
+    input frames are taken from it and joined back to df on the key columns. None means df already
+    holds every input row (predict path).
+    Raises:
+        ValueError: a row of df has no row with the same key in tracking
+    """
+    kinematic, names = compute_kinematic_features(df, lags)
+    source = df if tracking is None else sort_tracking(tracking)
+    neighbors, neighbor_names = compute_tracking_neighbor_features(source, neighbors_k, neighbor_radius)
+    rows = np.arange(len(df))
+    if tracking is not None:
+        rows = TrackingIndex.from_frame(source).lookup(frame_keys(df))
+        if np.any(rows < 0):
+            raise ValueError(f"{int((rows < 0).sum())} rows have no input tracking row with the same key")
+        neighbors = neighbors[rows]
+    states, block_id = compute_last_frame_states(source)
+    col = lambda c: kinematic[:, names.index(c)]
+    physics, physics_names = compute_physics_features(states[block_id[rows]], col("frame_id"), col("ball_land_x"),
+                                                      col("ball_land_y"), physics_mode, physics_steer)
+    return np.hstack([kinematic, neighbors, physics]), names + neighbor_names + physics_names
+
+
+def compute_targets(df: pd.DataFrame) -> np.ndarray:
+    """(n_rows, 2) float32 target_x / target_y in play direction normalized coordinates"""
+    left = (df["play_direction"] == "left").to_numpy()
+    target_x, target_y = normalize_play_direction(df["target_x"].to_numpy(dtype=np.float32),
+                                                  df["target_y"].to_numpy(dtype=np.float32), left)
+    return np.column_stack([target_x, target_y]).astype(np.float32)
+
+
+class DataTransformation:
+    def __init__(self, data_ingestion_artifact: DataIngestionArtifact, config: DataTransformationConfig):
+        try:
+            logger.info(f"{'>>'*20} Data Transformation {'<<'*20}")
+            self.__data_ingestion_artifact = data_ingestion_artifact
+            self.__config = config
+            logger.info(f"Data Transformation config: {self.__config.__dict__}")
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    # ---------------------------- PRIVATE INTERNAL STEPS ----------------------------
+    def _transform_split(self, keys_path: str, out_dir: str) -> Tuple[int, List[str]]:
+        """
+        feature / target / key blocks of one split, one (season, week) partition at a time.
+        A cheap key-only pass sizes the .npy files, then each partition is written into its slice of
+        the memory mapped blocks, so the split is never held in memory as a whole.
+        Returns:
+            tuple: (rows written, feature names)
+        """
+        try:
+            feature_store_path = self.__data_ingestion_artifact.feature_store_file_path
+            partitions = list_feature_store_partitions(feature_store_path, DATA_INGESTION_PARTITION_COLS)
+            rows_per_partition = {partition: len(load_split_data(feature_store_path, keys_path, columns=["game_id"],
+                                                                 filters=partition_filters(partition),
+                                                                 schema_path=self.__config.schema_file_path))
+                                  for partition in partitions}
+            n_rows = sum(rows_per_partition.values())
+            create_directories([out_dir], verbose=False)
+
+            features_mm = targets_mm = keys_mm = None
+            names: List[str] = []
+            offset = 0
+            for partition in partitions:
+                if rows_per_partition[partition] == 0:
+                    continue
+                df = sort_tracking(load_split_data(feature_store_path, keys_path, columns=[*INPUT_COLS, *TARGET_COLS],
+                                                   filters=partition_filters(partition),
+                                                   schema_path=self.__config.schema_file_path))
+                # every player of the split's plays, so neighbours are not limited to the players to predict
+                tracking = load_split_data(input_tracking_path(feature_store_path), keys_path,
+                                           columns=DATA_INGESTION_INPUT_TRACKING_COLS, filters=partition_filters(partition),
+                                           schema_path=self.__config.schema_file_path)
+                features, names = compute_features(df, self.__config.lags, self.__config.neighbors_k,
+                                                   self.__config.neighbor_radius, self.__config.physics_mode,
+                                                   self.__config.physics_steer, tracking=tracking)
+                del tracking
+                if features_mm is None:
+                    open_block = np.lib.format.open_memmap
+                    features_mm = open_block(os.path.join(out_dir, self.__config.features_file_name), mode="w+",
+                                             dtype=np.float32, shape=(n_rows, features.shape[1]))
+                    targets_mm = open_block(os.path.join(out_dir, self.__config.targets_file_name), mode="w+",
+                                            dtype=np.float32, shape=(n_rows, len(TARGET_COLS)))
+                    keys_mm = open_block(os.path.join(out_dir, self.__config.keys_file_name), mode="w+",
+                                         dtype=np.int32, shape=(n_rows, len(KEY_COLS)))
+                end = offset + len(df)
+                features_mm[offset:end] = features
+                targets_mm[offset:end] = compute_targets(df)
+                keys_mm[offset:end] = df[KEY_COLS].to_numpy(dtype=np.int32)
+                offset = end
+                logger.info(f"Season {partition[0]} week {partition[1]} transformed: rows={len(df)}, "
+                            f"features={features.shape[1]}")
+
+            for block in (features_mm, targets_mm, keys_mm):
+                if block is not None:
+                    block.flush()
+            if features_mm is not None:
+                # CSR index over the blocks: per player histories / trajectories as O(1) memmap slices
+                build_sequence_store(out_dir, features_mm[:, names.index("num_frames_output")].astype(np.int64),
+                                     features_file_name=self.__config.features_file_name,
+                                     targets_file_name=self.__config.targets_file_name,
+                                     keys_file_name=self.__config.keys_file_name)
+            return n_rows, names
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    # ---------------------------- PUBLIC API ----------------------------
+    def initiate_data_transformation(self) -> DataTransformationArtifact:
+        try:
+            logger.info(f"{'>>'*20} Data Transformation Started:  {'<<'*20}")
+            with step("train") as train_step:
+                train_rows, feature_names = self._transform_split(self.__data_ingestion_artifact.train_file_path,
+                                                                  self.__config.transformed_train_dir)
+                train_step.record(rows_out=train_rows)
+            logger.info(f"Data Transformation - train blocks done: rows={train_rows}")
+            with step("test") as test_step:
+                test_rows, _ = self._transform_split(self.__data_ingestion_artifact.test_file_path,
+                                                     self.__config.transformed_test_dir)
+                test_step.record(rows_out=test_rows)
+            record(rows_out=train_rows + test_rows, features=len(feature_names))
+            logger.info(f"Data Transformation - test blocks done: rows={test_rows}")
+
+            # everything the predict pipeline needs to rebuild the same feature block
+            save_object(self.__config.transformation_state_file_path,
+                        {"version": self.__config.version,
+                         "feature_names": feature_names,
+                         "target_names": TARGET_COLS,
+                         "lags": list(self.__config.lags),
+                         "neighbors_k": self.__config.neighbors_k,
+                         "neighbor_radius": self.__config.neighbor_radius,
+                         "physics_mode": self.__config.physics_mode,
+                         "physics_steer": self.__config.physics_steer})
+
+            data_transformation_artifact = DataTransformationArtifact(
+                transformed_train_dir=self.__config.transformed_train_dir,
+                transformed_test_dir=self.__config.transformed_test_dir,
+                transformation_state_file_path=self.__config.transformation_state_file_path
+            )
+            logger.info(f"{'>>'*20} Data Transformation Completed..  {'<<'*20}")
+            return data_transformation_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
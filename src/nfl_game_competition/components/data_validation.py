@@ -0,0 +1,260 @@
+"""Data Validation
+step after data ingestion: checks the parquet feature store before anything is trained on it.
+
+Checks, all vectorized numpy passes over one (season, week) partition at a time:
+- column presence and stored dtypes (parquet footers) against data_schema/schema.yaml
+- value ranges (x, y, dir, o, s, a), null counts, min / max
+- key uniqueness on (game_id, play_id, nfl_id, frame_id)
+- frame continuity per player (frame_id steps of exactly 1)
+- drift: population stability index of fixed-range histograms against the baseline, the histograms of
+  the data the promoted model was trained on (copied next to it by model evaluation on promotion)
+Per-column checks of a partition run in parallel threads (numpy releases the GIL).
+"""
+
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.entity.config_entity import DataValidationConfig
+from src.nfl_game_competition.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
+from src.nfl_game_competition.constants.training_pipeline_constants import (DATA_INGESTION_PLAYER_COLS,
+                                                                           DATA_INGESTION_PARTITION_COLS)
+from src.nfl_game_competition.utils.common import (create_directories, load_feature_store, list_feature_store_partitions,
+                                                   partition_filters, player_dim_path, read_schema_dtypes, write_yaml)
+from src.nfl_game_competition.utils.instrumentation import record, step
+
+logger = get_logger(name="nfl_game_competition.components.data_validation")
+
+
+class DataValidation:
+    def __init__(self, data_ingestion_artifact: DataIngestionArtifact, config: DataValidationConfig):
+        try:
+            logger.info(f"{'>>'*20} Data Validation {'<<'*20}")
+            self.__data_ingestion_artifact = data_ingestion_artifact
+            self.__config = config
+            self.__schema_dtypes = read_schema_dtypes(config.schema_file_path)
+            logger.info(f"Data Validation config: {self.__config.__dict__}")
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    # ---------------------------- PRIVATE INTERNAL STEPS ----------------------------
+    @staticmethod
+    def _stored_dtype(arrow_type: pa.DataType) -> str:
+        """pandas dtype name a parquet column is stored as, before any schema cast on load"""
+        if pa.types.is_dictionary(arrow_type):
+            return "category"
+        if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+            return "object"
+        return str(np.dtype(arrow_type.to_pandas_dtype()))
+
+    def _validate_columns(self) -> dict:
+        """
+        column presence and stored dtypes, from the parquet footers only (no rows are read, no cast).
+        Text columns may be stored as plain strings or dictionaries (both load as the schema dtype);
+        numeric columns must be stored with exactly the schema dtype. Hive partition columns have no
+        stored dtype, only their presence is checked.
+        Returns:
+            dict: missing / unexpected columns and dtype mismatches {column: [expected, actual]}
+        """
+        try:
+            feature_store_path = self.__data_ingestion_artifact.feature_store_file_path
+            store = ds.dataset(feature_store_path, format="parquet", partitioning="hive")
+            partition_cols = set(store.partitioning.schema.names)
+            fields = [f for f in store.schema if f.name not in partition_cols]
+            dim_path = player_dim_path(feature_store_path)
+            if dim_path.exists():
+                dim_schema = ds.dataset(dim_path, format="parquet", partitioning="hive").schema
+                fields += [dim_schema.field(c) for c in DATA_INGESTION_PLAYER_COLS if c in dim_schema.names]
+            actual = {f.name: self._stored_dtype(f.type) for f in fields}
+            expected = self.__schema_dtypes
+            text = {"object", "category"}
+            mismatches = {c: [t, actual[c]] for c, t in expected.items() if c in actual and actual[c] != t
+                          and not (t in text and actual[c] in text)}
+            present = set(actual) | partition_cols
+            return {"missing_columns": sorted(set(expected) - present),
+                    "unexpected_columns": sorted(present - set(expected)),
+                    "dtype_mismatches": mismatches}
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    @staticmethod
+    def _column_stats(values: np.ndarray, value_range: Optional[Tuple], drift_range: Optional[Tuple],
+                      bins: int) -> dict:
+        """
+        nulls, min, max, out of range count and drift histogram of one column in one pass each.
+        NaN never counts as out of range (comparisons with NaN are False).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        nulls = np.isnan(values)
+        stats = {"rows": int(values.size), "nulls": int(nulls.sum()),
+                 "min": float(np.nanmin(values)) if values.size > nulls.sum() else None,
+                 "max": float(np.nanmax(values)) if values.size > nulls.sum() else None}
+        if value_range is not None:
+            lo, hi = value_range
+            out_of_range = np.zeros(values.shape, dtype=bool)
+            if lo is not None:
+                out_of_range |= values < lo
+            if hi is not None:
+                out_of_range |= values > hi
+            stats["out_of_range"] = int(out_of_range.sum())
+        if drift_range is not None:
+            lo, hi = drift_range
+            valid = values[~nulls]
+            bin_idx = np.clip(((valid - lo) * (bins / (hi - lo))).astype(np.int64), 0, bins - 1)
+            stats["histogram"] = np.bincount(bin_idx, minlength=bins)
+        return stats
+
+    @staticmethod
+    def _key_checks(game_id: np.ndarray, play_id: np.ndarray, nfl_id: np.ndarray, frame_id: np.ndarray) -> dict:
+        """
+        duplicate keys and frame gaps per player after one lexsort; consecutive rows of the same
+        player must step frame_id by exactly 1.
+        """
+        order = np.lexsort((frame_id, nfl_id, play_id, game_id))
+        g, p, n, f = (a[order].astype(np.int64) for a in (game_id, play_id, nfl_id, frame_id))
+        same_player = (g[1:] == g[:-1]) & (p[1:] == p[:-1]) & (n[1:] == n[:-1])
+        step = f[1:] - f[:-1]
+        duplicates = same_player & (step == 0)
+        gaps = same_player & (step > 1)
+        player_idx = np.cumsum(~same_player)  # player block number of rows 1..n-1
+        return {"duplicate_keys": int(duplicates.sum()),
+                "frame_gaps": int(gaps.sum()),
+                "players_with_gaps": int(np.unique(player_idx[gaps]).size)}
+
+    def _validate_partition(self, partition: Tuple[int, int], executor: ThreadPoolExecutor) -> Tuple[dict, dict]:
+        """
+        all row level checks of one (season, week) partition; column checks are fanned out on the thread pool.
+        Returns:
+            tuple: (column stats {column: stats}, key check results)
+        """
+        numeric_cols = [c for c in dict.fromkeys([*self.__config.value_ranges, *self.__config.drift_columns])
+                        if c in self.__schema_dtypes]
+        df = load_feature_store(self.__data_ingestion_artifact.feature_store_file_path,
+                                columns=[*self.__config.key_cols, *numeric_cols],
+                                filters=partition_filters(partition), schema_path=self.__config.schema_file_path)
+        key_future = executor.submit(self._key_checks, *(df[c].to_numpy() for c in self.__config.key_cols))
+        col_futures = {c: executor.submit(self._column_stats, df[c].to_numpy(),
+                                          self.__config.value_ranges.get(c),
+                                          self.__config.drift_columns.get(c),
+                                          self.__config.drift_bins)
+                       for c in numeric_cols}
+        return {c: future.result() for c, future in col_futures.items()}, key_future.result()
+
+    @staticmethod
+    def _merge_stats(total: Optional[dict], part: dict) -> dict:
+        """
+        combine per partition stats of one column
+        """
+        if total is None:
+            return dict(part)
+        merged = {"rows": total["rows"] + part["rows"], "nulls": total["nulls"] + part["nulls"]}
+        mins = [v for v in (total["min"], part["min"]) if v is not None]
+        maxs = [v for v in (total["max"], part["max"]) if v is not None]
+        merged["min"], merged["max"] = (min(mins) if mins else None), (max(maxs) if maxs else None)
+        for key in ("out_of_range", "histogram"):
+            if key in total:
+                merged[key] = total[key] + part[key]
+        return merged
+
+    def _drift_report(self, histograms: Dict[str, np.ndarray]) -> dict:
+        """
+        population stability index of each drift column against the baseline.
+        The current distributions are saved in the run dir; model evaluation makes them the
+        baseline when it promotes a model trained on this data. Without a baseline (nothing
+        promoted yet) drift is not checked: drift_detected is None and the status says so.
+        """
+        try:
+            eps = 1e-6
+            current = {c: (h / max(h.sum(), 1)).tolist() for c, h in histograms.items()}
+            create_directories([str(Path(self.__config.distributions_file_path).parent)], verbose=False)
+            with open(self.__config.distributions_file_path, "w") as f:
+                json.dump({"bins": self.__config.drift_bins,
+                           "ranges": {c: list(self.__config.drift_columns[c]) for c in current},
+                           "distributions": current}, f, indent=2)
+            baseline_path = Path(self.__config.baseline_file_path)
+            if not baseline_path.exists():
+                logger.warning(f"No drift baseline at {baseline_path}, drift not checked")
+                return {"drift_status": "no baseline", "drift_detected": None,
+                        "baseline_file_path": str(baseline_path), "columns": {}}
+
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+            columns = {}
+            for c, dist in current.items():
+                if c not in baseline["distributions"] or len(baseline["distributions"][c]) != len(dist):
+                    continue
+                p = np.asarray(dist) + eps
+                q = np.asarray(baseline["distributions"][c]) + eps
+                psi = float(np.sum((p - q) * np.log(p / q)))
+                columns[c] = {"psi": round(psi, 6), "drift": psi > self.__config.drift_threshold}
+            drift_detected = any(col["drift"] for col in columns.values())
+            return {"drift_status": "drift" if drift_detected else "no drift",
+                    "drift_detected": drift_detected,
+                    "baseline_file_path": str(baseline_path),
+                    "threshold": self.__config.drift_threshold,
+                    "columns": columns}
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    # ---------------------------- PUBLIC API ----------------------------
+    def initiate_data_validation(self) -> DataValidationArtifact:
+        try:
+            logger.info(f"{'>>'*20} Data Validation Started:  {'<<'*20}")
+            with step("columns"):
+                column_report = self._validate_columns()
+            logger.info(f"Data Validation - column check done: {column_report}")
+
+            partitions = list_feature_store_partitions(self.__data_ingestion_artifact.feature_store_file_path,
+                                                       DATA_INGESTION_PARTITION_COLS)
+            column_stats: Dict[str, dict] = {}
+            key_report = {"duplicate_keys": 0, "frame_gaps": 0, "players_with_gaps": 0}
+            with step("partitions") as partitions_step, ThreadPoolExecutor(max_workers=self.__config.workers) as executor:
+                for partition in partitions:
+                    stats, keys = self._validate_partition(partition, executor)
+                    for c, part in stats.items():
+                        column_stats[c] = self._merge_stats(column_stats.get(c), part)
+                    for k in key_report:
+                        key_report[k] += keys[k]
+                partitions_step.record(partitions=len(partitions))
+            logger.info(f"Data Validation - {len(partitions)} partitions checked, key checks: {key_report}")
+
+            with step("drift"):
+                drift_report = self._drift_report({c: s.pop("histogram") for c, s in column_stats.items()
+                                                   if "histogram" in s})
+            out_of_range = {c: s["out_of_range"] for c, s in column_stats.items() if s.get("out_of_range")}
+            validation_status = (not column_report["missing_columns"] and not column_report["dtype_mismatches"]
+                                 and not out_of_range and key_report["duplicate_keys"] == 0
+                                 and key_report["frame_gaps"] == 0)
+
+            write_yaml({"validation_status": bool(validation_status),
+                        "partitions": [dict(zip(DATA_INGESTION_PARTITION_COLS, p)) for p in partitions],
+                        "columns": column_report,
+                        "out_of_range": out_of_range,
+                        "keys": key_report,
+                        "column_stats": column_stats}, self.__config.report_file_path)
+            write_yaml(drift_report, self.__config.drift_report_file_path)
+            record(validation_status=bool(validation_status))
+            if drift_report["drift_detected"]:
+                logger.warning(f"Data drift detected: {drift_report['columns']}")
+
+            data_validation_artifact = DataValidationArtifact(
+                validation_status=bool(validation_status),
+                feature_store_file_path=self.__data_ingestion_artifact.feature_store_file_path,
+                train_file_path=self.__data_ingestion_artifact.train_file_path,
+                test_file_path=self.__data_ingestion_artifact.test_file_path,
+                report_file_path=self.__config.report_file_path,
+                drift_report_file_path=self.__config.drift_report_file_path,
+                distributions_file_path=self.__config.distributions_file_path
+            )
+            logger.info(f"{'>>'*20} Data Validation Completed..  {'<<'*20}")
+            return data_validation_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
@@ -0,0 +1,237 @@
+"""Model Evaluation
+step after model trainer: scores the candidate on the test blocks and gates its promotion.
+
+- competition RMSE, sqrt(mean((pred - true)^2)) over target_x / target_y, from one per-row squared
+  error array; breakdowns by player_role, player_position and horizon (frames ahead) are bincounts
+  of that array, no groupby
+- confidence intervals by resampling plays: per-play error sums are gathered with a
+  (replicates, n_plays) index matrix per chunk, so thousands of replicates are a few matrix sums
+- the candidate is compared with the saved model on the same resampled plays (paired bootstrap)
+  and promoted to models/saved_models when the improvement interval clears min_improvement
+- a candidate trained on data that failed validation is scored and reported, never promoted
+"""
+
+import os, sys
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.entity.config_entity import ModelEvaluationConfig
+from src.nfl_game_competition.entity.artifact_entity import (DataValidationArtifact, DataTransformationArtifact,
+                                                             ModelTrainerArtifact, ModelEvaluationArtifact)
+from src.nfl_game_competition.utils.common import (create_directories, load_object, load_split_data, play_keys,
+                                                   read_yaml, write_yaml)
+from src.nfl_game_competition.utils.instrumentation import record, step
+from src.nfl_game_competition.utils.batch_stream import MiniBatchStream
+
+logger = get_logger(name="nfl_game_competition.components.model_evaluation")
+
+KEY_COLS: List[str] = ["game_id", "play_id", "nfl_id", "frame_id"]
+BREAKDOWN_COLS: List[str] = ["player_role", "player_position"]
+
+
+# ---------------------------- VECTORIZED METRICS ----------------------------
+def squared_errors(prediction: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """(n_rows,) float64 (dx^2 + dy^2) per row"""
+    diff = np.asarray(prediction, dtype=np.float64) - np.asarray(target, dtype=np.float64)
+    return np.einsum("ij,ij->i", diff, diff)
+
+
+def rmse(sq_error: np.ndarray) -> float:
+    return float(np.sqrt(sq_error.sum() / (2 * max(len(sq_error), 1))))
+
+
+def rmse_by_group(sq_error: np.ndarray, codes: np.ndarray, labels: List) -> Dict:
+    """{label: {rmse, rows}} of every group code in one bincount pass"""
+    sums = np.bincount(codes, weights=sq_error, minlength=len(labels))
+    counts = np.bincount(codes, minlength=len(labels))
+    return {label: {"rmse": float(np.sqrt(sums[i] / (2 * counts[i]))), "rows": int(counts[i])}
+            for i, label in enumerate(labels) if counts[i] > 0}
+
+
+def bootstrap_play_rmse(sq_errors: List[np.ndarray], play_codes: np.ndarray, n_bootstrap: int,
+                        seed: int = 42, chunk: int = 256) -> np.ndarray:
+    """
+    play level bootstrap of the rmse of one or more models on the same rows.
+    Every model sees the same resampled plays, so replicate differences are paired.
+    Returns:
+        np.ndarray: (n_models, n_bootstrap) replicate rmses
+    """
+    n_plays = int(play_codes.max()) + 1
+    play_rows = np.bincount(play_codes, minlength=n_plays).astype(np.float64)
+    play_sums = np.stack([np.bincount(play_codes, weights=sq, minlength=n_plays) for sq in sq_errors])
+    rng = np.random.default_rng(seed)
+    replicates = np.empty((len(sq_errors), n_bootstrap), dtype=np.float64)
+    for start in range(0, n_bootstrap, chunk):
+        size = min(chunk, n_bootstrap - start)
+        sample = rng.integers(0, n_plays, size=(size, n_plays))  # (replicates, plays) index matrix
+        rows = play_rows[sample].sum(axis=1)
+        replicates[:, start:start + size] = np.sqrt(play_sums[:, sample].sum(axis=2) / (2 * rows))
+    return replicates
+
+
+def percentile_interval(values: np.ndarray, confidence: float) -> List[float]:
+    alpha = (1.0 - confidence) / 2
+    low, high = np.quantile(values, [alpha, 1.0 - alpha])
+    return [float(low), float(high)]
+
+
+class ModelEvaluation:
+    def __init__(self, data_validation_artifact: DataValidationArtifact,
+                 data_transformation_artifact: DataTransformationArtifact,
+                 model_trainer_artifact: ModelTrainerArtifact, config: ModelEvaluationConfig):
+        try:
+            logger.info(f"{'>>'*20} Model Evaluation {'<<'*20}")
+            self.__data_validation_artifact = data_validation_artifact
+            self.__data_transformation_artifact = data_transformation_artifact
+            self.__model_trainer_artifact = model_trainer_artifact
+            self.__config = config
+            self.__params = read_yaml(Path(config.params_file_path)).model_evaluation
+            logger.info(f"Model Evaluation config: {self.__config.__dict__}")
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    # ---------------------------- PRIVATE INTERNAL STEPS ----------------------------
+    def _predict(self, model) -> Tuple[np.ndarray, np.ndarray]:
+        """(predictions, targets) of the whole test block, predicted batch by batch"""
+        stream = MiniBatchStream([self.__data_transformation_artifact.transformed_test_dir],
+                                 features_file_name=self.__config.features_file_name,
+                                 targets_file_name=self.__config.targets_file_name,
+                                 batch_size=self.__config.batch_size)
+        predictions, targets = [], []
+        for X, Y in stream.batches(shuffle=False):
+            predictions.append(model.predict(X))
+            targets.append(Y)
+        return np.concatenate(predictions), np.concatenate(targets)
+
+    def _group_codes(self, keys: np.ndarray) -> Dict[str, Tuple[np.ndarray, List]]:
+        """
+        integer codes (aligned with the test block rows) of plays, horizons and the breakdown columns.
+        The feature store rows are matched to the block rows by sorting both on the 4 key columns.
+        """
+        try:
+            df = load_split_data(self.__data_validation_artifact.feature_store_file_path,
+                                 self.__data_validation_artifact.test_file_path,
+                                 columns=[*KEY_COLS, *BREAKDOWN_COLS], schema_path=self.__config.schema_file_path)
+            if len(df) != len(keys):
+                raise ValueError(f"test rows in feature store ({len(df)}) != test block rows ({len(keys)})")
+            block_order = np.lexsort(keys.T[::-1])
+            store_order = np.lexsort([df[c].to_numpy() for c in KEY_COLS][::-1])
+            aligned = np.empty(len(keys), dtype=np.int64)
+            aligned[block_order] = store_order  # feature store row of every block row
+
+            codes: Dict[str, Tuple[np.ndarray, List]] = {}
+            for c in BREAKDOWN_COLS:
+                labels, inverse = np.unique(df[c].astype(str).to_numpy()[aligned], return_inverse=True)
+                codes[c] = (inverse, labels.tolist())
+            # output frame_id counts frames after the throw: horizon 1 is the first predicted frame
+            horizon = keys[:, 3].astype(np.int64)
+            codes["horizon"] = (horizon, list(range(int(horizon.max()) + 1)))
+            _, play_codes = np.unique(play_keys(keys[:, 0], keys[:, 1]), return_inverse=True)
+            codes["play"] = (play_codes, [])
+            return codes
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def _load_previous_model(self, feature_names: List[str]):
+        """saved model if one exists and was trained on the same feature definitions, else None"""
+        if not (os.path.exists(self.__config.saved_model_file_path) and os.path.exists(self.__config.saved_state_file_path)):
+            logger.info("No saved model yet, the candidate is compared against nothing")
+            return None
+        saved_state = load_object(self.__config.saved_state_file_path)
+        if saved_state["feature_names"] != feature_names:
+            logger.warning(f"Saved model uses feature version {saved_state.get('version')}, not comparable on "
+                           "the current test blocks; the candidate replaces it")
+            return None
+        return load_object(self.__config.saved_model_file_path)
+
+    def _promote(self) -> None:
+        """copy candidate model, transformation state and its data's drift histograms into the saved model dir"""
+        try:
+            create_directories([os.path.dirname(self.__config.saved_model_file_path)], verbose=False)
+            shutil.copy2(self.__model_trainer_artifact.trained_model_file_path, self.__config.saved_model_file_path)
+            shutil.copy2(self.__data_transformation_artifact.transformation_state_file_path,
+                         self.__config.saved_state_file_path)
+            shutil.copy2(self.__data_validation_artifact.distributions_file_path,
+                         self.__config.saved_baseline_file_path)
+            logger.info(f"Candidate promoted to {self.__config.saved_model_file_path}")
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    # ---------------------------- PUBLIC API ----------------------------
+    def initiate_model_evaluation(self) -> ModelEvaluationArtifact:
+        try:
+            logger.info(f"{'>>'*20} Model Evaluation Started:  {'<<'*20}")
+            state = load_object(self.__data_transformation_artifact.transformation_state_file_path)
+            candidate = load_object(self.__model_trainer_artifact.trained_model_file_path)
+            keys = np.asarray(np.load(os.path.join(self.__data_transformation_artifact.transformed_test_dir,
+                                                   self.__config.keys_file_name), mmap_mode="r"))
+            codes = self._group_codes(keys)
+
+            with step("predict") as predict_step:
+                prediction, target = self._predict(candidate)
+                predict_step.record(rows_out=len(prediction))
+            candidate_sq = squared_errors(prediction, target)
+            candidate_rmse = rmse(candidate_sq)
+            breakdown = {c: rmse_by_group(candidate_sq, *codes[c]) for c in [*BREAKDOWN_COLS, "horizon"]}
+            logger.info(f"Candidate test rmse: {candidate_rmse:.4f} on {len(candidate_sq)} rows")
+
+            previous = self._load_previous_model(state["feature_names"])
+            sq_errors = [candidate_sq]
+            if previous is not None:
+                with step("predict_previous") as previous_step:
+                    sq_errors.append(squared_errors(self._predict(previous)[0], target))
+                    previous_step.record(rows_out=len(target))
+            confidence = float(self.__params.confidence)
+            with step("bootstrap", rows_in=len(candidate_sq)) as bootstrap_step:
+                replicates = bootstrap_play_rmse(sq_errors, codes["play"][0], int(self.__params.n_bootstrap),
+                                                 seed=int(self.__params.seed), chunk=self.__config.bootstrap_chunk)
+                bootstrap_step.record(replicates=int(self.__params.n_bootstrap))
+            record(rows_in=len(candidate_sq))
+            candidate_ci = percentile_interval(replicates[0], confidence)
+
+            previous_rmse, improvement_ci = None, None
+            if previous is None:
+                is_model_accepted = True
+            else:
+                previous_rmse = rmse(sq_errors[1])
+                improvement_ci = percentile_interval(replicates[1] - replicates[0], confidence)
+                is_model_accepted = improvement_ci[0] > float(self.__params.min_improvement)
+                logger.info(f"Previous rmse: {previous_rmse:.4f}, improvement {confidence:.0%} CI: {improvement_ci}")
+            validation_status = bool(self.__data_validation_artifact.validation_status)
+            if not validation_status:
+                is_model_accepted = False
+                logger.warning("Data validation failed, candidate not promoted, see "
+                               f"{self.__data_validation_artifact.report_file_path}")
+
+            write_yaml({"is_model_accepted": bool(is_model_accepted),
+                        "validation_status": validation_status,
+                        "candidate": {"rmse": candidate_rmse, "ci": candidate_ci, "rows": int(len(candidate_sq)),
+                                      "plays": int(codes["play"][0].max()) + 1},
+                        "previous": None if previous is None else {"rmse": previous_rmse},
+                        "improvement_ci": improvement_ci,
+                        "bootstrap": {"replicates": int(self.__params.n_bootstrap), "confidence": confidence},
+                        "breakdown": breakdown}, self.__config.report_file_path)
+            if is_model_accepted:
+                self._promote()
+            elif validation_status:
+                logger.info("Candidate not better than the saved model, not promoted")
+
+            model_evaluation_artifact = ModelEvaluationArtifact(
+                is_model_accepted=bool(is_model_accepted),
+                candidate_rmse=candidate_rmse,
+                candidate_rmse_ci=candidate_ci,
+                previous_rmse=previous_rmse,
+                rmse_improvement_ci=improvement_ci,
+                trained_model_file_path=self.__model_trainer_artifact.trained_model_file_path,
+                saved_model_file_path=self.__config.saved_model_file_path,
+                report_file_path=self.__config.report_file_path
+            )
+            logger.info(f"{'>>'*20} Model Evaluation Completed..  {'<<'*20}")
+            return model_evaluation_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
@@ -0,0 +1,213 @@
+"""Model Trainer
+step after data transformation: fits an incremental regressor on datasets larger than RAM.
+
+The train / test feature blocks are memory mapped shards; utils.batch_stream reads them as
+contiguous mini-batches (shuffled per epoch) on a background prefetch thread while the
+estimator runs partial_fit on the current batch. Memory use is a few batches, whatever the split size.
+
+Cross validation is GroupKFold over plays (game_id, play_id) on a process pool. The fold id of
+every row is written once to a .npy file; workers memory map it together with the train block, so
+the feature matrix is shared through the page cache instead of being pickled to every worker.
+Out-of-fold predictions are written by each worker into its own rows of one shared memmap.
+"""
+
+import os, sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.entity.config_entity import ModelTrainerConfig
+from src.nfl_game_competition.entity.artifact_entity import (DataTransformationArtifact, ModelTrainerArtifact,
+                                                             ModelTunerArtifact, RegressionMetricArtifact)
+from src.nfl_game_competition.utils.common import create_directories, load_object, play_keys, read_yaml, save_object
+from src.nfl_game_competition.utils.batch_stream import MiniBatchStream
+from src.nfl_game_competition.utils.model_utils import (IncrementalRegressor, StreamingRMSE,
+                                                        build_incremental_estimator, fit_incremental,
+                                                        score_incremental)
+from src.nfl_game_competition.utils.instrumentation import record, step
+
+logger = get_logger(name="nfl_game_competition.components.model_trainer")
+
+
+# ---------------------------- PROCESS POOL WORKER ----------------------------
+# kept at module level so it can be pickled by ProcessPoolExecutor (spawn on windows)
+def _fit_fold(fold: int, split_dir: str, fold_ids_path: str, oof_path: str, model_path: str,
+              template: IncrementalRegressor, epochs: int, batch_size: int, seed: int,
+              features_file_name: str, targets_file_name: str) -> dict:
+    """
+    fit one fold on the rows of the other folds and predict its own rows.
+    Only the small unfitted template is pickled in; rows are selected from the memory mapped
+    fold ids, predictions go into this fold's rows of the shared oof memmap.
+    """
+    fold_ids = np.load(fold_ids_path, mmap_mode="r")
+    train_rows, valid_rows = np.flatnonzero(fold_ids != fold), np.flatnonzero(fold_ids == fold)
+    stream = lambda rows: MiniBatchStream([split_dir], features_file_name=features_file_name,
+                                          targets_file_name=targets_file_name, batch_size=batch_size,
+                                          row_indices=[rows])
+    model = fit_incremental(template.fresh_copy(), stream(train_rows), epochs=epochs, seed=seed + fold)
+
+    oof = np.load(oof_path, mmap_mode="r+")
+    metric, offset = StreamingRMSE(), 0
+    for X, Y in stream(valid_rows).batches(shuffle=False):
+        prediction = model.predict(X)
+        oof[valid_rows[offset:offset + len(X)]] = prediction
+        metric.update(prediction, Y)
+        offset += len(X)
+    oof.flush()
+    save_object(model_path, model)
+    return {"fold": fold, "train_rows": int(len(train_rows)), **metric.as_dict()}
+
+
+class ModelTrainer:
+    def __init__(self, data_transformation_artifact: DataTransformationArtifact, config: ModelTrainerConfig,
+                 model_tuner_artifact: Optional[ModelTunerArtifact] = None):
+        try:
+            logger.info(f"{'>>'*20} Model Trainer {'<<'*20}")
+            self.__data_transformation_artifact = data_transformation_artifact
+            self.__config = config
+            self.__model_tuner_artifact = model_tuner_artifact
+            params = read_yaml(Path(config.params_file_path))
+            self.__params = params.model_trainer
+            self.__cv_params = params.get("cross_validation", {})
+            logger.info(f"Model Trainer config: {self.__config.__dict__}, params: {self.__params.to_dict()}")
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    # ---------------------------- PRIVATE INTERNAL STEPS ----------------------------
+    def _stream(self, split_dir: str) -> MiniBatchStream:
+        """memory mapped mini-batch stream over one transformed split"""
+        return MiniBatchStream([split_dir], features_file_name=self.__config.features_file_name,
+                               targets_file_name=self.__config.targets_file_name,
+                               batch_size=self.__config.batch_size,
+                               prefetch_batches=self.__config.prefetch_batches)
+
+    def _build_model(self) -> IncrementalRegressor:
+        """
+        unfitted regressor on the feature names of the transformation state; estimator from the
+        model tuner when it ran, else from params.yaml. Tuned params override the params.yaml ones
+        of that estimator, params the search space does not cover keep their params.yaml value.
+        """
+        try:
+            state = load_object(self.__data_transformation_artifact.transformation_state_file_path)
+            if self.__model_tuner_artifact is not None:
+                name = self.__model_tuner_artifact.estimator
+                params = {**self.__params.get(name, {}), **self.__model_tuner_artifact.best_params}
+                logger.info(f"Using tuned {name} params: {params}")
+            else:
+                name = self.__params.estimator
+                params = dict(self.__params.get(name, {}))
+                logger.info(f"Using {name} params: {params}")
+            estimator = build_incremental_estimator(name, params, random_state=self.__config.random_state)
+            return IncrementalRegressor(estimator, state["feature_names"],
+                                        anchor_cols=self.__params.get("anchor_cols", ["x", "y"]))
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def _assign_folds(self, n_splits: int) -> np.ndarray:
+        """
+        GroupKFold fold id of every train row, groups = plays, so all frames and players of a play
+        land in the same fold. Saved as a memory mappable .npy for the fold workers.
+        """
+        try:
+            from sklearn.model_selection import GroupKFold  # lazy: sklearn is only needed once training starts
+            keys = np.load(os.path.join(self.__data_transformation_artifact.transformed_train_dir,
+                                        self.__config.keys_file_name), mmap_mode="r")
+            groups = play_keys(keys[:, 0], keys[:, 1])
+            fold_ids = np.empty(len(groups), dtype=np.int8)
+            for fold, (_, valid_rows) in enumerate(GroupKFold(n_splits=n_splits).split(groups, groups=groups)):
+                fold_ids[valid_rows] = fold
+            create_directories([self.__config.cross_validation_dir], verbose=False)
+            np.save(self.__config.fold_ids_file_path, fold_ids)
+            return fold_ids
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def _cross_validate(self, template: IncrementalRegressor) -> Optional[RegressionMetricArtifact]:
+        """
+        parallel GroupKFold; fold models and out-of-fold predictions saved with save_object.
+        Returns:
+            RegressionMetricArtifact: out-of-fold RMSE, None when cross validation is disabled
+        """
+        try:
+            cv_params = self.__cv_params
+            n_splits = int(cv_params.get("n_splits") or 0)
+            if n_splits < 2:
+                logger.info("Cross validation disabled (n_splits < 2)")
+                return None
+            fold_ids = self._assign_folds(n_splits)
+            train_dir = self.__data_transformation_artifact.transformed_train_dir
+
+            # shared output: each fold writes only its own rows
+            oof_scratch = os.path.join(self.__config.cross_validation_dir, "oof_predictions.npy")
+            np.lib.format.open_memmap(oof_scratch, mode="w+", dtype=np.float32, shape=(len(fold_ids), 2)).flush()
+
+            workers = cv_params.get("workers") or max(1, (os.cpu_count() or 1) - 1)
+            workers = max(1, min(int(workers), n_splits))
+            logger.info(f"Cross validation: {n_splits} GroupKFold folds over {len(fold_ids)} rows, {workers} worker(s)")
+            jobs = [(fold, train_dir, self.__config.fold_ids_file_path, oof_scratch,
+                     self.__config.fold_model_file_path.format(fold=fold), template,
+                     int(self.__params.epochs), self.__config.batch_size, self.__config.random_state,
+                     self.__config.features_file_name, self.__config.targets_file_name)
+                    for fold in range(n_splits)]
+            fold_reports = []
+            if workers == 1:
+                fold_reports = [_fit_fold(*job) for job in jobs]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(_fit_fold, *job) for job in jobs]
+                    for future in as_completed(futures):
+                        fold_reports.append(future.result())
+            for report in sorted(fold_reports, key=lambda r: r["fold"]):
+                logger.info(f"Fold {report['fold']}: rmse={report['rmse']:.4f}, valid rows={report['rows']}")
+
+            oof = np.array(np.load(oof_scratch, mmap_mode="r"))
+            targets = np.load(os.path.join(train_dir, self.__config.targets_file_name), mmap_mode="r")
+            oof_metric = StreamingRMSE()
+            for start in range(0, len(oof), self.__config.batch_size):
+                oof_metric.update(oof[start:start + self.__config.batch_size],
+                                  targets[start:start + self.__config.batch_size])
+            save_object(self.__config.oof_file_path, {"predictions": oof, "fold_ids": fold_ids,
+                                                      "folds": sorted(fold_reports, key=lambda r: r["fold"])})
+            os.remove(oof_scratch)
+            logger.info(f"Cross validation out-of-fold rmse: {oof_metric.value:.4f}")
+            return RegressionMetricArtifact(**oof_metric.as_dict())
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    # ---------------------------- PUBLIC API ----------------------------
+    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+        try:
+            logger.info(f"{'>>'*20} Model Trainer Started:  {'<<'*20}")
+            train_stream = self._stream(self.__data_transformation_artifact.transformed_train_dir)
+            test_stream = self._stream(self.__data_transformation_artifact.transformed_test_dir)
+            logger.info(f"Model Trainer - streaming {train_stream.n_rows} train rows in batches of "
+                        f"{self.__config.batch_size}, {self.__params.epochs} epochs")
+
+            template = self._build_model()
+            with step("cross_validation", rows_in=train_stream.n_rows):
+                cv_metric = self._cross_validate(template)
+            with step("fit", rows_in=train_stream.n_rows * int(self.__params.epochs)):
+                model = fit_incremental(template.fresh_copy(), train_stream, epochs=int(self.__params.epochs),
+                                        seed=self.__config.random_state)
+            with step("score", rows_in=train_stream.n_rows + test_stream.n_rows):
+                train_metric = score_incremental(model, train_stream)
+                test_metric = score_incremental(model, test_stream)
+            record(rows_in=train_stream.n_rows, epochs=int(self.__params.epochs))
+            logger.info(f"Model Trainer - train rmse: {train_metric.value:.4f}, test rmse: {test_metric.value:.4f}")
+
+            save_object(self.__config.trained_model_file_path, model)
+            model_trainer_artifact = ModelTrainerArtifact(
+                trained_model_file_path=self.__config.trained_model_file_path,
+                train_metric_artifact=RegressionMetricArtifact(**train_metric.as_dict()),
+                test_metric_artifact=RegressionMetricArtifact(**test_metric.as_dict()),
+                cv_metric_artifact=cv_metric,
+                cross_validation_dir=self.__config.cross_validation_dir if cv_metric else None
+            )
+            logger.info(f"{'>>'*20} Model Trainer Completed..  {'<<'*20}")
+            return model_trainer_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
@@ -0,0 +1,273 @@
+"""Model Tuner
+optional step between data transformation and model trainer: successive halving search.
+
+- configurations are sampled from the params.yaml search space of the estimator; sampled values
+  override the model_trainer params of that estimator, the same merge the model trainer applies
+- rung r trains every surviving configuration on min_rows * eta^r train rows and keeps the best 1/eta,
+  so poor configurations are stopped early on small subsets and only a few see the whole split;
+  the subset of a rung is drawn once (seed random_state + rung), every configuration trains on it
+- trials run on a process pool; every worker memory maps the same read-only train block and the
+  holdout row indices, nothing but the trial params is pickled
+- every finished (trial, rung) is appended to a jsonl trial log outside the run dir; a rerun with the
+  same search (space, budget, data) skips whatever the log already holds. The data is fingerprinted
+  by the transformation version and the content hashes of the train keys / targets blocks
+- only numeric divergence (overflow, non-finite score) makes a trial lose; any other error of a
+  trial (invalid parameter, missing block) stops the search
+"""
+
+import os, sys
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.entity.config_entity import ModelTunerConfig
+from src.nfl_game_competition.entity.artifact_entity import DataTransformationArtifact, ModelTunerArtifact
+from src.nfl_game_competition.utils.common import create_directories, load_object, play_keys, read_yaml, write_yaml
+from src.nfl_game_competition.utils.batch_stream import MiniBatchStream
+from src.nfl_game_competition.utils.model_utils import (IncrementalRegressor, build_incremental_estimator,
+                                                        fit_incremental, score_incremental)
+from src.nfl_game_competition.utils.instrumentation import record, step
+from src.nfl_game_competition.utils.manifest import file_sha256
+
+logger = get_logger(name="nfl_game_competition.components.model_tuner")
+
+
+def sample_search_space(space: dict, n: int, seed: int) -> List[dict]:
+    """
+    n configurations of a search space {param: {type, ...}}; same seed -> same configurations.
+    types: loguniform / uniform (low, high), int (low, high inclusive), choice (values)
+    """
+    rng = np.random.default_rng(seed)
+    configs: List[dict] = [{} for _ in range(n)]
+    for name, spec in space.items():
+        kind = spec["type"]
+        if kind == "loguniform":
+            values = np.exp(rng.uniform(np.log(spec["low"]), np.log(spec["high"]), n)).tolist()
+        elif kind == "uniform":
+            values = rng.uniform(spec["low"], spec["high"], n).tolist()
+        elif kind == "int":
+            values = rng.integers(spec["low"], spec["high"] + 1, n).tolist()
+        elif kind == "choice":
+            values = [spec["values"][i] for i in rng.integers(0, len(spec["values"]), n)]
+        else:
+            raise ValueError(f"unknown search space type for {name}: {kind}")
+        for config, value in zip(configs, values):
+            config[name] = value
+    return configs
+
+
+def _diverged(error: BaseException) -> bool:
+    """
+    True if error (or an error it wraps) is a numeric blow-up of the configuration: a FloatingPointError
+    or the floating-point under-/overflow ValueError of sklearn's SGD. Invalid parameters are not.
+    """
+    while error is not None:
+        if isinstance(error, FloatingPointError) or (isinstance(error, ValueError) and "overflow" in str(error)):
+            return True
+        error = error.__cause__
+    return False
+
+
+# ---------------------------- PROCESS POOL WORKER ----------------------------
+# kept at module level so it can be pickled by ProcessPoolExecutor (spawn on windows)
+def _run_trial(trial: int, rung: int, rows: int, estimator: str, params: dict, feature_names: List[str],
+               anchor_cols: List[str], split_dir: str, holdout_path: str, epochs: int, batch_size: int, seed: int,
+               subset_seed: int, features_file_name: str, targets_file_name: str) -> dict:
+    """
+    train one configuration on `rows` train rows and score it on the shared holdout rows.
+    The train rows are drawn with subset_seed, so every configuration of a rung gets the same rows.
+    A diverged configuration scores rmse None; other errors are raised as RuntimeError (picklable
+    across the process pool, unlike NFLGameCompetitionException).
+    """
+    start = time.perf_counter()
+    holdout = np.load(holdout_path, mmap_mode="r")
+    n_rows = len(np.load(os.path.join(split_dir, targets_file_name), mmap_mode="r"))
+    is_holdout = np.zeros(n_rows, dtype=bool)
+    is_holdout[holdout] = True
+    stream = lambda row_subset, size: MiniBatchStream([split_dir], features_file_name=features_file_name,
+                                                      targets_file_name=targets_file_name, batch_size=size,
+                                                      row_indices=[row_subset])
+    model = IncrementalRegressor(build_incremental_estimator(estimator, params, random_state=seed), feature_names,
+                                 anchor_cols)
+    try:
+        fit_incremental(model, stream(np.flatnonzero(~is_holdout), max(1, min(batch_size, rows))),
+                        epochs=epochs, seed=seed, max_rows=rows, subset_seed=subset_seed)
+        rmse = score_incremental(model, stream(np.asarray(holdout), batch_size)).value
+    except Exception as e:
+        if not _diverged(e):
+            raise RuntimeError(f"Trial {trial} rung {rung} with params {params} failed: {e}") from None
+        # diverging configurations lose, they do not stop the search
+        logger.warning(f"Trial {trial} rung {rung} diverged: {e}")
+        rmse = float("inf")
+    return {"trial": trial, "rung": rung, "rows": int(rows), "params": params,
+            "rmse": rmse if np.isfinite(rmse) else None, "seconds": round(time.perf_counter() - start, 3)}
+
+
+class ModelTuner:
+    def __init__(self, data_transformation_artifact: DataTransformationArtifact, config: ModelTunerConfig):
+        try:
+            logger.info(f"{'>>'*20} Model Tuner {'<<'*20}")
+            self.__data_transformation_artifact = data_transformation_artifact
+            self.__config = config
+            params = read_yaml(Path(config.params_file_path))
+            self.__params = params.model_tuner
+            self.__anchor_cols = list(params.model_trainer.get("anchor_cols", ["x", "y"]))
+            self.__base_params = dict(params.model_trainer.get(self.__params.estimator, {}))
+            logger.info(f"Model Tuner config: {self.__config.__dict__}")
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    # ---------------------------- PRIVATE INTERNAL STEPS ----------------------------
+    def _split_holdout(self) -> int:
+        """
+        hold out a fraction of the train plays (never rows of the same play on both sides);
+        the row indices are saved for the trial workers. Returns the number of train rows left.
+        """
+        try:
+            keys = np.load(os.path.join(self.__data_transformation_artifact.transformed_train_dir,
+                                        self.__config.keys_file_name), mmap_mode="r")
+            row_plays = play_keys(keys[:, 0], keys[:, 1])
+            plays = np.unique(row_plays)
+            rng = np.random.default_rng(self.__config.random_state)
+            n_holdout = max(1, int(round(len(plays) * float(self.__params.holdout_fraction))))
+            holdout_plays = plays[rng.permutation(len(plays))[:n_holdout]]
+            holdout_rows = np.flatnonzero(np.isin(row_plays, holdout_plays))
+            create_directories([self.__config.model_tuner_dir], verbose=False)
+            np.save(self.__config.holdout_file_path, holdout_rows)
+            return len(row_plays) - len(holdout_rows)
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def _search_id(self, space: dict, state: dict, train_rows: int) -> str:
+        """
+        hash of everything a logged result depends on; log lines of other searches are ignored.
+        The train block is fingerprinted by content (keys and targets), so a re-ingest or re-transform
+        with the same row count starts a new search instead of replaying stale results.
+        """
+        p = self.__params
+        train_dir = self.__data_transformation_artifact.transformed_train_dir
+        train_block = {name: file_sha256(os.path.join(train_dir, name))
+                       for name in (self.__config.keys_file_name, self.__config.targets_file_name)}
+        content = json.dumps({"estimator": p.estimator, "space": space, "n_trials": p.n_trials, "eta": p.eta,
+                              "min_rows": p.min_rows, "max_rows": p.max_rows, "epochs": p.epochs,
+                              "holdout_fraction": p.holdout_fraction, "seed": self.__config.random_state,
+                              "features": state["feature_names"], "anchor": self.__anchor_cols,
+                              "base_params": self.__base_params, "transformation_version": state.get("version"),
+                              "train_rows": train_rows, "train_block": train_block}, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+    def _load_trial_log(self, search_id: str) -> Dict[Tuple[int, int], dict]:
+        """finished (trial, rung) results of this search from the on-disk log"""
+        done: Dict[Tuple[int, int], dict] = {}
+        if os.path.exists(self.__config.trial_log_file_path):
+            with open(self.__config.trial_log_file_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:  # half written last line of an interrupted run
+                        continue
+                    if record.get("search_id") == search_id:
+                        done[(record["trial"], record["rung"])] = record
+        return done
+
+    def _run_rung(self, rung: int, rows: int, trials: List[int], configs: List[dict], feature_names: List[str],
+                  search_id: str, done: Dict[Tuple[int, int], dict]) -> Dict[int, float]:
+        """
+        evaluate the surviving trials at one budget; results already in the log are reused,
+        new ones are appended (and flushed) as soon as each trial finishes.
+        Returns:
+            dict: {trial: holdout rmse}, inf for diverged trials
+        """
+        try:
+            pending = [t for t in trials if (t, rung) not in done]
+            logger.info(f"Rung {rung}: {len(trials)} trial(s) on {rows} rows, {len(trials) - len(pending)} from log")
+            jobs = [(t, rung, rows, self.__params.estimator, {**self.__base_params, **configs[t]},
+                     feature_names, self.__anchor_cols,
+                     self.__data_transformation_artifact.transformed_train_dir, self.__config.holdout_file_path,
+                     int(self.__params.epochs), self.__config.batch_size, self.__config.random_state + t,
+                     self.__config.random_state + rung,
+                     self.__config.features_file_name, self.__config.targets_file_name) for t in pending]
+            create_directories([str(Path(self.__config.trial_log_file_path).parent)], verbose=False)
+            with open(self.__config.trial_log_file_path, "a") as log:
+                def _record(result: dict) -> None:
+                    result["search_id"] = search_id
+                    log.write(json.dumps(result) + "\n")
+                    log.flush()
+                    done[(result["trial"], rung)] = result
+
+                workers = self.__params.get("workers") or max(1, (os.cpu_count() or 1) - 1)
+                workers = max(1, min(int(workers), len(jobs) or 1))
+                if workers == 1:
+                    for job in jobs:
+                        _record(_run_trial(*job))
+                else:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        futures = [executor.submit(_run_trial, *job) for job in jobs]
+                        for future in as_completed(futures):
+                            _record(future.result())
+            return {t: done[(t, rung)]["rmse"] if done[(t, rung)]["rmse"] is not None else float("inf")
+                    for t in trials}
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    # ---------------------------- PUBLIC API ----------------------------
+    def initiate_model_tuner(self) -> ModelTunerArtifact:
+        try:
+            logger.info(f"{'>>'*20} Model Tuner Started:  {'<<'*20}")
+            state = load_object(self.__data_transformation_artifact.transformation_state_file_path)
+            feature_names = state["feature_names"]
+            estimator = self.__params.estimator
+            space = self.__params.search_space[estimator].to_dict()
+            with step("holdout") as holdout_step:
+                train_rows = self._split_holdout()
+                holdout_step.record(rows_out=train_rows)
+            cap = min(train_rows, int(self.__params.max_rows or train_rows))
+            eta = int(self.__params.eta)
+
+            configs = sample_search_space(space, int(self.__params.n_trials), self.__config.random_state)
+            search_id = self._search_id(space, state, train_rows)
+            done = self._load_trial_log(search_id)
+            logger.info(f"Successive halving search {search_id}: {len(configs)} configs, eta={eta}, "
+                        f"rows {self.__params.min_rows}..{cap}, {len(done)} result(s) in trial log")
+
+            trials, rung = list(range(len(configs))), 0
+            while True:
+                rows = min(int(self.__params.min_rows) * eta ** rung, cap)
+                with step(f"rung_{rung}", rows_in=rows) as rung_step:
+                    scores = self._run_rung(rung, rows, trials, configs, feature_names, search_id, done)
+                    rung_step.record(trials=len(trials))
+                trials = sorted(trials, key=lambda t: scores[t])
+                logger.info(f"Rung {rung} best: trial {trials[0]} rmse={scores[trials[0]]:.4f}")
+                if len(trials) == 1 or rows >= cap:
+                    break
+                trials = trials[:max(1, len(trials) // eta)]
+                rung += 1
+
+            best = trials[0]
+            best_rmse = float(scores[best])
+            if not np.isfinite(best_rmse):
+                raise NFLGameCompetitionException(
+                    f"Every trial of the final rung {rung} diverged ({len(trials)} trial(s) on {rows} rows), "
+                    f"no parameters to hand to the trainer", sys)
+            record(rows_in=train_rows, trials=len(configs), rungs=rung + 1)
+            write_yaml({"estimator": estimator, "params": configs[best], "rmse": best_rmse,
+                        "trial": best, "rung": rung, "search_id": search_id}, self.__config.best_params_file_path)
+
+            model_tuner_artifact = ModelTunerArtifact(
+                best_params_file_path=self.__config.best_params_file_path,
+                trial_log_file_path=self.__config.trial_log_file_path,
+                estimator=estimator,
+                best_params=configs[best],
+                best_rmse=best_rmse
+            )
+            logger.info(f"{'>>'*20} Model Tuner Completed..  {'<<'*20}")
+            return model_tuner_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
@@ -6,14 +6,37 @@ Defining common constant variable for training pipeline.
 ARTIFACT_DIR: str = 'artifacts'
 PIPELINE_NAME: str = 'nfl_game_competition'
 
-TRAIN_FILE_NAME: str= "train.csv"
-TEST_FILE_NAME: str = "test.csv"
+TRAIN_FILE_NAME: str= "train_keys.npy"   # (n_plays, 2) [game_id, play_id] into the feature store
+TEST_FILE_NAME: str = "test_keys.npy"
 
 SCHEMA_FILEPATH: str = os.path.join('data_schema', 'schema.yaml')
+PARAMS_FILEPATH: str = 'params.yaml'   # model / tuning hyperparameters
 
 
+STAGE_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "stage_cache")  # content addressed stage outputs, shared by runs
+STAGE_CACHE_ENABLED: bool = True                           # skip stages whose config, code and inputs are unchanged
+STAGE_CACHE_MAX_GB: float = 20.0                           # cache trimmed (least recently used first) to this size
+STAGE_CACHE_MAX_AGE_DAYS: float = 14.0                     # entries unused for longer are evicted
+
+PIPELINE_STATE_DIR_NAME: str = "pipeline_state"              # finished stage artifacts of a run, read on resume
+PIPELINE_MAX_CPUS: int = os.cpu_count() or 1                 # cores shared by stages running at the same time
+PIPELINE_MAX_MEMORY_GB: float = None                         # memory shared by concurrent stages, None = physical memory
+PIPELINE_STAGE_MEMORY_GB: dict = {                           # peak memory estimate per stage, used by the scheduler
+    "data_ingestion": 4.0,
+    "data_validation": 2.0,
+    "data_transformation": 4.0,
+    "model_tuner": 4.0,
+    "model_trainer": 4.0,
+    "model_evaluation": 2.0,
+}
+
+STAGE_METRICS_FILE_NAME: str = "stage_metrics.json"          # per stage timing / memory / rows record, in the stage dir
+PIPELINE_METRICS_FILE_NAME: str = "pipeline_metrics.json"    # stages of a run by wall time, in the run dir
+PIPELINE_PROFILE_STAGES: list = []                           # stages run under a profiler (cache skipped for them)
+PIPELINE_PROFILER: str = "cprofile"                          # "cprofile" (profile.prof) or "sample" (profile.folded)
+
 SAVED_MODEL_DIR: str = os.path.join("models", "saved_models")
-FILE_NAME: str = "merged_data.csv"
+FILE_NAME: str = "merged_data.parquet"   # parquet dataset dir, partitioned by season / week
 """Data Ingestion Step 1: 
 This is step 1: here 'src/nfl_game_competition/constants/training_pipeline_constants/__init__.py'
 Next step 2 will be in 'src/nfl_game_competition/entity/config_entity.py' to create DataIngestionConfig class
@@ -30,4 +53,112 @@ DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_ZIPPED_FILE_DIR: str = "zipped_data"
 DATA_INGESTION_UNZIPPED_DIR_NAME: str = "unzipped_data"
 DATA_INGESTION_SPLITTED_DIR: str = "train_test_split" 
+DATA_INGESTION_PARTITION_COLS: list = ["season", "week"]  # hive partition keys of the feature store
+DATA_INGESTION_SORT_COLS: list = ["game_id", "play_id", "nfl_id", "frame_id"]  # row order inside each partition
+DATA_INGESTION_ROW_GROUP_SIZE: int = 16384                 # small row groups -> game_id/play_id filters prune via stats
+DATA_INGESTION_TEST_SIZE: float = 0.10                    # fraction of plays held out for test
+DATA_INGESTION_RANDOM_STATE: int = 42                     # seed of the play shuffle
+DATA_INGESTION_MANIFEST_FILE_NAME: str = "ingestion_manifest.json"  # hashes of source files and partitions
+DATA_INGESTION_GENERATED_SCHEMA_FILE_NAME: str = "feature_store_schema.yaml"  # dtypes / rows the store was written with
+DATA_INGESTION_REFRESH_DOWNLOAD: bool = False             # ask kaggle for a newer zip even if one exists locally
+DATA_INGESTION_STREAM_FROM_ZIP: bool = False             # read week csvs straight from the zip, skip extraction
+DATA_INGESTION_STORE_LAYOUT: str = "4"                    # bump when partition contents change, forces a re-merge
+DATA_INGESTION_PLAYER_DIM_NAME: str = "players.parquet"   # player dimension dataset, next to the feature store
+# per player attributes moved out of the per frame rows into the player dimension (joined back on read)
+DATA_INGESTION_PLAYER_COLS: list = ["player_name", "player_height", "player_weight", "player_birth_date",
+                                    "player_position"]
+DATA_INGESTION_PLAYER_DERIVED_COLS: list = ["player_height_in", "player_age"]  # parsed from height / birth date
+DATA_INGESTION_INPUT_TRACKING_NAME: str = "input_tracking.parquet"  # input frames of every player, next to the feature store
+# columns of the input tracking dataset: what the neighbour features of a frame need
+DATA_INGESTION_INPUT_TRACKING_COLS: list = ["game_id", "play_id", "nfl_id", "frame_id", "play_direction", "x", "y",
+                                            "s", "dir", "player_side", "player_role"]
+DATA_INGESTION_MERGE_WORKERS: int = max(1, (os.cpu_count() or 1) - 1)  # process pool size for week merges, 1 = serial
+
+
+"""Data Validation related constant start with DATA_VALIDATION var name.
+"""
+DATA_VALIDATION_DIR_NAME: str = "data_validation"
+DATA_VALIDATION_REPORT_FILE_NAME: str = "report.yaml"
+DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "drift_report.yaml"
+DATA_VALIDATION_DISTRIBUTIONS_FILE_NAME: str = "drift_distributions.json"  # drift histograms of the run's data
+# reference distributions: those of the data the promoted model was trained on, copied on promotion
+DATA_VALIDATION_BASELINE_FILEPATH: str = os.path.join(SAVED_MODEL_DIR, 'drift_baseline.json')
+DATA_VALIDATION_KEY_COLS: list = ["game_id", "play_id", "nfl_id", "frame_id"]  # must be unique per row
+# allowed value ranges (None = unbounded side)
+DATA_VALIDATION_VALUE_RANGES: dict = {"x": (0.0, 120.0), "y": (0.0, 53.3),
+                                      "dir": (0.0, 360.0), "o": (0.0, 360.0),
+                                      "s": (0.0, None), "a": (0.0, None)}
+# histogram range per drift column, values outside are clipped into the edge bins
+DATA_VALIDATION_DRIFT_COLUMNS: dict = {"x": (0.0, 120.0), "y": (0.0, 53.3), "s": (0.0, 12.0), "a": (0.0, 15.0),
+                                       "dir": (0.0, 360.0), "o": (0.0, 360.0),
+                                       "ball_land_x": (0.0, 120.0), "ball_land_y": (0.0, 53.3),
+                                       "target_x": (0.0, 120.0), "target_y": (0.0, 53.3)}
+DATA_VALIDATION_DRIFT_BINS: int = 20
+DATA_VALIDATION_DRIFT_THRESHOLD: float = 0.2             # population stability index above this = drift
+DATA_VALIDATION_WORKERS: int = os.cpu_count() or 1      # threads running per-column checks
+
+"""Data Transformation related constant start with DATA_TRANSFORMATION var name.
+"""
+DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
+DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
+DATA_TRANSFORMATION_TRAIN_DIR_NAME: str = "train"
+DATA_TRANSFORMATION_TEST_DIR_NAME: str = "test"
+DATA_TRANSFORMATION_FEATURES_FILE_NAME: str = "features.npy"   # (n_rows, n_features) float32
+DATA_TRANSFORMATION_TARGETS_FILE_NAME: str = "targets.npy"     # (n_rows, 2) float32 normalized target_x/target_y
+DATA_TRANSFORMATION_KEYS_FILE_NAME: str = "keys.npy"           # (n_rows, 4) int32 game_id/play_id/nfl_id/frame_id
+DATA_TRANSFORMATION_STATE_FILE_NAME: str = "transformation_state.pkl"
+DATA_TRANSFORMATION_VERSION: str = "4"                     # bump when feature definitions change
+DATA_TRANSFORMATION_LAGS: list = [1, 2, 3]                 # per player frame lags for diff features
+DATA_TRANSFORMATION_NEIGHBORS_K: int = 3                   # nearest opponents / teammates kept per frame
+DATA_TRANSFORMATION_NEIGHBOR_RADIUS: float = 5.0           # yards, players within it are counted per side
+DATA_TRANSFORMATION_PHYSICS_MODE: str = "ca"               # physics baseline features: "cv" or "ca"
+DATA_TRANSFORMATION_PHYSICS_STEER: float = 0.5             # heading share turned towards ball_land per second
+FIELD_LENGTH: float = 120.0                                # yards incl. end zones
+FIELD_WIDTH: float = 53.3                                  # yards
+
+
+"""Model Trainer related constant start with MODEL_TRAINER var name.
+estimator hyperparameters and epochs live in params.yaml (model_trainer section).
+"""
+MODEL_TRAINER_DIR_NAME: str = "model_trainer"
+MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
+MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
+MODEL_TRAINER_BATCH_SIZE: int = 65536                      # rows per partial_fit call
+MODEL_TRAINER_PREFETCH_BATCHES: int = 2                    # batches decoded ahead on the prefetch thread
+MODEL_TRAINER_RANDOM_STATE: int = 42                       # batch shuffle / estimator seed
+MODEL_TRAINER_CV_DIR_NAME: str = "cross_validation"        # GroupKFold fold models / out-of-fold predictions
+MODEL_TRAINER_FOLD_IDS_FILE_NAME: str = "fold_ids.npy"     # (n_rows,) int8 fold of every train row, shared by workers
+MODEL_TRAINER_FOLD_MODEL_NAME: str = "fold_{fold}.pkl"
+MODEL_TRAINER_OOF_FILE_NAME: str = "oof_predictions.pkl"   # out-of-fold target_x / target_y + fold ids
+
+
+"""Model Tuner related constant start with MODEL_TUNER var name.
+search spaces and the halving budget live in params.yaml (model_tuner section).
+"""
+MODEL_TUNER_DIR_NAME: str = "model_tuner"
+MODEL_TUNER_TRIAL_LOG_FILE_NAME: str = "trial_log.jsonl"   # one json line per finished (trial, rung), kept across runs
+MODEL_TUNER_HOLDOUT_FILE_NAME: str = "holdout_rows.npy"    # validation row indices shared by trial workers
+MODEL_TUNER_BEST_PARAMS_FILE_NAME: str = "best_params.yaml"
+
+
+"""Model Evaluation related constant start with MODEL_EVALUATION var name.
+bootstrap size, confidence and the promotion margin live in params.yaml (model_evaluation section).
+"""
+MODEL_EVALUATION_DIR_NAME: str = "model_evaluation"
+MODEL_EVALUATION_REPORT_FILE_NAME: str = "report.yaml"
+MODEL_EVALUATION_SAVED_MODEL_NAME: str = "model.pkl"                    # promoted model in SAVED_MODEL_DIR
+MODEL_EVALUATION_SAVED_STATE_NAME: str = "transformation_state.pkl"     # its feature definitions
+MODEL_EVALUATION_BOOTSTRAP_CHUNK: int = 256                             # replicates per batched index matrix
+
 
+"""Predict Pipeline related constant start with PREDICT_PIPELINE var name."""
+PREDICT_PIPELINE_LATENCY_WINDOW: int = 10000               # most recent request latencies kept for percentiles
+PREDICT_PIPELINE_PHYSICS_FALLBACK: bool = True             # serve the physics baseline when no model is saved
+PREDICT_PIPELINE_PHYSICS_MODE: str = "ca"                 # physics baseline: "cv" or "ca", a saved model's state wins
+PREDICT_PIPELINE_PHYSICS_STEER: float = 0.5               # heading share turned towards ball_land per second
+PREDICT_PIPELINE_FEATURE_CACHE_PLAYS: int = 4096           # plays kept in the LRU feature cache, 0 = off
+PREDICT_PIPELINE_FEATURE_CACHE_MB: int = 256               # feature cache memory bound
+PREDICT_PIPELINE_MAX_BATCH_SIZE: int = 32                  # app: requests per micro-batch
+PREDICT_PIPELINE_MAX_WAIT_MS: float = 5.0                  # app: flush a micro-batch this long after its first request
+PREDICT_PIPELINE_MAX_QUEUE_DEPTH: int = 256                # app: waiting requests before 503 (backpressure)
+PREDICT_PIPELINE_REQUEST_TIMEOUT_S: float = 2.0            # app: max wait for a batch result
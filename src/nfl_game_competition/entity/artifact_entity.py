@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 """
 DAta Ingestion
@@ -7,6 +8,54 @@ DAta Ingestion
 """
 @dataclass
 class DataIngestionArtifact:
+    feature_store_file_path: str    # parquet dataset dir, partitioned by season / week
+    train_file_path: str            # .npy play keys, read rows with utils.common.load_split_data
+    test_file_path: str             # .npy play keys, read rows with utils.common.load_split_data
+
+@dataclass
+class DataValidationArtifact:
+    validation_status: bool
     feature_store_file_path: str
     train_file_path: str
     test_file_path: str
+    report_file_path: str
+    drift_report_file_path: str
+    distributions_file_path: str        # drift histograms of this data, the baseline once its model is promoted
+
+@dataclass
+class DataTransformationArtifact:
+    transformed_train_dir: str          # features.npy / targets.npy / keys.npy + seq_* sequence store of the train split
+    transformed_test_dir: str           # same blocks for the test split
+    transformation_state_file_path: str # feature names, version and params used by the predict pipeline
+
+@dataclass
+class RegressionMetricArtifact:
+    rmse: float     # competition RMSE over target_x / target_y
+    rows: int
+
+@dataclass
+class ModelTunerArtifact:
+    best_params_file_path: str  # yaml {estimator, params, rmse}
+    trial_log_file_path: str    # jsonl of every evaluated (trial, rung)
+    estimator: str
+    best_params: dict
+    best_rmse: float
+
+@dataclass
+class ModelTrainerArtifact:
+    trained_model_file_path: str
+    train_metric_artifact: RegressionMetricArtifact
+    test_metric_artifact: RegressionMetricArtifact
+    cv_metric_artifact: Optional[RegressionMetricArtifact] = None  # out-of-fold metric, None without cv
+    cross_validation_dir: Optional[str] = None                      # fold models + oof predictions
+
+@dataclass
+class ModelEvaluationArtifact:
+    is_model_accepted: bool
+    candidate_rmse: float
+    candidate_rmse_ci: list                 # [low, high] play bootstrap interval
+    previous_rmse: Optional[float]          # None when there was no comparable saved model
+    rmse_improvement_ci: Optional[list]     # [low, high] of previous - candidate, paired bootstrap
+    trained_model_file_path: str
+    saved_model_file_path: str
+    report_file_path: str
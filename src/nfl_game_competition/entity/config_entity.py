@@ -13,6 +13,19 @@ class TrainingPipelineConfig:
         self.artifact_name = training_pipeline.ARTIFACT_DIR              # set artifact name
         self.artifact_dir = os.path.join(self.artifact_name, self.timestamp)   # set artifact directory
         self.model_dir = os.path.join(self.artifact_dir, "final_model")  # set model directory
+        self.stage_cache_dir: str = training_pipeline.STAGE_CACHE_DIR  # shared stage cache directory
+        self.stage_cache_enabled: bool = training_pipeline.STAGE_CACHE_ENABLED  # memoize unchanged stages
+        self.stage_cache_max_bytes: int = int(training_pipeline.STAGE_CACHE_MAX_GB * (1 << 30))  # size bound
+        self.stage_cache_max_age_days: float = training_pipeline.STAGE_CACHE_MAX_AGE_DAYS  # age bound
+        self.pipeline_state_dir: str = os.path.join(self.artifact_dir, training_pipeline.PIPELINE_STATE_DIR_NAME)  # resume state
+        self.max_cpus: int = training_pipeline.PIPELINE_MAX_CPUS  # cores shared by concurrent stages
+        self.max_memory_gb: float = training_pipeline.PIPELINE_MAX_MEMORY_GB  # memory shared by concurrent stages
+        self.stage_memory_gb: dict = training_pipeline.PIPELINE_STAGE_MEMORY_GB  # peak memory estimate per stage
+        self.stage_metrics_file_name: str = training_pipeline.STAGE_METRICS_FILE_NAME  # per stage metrics record
+        self.pipeline_metrics_file_path: str = os.path.join(self.artifact_dir,
+                                                            training_pipeline.PIPELINE_METRICS_FILE_NAME)  # run summary
+        self.profile_stages: list = list(training_pipeline.PIPELINE_PROFILE_STAGES)  # stages to profile
+        self.profiler: str = training_pipeline.PIPELINE_PROFILER  # cprofile | sample
 
 
 """
@@ -30,7 +43,7 @@ class DataIngestionConfig:
                                                     training_pipeline.DATA_INGESTION_DIR_NAME)  # data ingestion directory
         self.data_source_url: str = training_pipeline.DATA_INGESTION_SOURCE_URL  # data source url  
         self.data_collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME  # data collection
-        # training file path as(artifacts/data_ingestion/ingested/train_test_split/train.csv)
+        # training play keys path as(artifacts/data_ingestion/ingested/train_test_split/train_keys.npy)
         self.training_filepath: str = os.path.join(self.data_ingestion_dir, 
                                                    training_pipeline.DATA_INGESTION_INGESTED_DIR,
                                                    training_pipeline.DATA_INGESTION_SPLITTED_DIR,
@@ -39,6 +52,8 @@ class DataIngestionConfig:
                                                   training_pipeline.DATA_INGESTION_INGESTED_DIR,
                                                   training_pipeline.DATA_INGESTION_SPLITTED_DIR,
                                                   training_pipeline.TEST_FILE_NAME)  # test filepath
+        self.test_size: float = training_pipeline.DATA_INGESTION_TEST_SIZE  # fraction of plays in test split
+        self.random_state: int = training_pipeline.DATA_INGESTION_RANDOM_STATE  # play shuffle seed
         # downloaded data zip file path:  artifacts/downloaded_data/zipped_data
         self.zipped_data_filepath: str = os.path.join(training_pipeline.ARTIFACT_DIR,
                                                       training_pipeline.DATA_INGESTION_DOWNLOADED_DIR,
@@ -47,10 +62,186 @@ class DataIngestionConfig:
         self.unzipped_data_dir: str = os.path.join(training_pipeline.ARTIFACT_DIR,
                                                    training_pipeline.DATA_INGESTION_DOWNLOADED_DIR,
                                                    training_pipeline.DATA_INGESTION_UNZIPPED_DIR_NAME)  # unzipped data directory
-        # feature store file path as(artifacts/downloaded_data/merged_data.csv)
+        # feature store dataset dir as(artifacts/downloaded_data/feature_store/merged_data.parquet/season=YYYY/week=N/...)
         self.feature_store_filepath: str = os.path.join(training_pipeline.ARTIFACT_DIR, 
                                                         training_pipeline.DATA_INGESTION_DOWNLOADED_DIR,
                                                         training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR,
                                                         training_pipeline.FILE_NAME)  # feature store file path
+        self.partition_cols: list = training_pipeline.DATA_INGESTION_PARTITION_COLS  # feature store partition keys
+        self.sort_cols: list = training_pipeline.DATA_INGESTION_SORT_COLS  # row order inside each partition
+        self.row_group_size: int = training_pipeline.DATA_INGESTION_ROW_GROUP_SIZE  # parquet row group size
+        self.merge_workers: int = training_pipeline.DATA_INGESTION_MERGE_WORKERS  # parallel week merge workers
+        self.stream_from_zip: bool = training_pipeline.DATA_INGESTION_STREAM_FROM_ZIP  # merge from zip, no unzipped copy
+        self.store_layout: str = training_pipeline.DATA_INGESTION_STORE_LAYOUT  # partition layout version
+        self.input_tracking_cols: list = training_pipeline.DATA_INGESTION_INPUT_TRACKING_COLS  # input tracking columns
+        # ingestion manifest path as(artifacts/downloaded_data/ingestion_manifest.json)
+        self.manifest_filepath: str = os.path.join(training_pipeline.ARTIFACT_DIR,
+                                                   training_pipeline.DATA_INGESTION_DOWNLOADED_DIR,
+                                                   training_pipeline.DATA_INGESTION_MANIFEST_FILE_NAME)  # manifest file path
+        # schema generated from the merged weeks as(artifacts/downloaded_data/feature_store_schema.yaml);
+        # data_schema/schema.yaml is the checked-in contract and is only read
+        self.generated_schema_file_path: str = os.path.join(training_pipeline.ARTIFACT_DIR,
+                                                            training_pipeline.DATA_INGESTION_DOWNLOADED_DIR,
+                                                            training_pipeline.DATA_INGESTION_GENERATED_SCHEMA_FILE_NAME)  # generated schema
+        self.refresh_download: bool = training_pipeline.DATA_INGESTION_REFRESH_DOWNLOAD  # re-check kaggle for newer data
         self.schema_file_path: str = training_pipeline.SCHEMA_FILEPATH # schema file path
         
+
+"""
+Data Validation :
+checks the feature store against data_schema/schema.yaml, value ranges, key uniqueness,
+frame continuity and drift against the stored baseline.
+"""
+@dataclass
+class DataValidationConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig):
+        self.data_validation_dir: str = os.path.join(training_pipeline_config.artifact_dir,
+                                                     training_pipeline.DATA_VALIDATION_DIR_NAME)  # data validation directory
+        # validation report as(artifacts/<timestamp>/data_validation/report.yaml)
+        self.report_file_path: str = os.path.join(self.data_validation_dir,
+                                                  training_pipeline.DATA_VALIDATION_REPORT_FILE_NAME)  # report file path
+        self.drift_report_file_path: str = os.path.join(self.data_validation_dir,
+                                                        training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME)  # drift report
+        self.distributions_file_path: str = os.path.join(self.data_validation_dir,
+                                                         training_pipeline.DATA_VALIDATION_DISTRIBUTIONS_FILE_NAME)  # run histograms
+        self.baseline_file_path: str = training_pipeline.DATA_VALIDATION_BASELINE_FILEPATH  # drift baseline
+        self.schema_file_path: str = training_pipeline.SCHEMA_FILEPATH  # schema file path
+        self.key_cols: list = training_pipeline.DATA_VALIDATION_KEY_COLS  # unique row key
+        self.value_ranges: dict = training_pipeline.DATA_VALIDATION_VALUE_RANGES  # allowed value ranges
+        self.drift_columns: dict = training_pipeline.DATA_VALIDATION_DRIFT_COLUMNS  # drift histogram ranges
+        self.drift_bins: int = training_pipeline.DATA_VALIDATION_DRIFT_BINS  # drift histogram bins
+        self.drift_threshold: float = training_pipeline.DATA_VALIDATION_DRIFT_THRESHOLD  # psi threshold
+        self.workers: int = training_pipeline.DATA_VALIDATION_WORKERS  # column check threads
+
+"""
+Data Transformation :
+turns the validated train/test splits into float32 feature blocks for model_trainer.
+"""
+@dataclass
+class DataTransformationConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig):
+        self.data_transformation_dir: str = os.path.join(training_pipeline_config.artifact_dir,
+                                                         training_pipeline.DATA_TRANSFORMATION_DIR_NAME)  # transformation dir
+        # transformed split dirs as(artifacts/<timestamp>/data_transformation/transformed/train/features.npy)
+        self.transformed_train_dir: str = os.path.join(self.data_transformation_dir,
+                                                       training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                       training_pipeline.DATA_TRANSFORMATION_TRAIN_DIR_NAME)  # train block dir
+        self.transformed_test_dir: str = os.path.join(self.data_transformation_dir,
+                                                      training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                      training_pipeline.DATA_TRANSFORMATION_TEST_DIR_NAME)  # test block dir
+        self.transformation_state_file_path: str = os.path.join(self.data_transformation_dir,
+                                                                training_pipeline.DATA_TRANSFORMATION_STATE_FILE_NAME)  # state
+        self.features_file_name: str = training_pipeline.DATA_TRANSFORMATION_FEATURES_FILE_NAME  # feature block name
+        self.targets_file_name: str = training_pipeline.DATA_TRANSFORMATION_TARGETS_FILE_NAME  # target block name
+        self.keys_file_name: str = training_pipeline.DATA_TRANSFORMATION_KEYS_FILE_NAME  # row key block name
+        self.version: str = training_pipeline.DATA_TRANSFORMATION_VERSION  # feature definition version
+        self.lags: list = training_pipeline.DATA_TRANSFORMATION_LAGS  # per player lag diffs
+        self.neighbors_k: int = training_pipeline.DATA_TRANSFORMATION_NEIGHBORS_K  # k nearest per side
+        self.neighbor_radius: float = training_pipeline.DATA_TRANSFORMATION_NEIGHBOR_RADIUS  # count radius (yards)
+        self.physics_mode: str = training_pipeline.DATA_TRANSFORMATION_PHYSICS_MODE  # physics baseline mode
+        self.physics_steer: float = training_pipeline.DATA_TRANSFORMATION_PHYSICS_STEER  # steering towards ball
+        self.schema_file_path: str = training_pipeline.SCHEMA_FILEPATH  # schema file path
+
+
+"""
+Model Trainer :
+streams the transformed blocks into an incremental (partial_fit) regressor.
+"""
+@dataclass
+class ModelTrainerConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig):
+        self.model_trainer_dir: str = os.path.join(training_pipeline_config.artifact_dir,
+                                                   training_pipeline.MODEL_TRAINER_DIR_NAME)  # model trainer dir
+        # trained model path as(artifacts/<timestamp>/model_trainer/trained_model/model.pkl)
+        self.trained_model_file_path: str = os.path.join(self.model_trainer_dir,
+                                                         training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR,
+                                                         training_pipeline.MODEL_TRAINER_TRAINED_MODEL_NAME)  # model path
+        self.batch_size: int = training_pipeline.MODEL_TRAINER_BATCH_SIZE  # rows per partial_fit
+        self.prefetch_batches: int = training_pipeline.MODEL_TRAINER_PREFETCH_BATCHES  # batches decoded ahead
+        self.random_state: int = training_pipeline.MODEL_TRAINER_RANDOM_STATE  # shuffle / estimator seed
+        self.features_file_name: str = training_pipeline.DATA_TRANSFORMATION_FEATURES_FILE_NAME  # feature block name
+        self.targets_file_name: str = training_pipeline.DATA_TRANSFORMATION_TARGETS_FILE_NAME  # target block name
+        self.keys_file_name: str = training_pipeline.DATA_TRANSFORMATION_KEYS_FILE_NAME  # row key block name
+        self.params_file_path: str = training_pipeline.PARAMS_FILEPATH  # hyperparameters yaml
+        self.cross_validation_dir: str = os.path.join(self.model_trainer_dir,
+                                                      training_pipeline.MODEL_TRAINER_CV_DIR_NAME)  # cv dir
+        self.fold_ids_file_path: str = os.path.join(self.cross_validation_dir,
+                                                    training_pipeline.MODEL_TRAINER_FOLD_IDS_FILE_NAME)  # row folds
+        self.fold_model_file_path: str = os.path.join(self.cross_validation_dir,
+                                                      training_pipeline.MODEL_TRAINER_FOLD_MODEL_NAME)  # .format(fold=k)
+        self.oof_file_path: str = os.path.join(self.cross_validation_dir,
+                                               training_pipeline.MODEL_TRAINER_OOF_FILE_NAME)  # out-of-fold predictions
+
+
+"""
+Model Tuner :
+successive halving over the params.yaml search space, before model trainer.
+"""
+@dataclass
+class ModelTunerConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig):
+        self.model_tuner_dir: str = os.path.join(training_pipeline_config.artifact_dir,
+                                                 training_pipeline.MODEL_TUNER_DIR_NAME)  # model tuner dir
+        # trial log outside the timestamped run dir as(artifacts/model_tuner/trial_log.jsonl) so searches resume
+        self.trial_log_file_path: str = os.path.join(training_pipeline.ARTIFACT_DIR,
+                                                     training_pipeline.MODEL_TUNER_DIR_NAME,
+                                                     training_pipeline.MODEL_TUNER_TRIAL_LOG_FILE_NAME)  # trial log
+        self.holdout_file_path: str = os.path.join(self.model_tuner_dir,
+                                                   training_pipeline.MODEL_TUNER_HOLDOUT_FILE_NAME)  # holdout rows
+        self.best_params_file_path: str = os.path.join(self.model_tuner_dir,
+                                                       training_pipeline.MODEL_TUNER_BEST_PARAMS_FILE_NAME)  # best params
+        self.batch_size: int = training_pipeline.MODEL_TRAINER_BATCH_SIZE  # rows per partial_fit
+        self.random_state: int = training_pipeline.MODEL_TRAINER_RANDOM_STATE  # sampling / shuffle seed
+        self.features_file_name: str = training_pipeline.DATA_TRANSFORMATION_FEATURES_FILE_NAME  # feature block name
+        self.targets_file_name: str = training_pipeline.DATA_TRANSFORMATION_TARGETS_FILE_NAME  # target block name
+        self.keys_file_name: str = training_pipeline.DATA_TRANSFORMATION_KEYS_FILE_NAME  # row key block name
+        self.params_file_path: str = training_pipeline.PARAMS_FILEPATH  # search space yaml
+
+
+"""
+Model Evaluation :
+scores the candidate on the test blocks and promotes it over the saved model when it is better.
+"""
+@dataclass
+class ModelEvaluationConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig):
+        self.model_evaluation_dir: str = os.path.join(training_pipeline_config.artifact_dir,
+                                                      training_pipeline.MODEL_EVALUATION_DIR_NAME)  # evaluation dir
+        self.report_file_path: str = os.path.join(self.model_evaluation_dir,
+                                                  training_pipeline.MODEL_EVALUATION_REPORT_FILE_NAME)  # report yaml
+        # promoted model as(models/saved_models/model.pkl), shared by every run and the predict pipeline
+        self.saved_model_file_path: str = os.path.join(training_pipeline.SAVED_MODEL_DIR,
+                                                       training_pipeline.MODEL_EVALUATION_SAVED_MODEL_NAME)  # saved model
+        self.saved_state_file_path: str = os.path.join(training_pipeline.SAVED_MODEL_DIR,
+                                                       training_pipeline.MODEL_EVALUATION_SAVED_STATE_NAME)  # its state
+        self.saved_baseline_file_path: str = training_pipeline.DATA_VALIDATION_BASELINE_FILEPATH  # its drift baseline
+        self.bootstrap_chunk: int = training_pipeline.MODEL_EVALUATION_BOOTSTRAP_CHUNK  # replicates per batch
+        self.batch_size: int = training_pipeline.MODEL_TRAINER_BATCH_SIZE  # prediction batch rows
+        self.features_file_name: str = training_pipeline.DATA_TRANSFORMATION_FEATURES_FILE_NAME  # feature block name
+        self.targets_file_name: str = training_pipeline.DATA_TRANSFORMATION_TARGETS_FILE_NAME  # target block name
+        self.keys_file_name: str = training_pipeline.DATA_TRANSFORMATION_KEYS_FILE_NAME  # row key block name
+        self.params_file_path: str = training_pipeline.PARAMS_FILEPATH  # bootstrap params yaml
+        self.schema_file_path: str = training_pipeline.SCHEMA_FILEPATH  # schema file path
+
+
+"""
+Predict Pipeline :
+serves the promoted model of models/saved_models; not tied to a training run timestamp.
+"""
+@dataclass
+class PredictPipelineConfig:
+    def __init__(self):
+        self.model_file_path: str = os.path.join(training_pipeline.SAVED_MODEL_DIR,
+                                                 training_pipeline.MODEL_EVALUATION_SAVED_MODEL_NAME)  # promoted model
+        self.state_file_path: str = os.path.join(training_pipeline.SAVED_MODEL_DIR,
+                                                 training_pipeline.MODEL_EVALUATION_SAVED_STATE_NAME)  # its state
+        self.latency_window: int = training_pipeline.PREDICT_PIPELINE_LATENCY_WINDOW  # latencies kept
+        self.physics_fallback: bool = training_pipeline.PREDICT_PIPELINE_PHYSICS_FALLBACK  # baseline without model
+        self.physics_mode: str = training_pipeline.PREDICT_PIPELINE_PHYSICS_MODE  # baseline mode
+        self.physics_steer: float = training_pipeline.PREDICT_PIPELINE_PHYSICS_STEER  # baseline ball steering
+        self.feature_cache_plays: int = training_pipeline.PREDICT_PIPELINE_FEATURE_CACHE_PLAYS  # cached plays
+        self.feature_cache_mb: int = training_pipeline.PREDICT_PIPELINE_FEATURE_CACHE_MB  # cache memory bound
+        self.max_batch_size: int = training_pipeline.PREDICT_PIPELINE_MAX_BATCH_SIZE  # micro-batch size limit
+        self.max_wait_ms: float = training_pipeline.PREDICT_PIPELINE_MAX_WAIT_MS  # micro-batch deadline
+        self.max_queue_depth: int = training_pipeline.PREDICT_PIPELINE_MAX_QUEUE_DEPTH  # backpressure limit
+        self.request_timeout_s: float = training_pipeline.PREDICT_PIPELINE_REQUEST_TIMEOUT_S  # result wait limit
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import pandas as pd
+
+"""
+Predict entities :
+request / response objects of pipeline/predict_pipeline.py (and the flask app on top of it).
+"""
+@dataclass
+class PredictionRequest:
+    tracking: pd.DataFrame              # input tracking rows of one or more plays (test_input.csv columns)
+    request_id: Optional[str] = None    # echoed back in the response
+    enqueued_at: Optional[float] = None # time.perf_counter() when MicroBatcher.submit queued it
+
+@dataclass
+class PredictionResponse:
+    predictions: pd.DataFrame           # game_id, play_id, nfl_id, frame_id, x, y (frame_id = frames after the throw)
+    request_id: Optional[str]
+    model_version: str                  # transformation version the model was trained on, "physics" for the fallback
+    latency_ms: float                   # from enqueued_at (else from the predict call) until the response was ready
+    batch_size: int = 1                 # requests predicted together
+
+@dataclass
+class LatencyReport:
+    count: int
+    percentiles_ms: Dict[str, float] = field(default_factory=dict)   # {"p50": .., "p90": .., "p99": ..}
+    mean_ms: float = 0.0
@@ -4,6 +4,8 @@ import sys
 # error messages fuction
 def error_message_detail(error, error_detail: sys):
     _, _, exc_tb = error_detail.exc_info()
+    if exc_tb is None:  # raised directly, not while handling another exception
+        return str(error)
     file_name = exc_tb.tb_frame.f_code.co_filename
     line_number = exc_tb.tb_lineno
     error_message = f"Error occurred in script: {file_name} at line number: {line_number} with message: {str(error)}"
@@ -5,19 +5,26 @@ from datetime import datetime
 LOG_FILE = f"{datetime.now().strftime('%d_%m_%Y_%H_%M_%S')}.log"
 
 log_path = os.path.join("artifacts", "logs", LOG_FILE)
-os.makedirs(os.path.dirname(log_path), exist_ok=True)
-
-
-os.makedirs(log_path, exist_ok=True)
 
 LOG_FILE_PATH = os.path.join(log_path, LOG_FILE)
 
 format = "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
 
+
+class LazyFileHandler(logging.FileHandler):
+    """file handler that creates the log dir and opens the file on the first record, not on import"""
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 logging.basicConfig(
     level=logging.INFO,
     format= format,
-    filename = LOG_FILE_PATH
+    handlers=[LazyFileHandler(LOG_FILE_PATH)]
 )
 
 def get_logger(name: str) -> logging.Logger:
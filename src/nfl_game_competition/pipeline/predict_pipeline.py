@@ -0,0 +1,404 @@
+"""Predict pipeline
+
+PredictPipeline: serves the promoted model.
+- model + transformation state are loaded once per process and kept warm in a module level cache,
+  keyed by file mtime so a newly promoted model is picked up without a restart
+- a batch of requests (any number of plays) is concatenated and goes through feature
+  computation and model.predict once; responses are split back per request. A play requested
+  twice in one batch goes to a second round, its rows are never concatenated with themselves
+- every request latency is recorded, from the micro-batcher enqueue to its response (queue wait
+  included); percentiles come from a fixed size ring buffer
+- computed feature rows are kept per play in an LRU cache (utils.feature_cache), later requests
+  for players of the same play only run inference
+
+PhysicsBaselinePredictor: takes the last input frame of every player to predict and extrapolates
+its num_frames_output future (x, y) in one batched computation (utils.physics), no per-player loop.
+Used as fallback predictor under latency pressure; the same kernel feeds the phys_x / phys_y
+features the trainer uses as residual anchor.
+"""
+import os
+import sys
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.entity.config_entity import PredictPipelineConfig
+from src.nfl_game_competition.entity.predict_entity import LatencyReport, PredictionRequest, PredictionResponse
+from src.nfl_game_competition.components.data_transformation import (INPUT_COLS, compute_features,
+                                                                     compute_last_frame_states,
+                                                                     compute_physics_features,
+                                                                     normalize_play_direction, sort_tracking)
+from src.nfl_game_competition.utils.common import load_object
+from src.nfl_game_competition.utils.feature_cache import PlayFeatureCache
+from src.nfl_game_competition.utils.tracking_index import TrackingIndex, pack_keys, unpack_keys
+from src.nfl_game_competition.utils.physics import FRAME_DT, MAX_SPEED, MODES, extrapolate
+
+logger = get_logger(name="nfl_game_competition.pipeline.predict_pipeline")
+
+PLAYER_KEY_COLS = ["game_id", "play_id", "nfl_id"]
+
+
+NUMERIC_INPUT_COLS = ["game_id", "play_id", "nfl_id", "frame_id", "x", "y", "s", "a", "dir", "o",
+                      "ball_land_x", "ball_land_y", "num_frames_output"]
+
+
+def validate_tracking(tracking: pd.DataFrame) -> Optional[str]:
+    """why the tracking rows of a request cannot be predicted, None when they can"""
+    missing = [c for c in INPUT_COLS if c not in tracking.columns]
+    if missing:
+        return f"missing columns: {missing}"
+    not_numeric = [c for c in NUMERIC_INPUT_COLS
+                   if not pd.api.types.is_numeric_dtype(tracking[c]) or pd.api.types.is_bool_dtype(tracking[c])]
+    if not_numeric:
+        return f"columns must be numeric: {not_numeric}"
+    null_keys = [c for c in [*PLAYER_KEY_COLS, "frame_id", "num_frames_output"] if tracking[c].isna().any()]
+    if null_keys:
+        return f"columns must not be null: {null_keys}"
+    return None
+
+
+class PhysicsBaselinePredictor:
+    def __init__(self, mode: str = "cv", steer: float = 0.0, clip: bool = True, max_speed: float = MAX_SPEED):
+        """
+        Args:
+            mode (str): "cv" constant velocity or "ca" constant (signed) acceleration
+            steer (float): heading share turned towards ball_land_x / ball_land_y per second, 0 = off
+            clip (bool): clip positions to the field
+        """
+        if mode not in MODES:
+            raise ValueError(f"unknown physics mode: {mode}, expected one of {list(MODES)}")
+        self.mode, self.steer, self.clip, self.max_speed = mode, float(steer), bool(clip), float(max_speed)
+
+    @staticmethod
+    def last_frames(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        last input row of every player to predict and its signed speed change per second
+        (from the previous frame of the same player, 0 when there is none).
+        """
+        keys = [df[c].to_numpy() for c in [*PLAYER_KEY_COLS, "frame_id"]]
+        order = np.lexsort(keys[::-1])
+        g, p, n = (k[order] for k in keys[:3])
+        is_last = np.ones(len(order), dtype=bool)
+        is_last[:-1] = (g[1:] != g[:-1]) | (p[1:] != p[:-1]) | (n[1:] != n[:-1])
+        has_prev = np.zeros(len(order), dtype=bool)
+        has_prev[1:] = ~is_last[:-1]
+
+        speed = df["s"].to_numpy(dtype=np.float32)[order]
+        accel = np.zeros(len(order), dtype=np.float32)
+        accel[1:] = np.where(has_prev[1:], (speed[1:] - speed[:-1]) / FRAME_DT, 0.0)
+
+        last_rows = order[is_last]
+        accel = accel[is_last]
+        if "player_to_predict" in df.columns:
+            predict = df["player_to_predict"].astype(str).str.lower().to_numpy()[last_rows] == "true"
+            last_rows, accel = last_rows[predict], accel[predict]
+        return df.iloc[last_rows].reset_index(drop=True), accel
+
+    def predict_trajectories(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        dense trajectories of input tracking rows (raw coordinates)
+        Returns:
+            tuple: (last frame rows, positions (players, H, 2) float32, mask (players, H)) with
+                   H = largest num_frames_output; mask is False past each player's num_frames_output
+        """
+        try:
+            last, accel = self.last_frames(df)
+            col = lambda c: last[c].to_numpy(dtype=np.float32)
+            frames = last["num_frames_output"].to_numpy(dtype=np.int64)
+            horizon = int(frames.max(initial=0))
+            t = (np.arange(1, horizon + 1, dtype=np.float32) * FRAME_DT)[None, :]
+            dir_rad = np.deg2rad(col("dir"))
+            s = col("s")
+            px, py = extrapolate(col("x")[:, None], col("y")[:, None],
+                                 (s * np.sin(dir_rad))[:, None], (s * np.cos(dir_rad))[:, None], t,
+                                 accel=accel[:, None], ball_x=col("ball_land_x")[:, None],
+                                 ball_y=col("ball_land_y")[:, None], mode=self.mode, steer=self.steer,
+                                 clip=self.clip, max_speed=self.max_speed)
+            mask = np.arange(horizon)[None, :] < frames[:, None]
+            return last, np.stack([px, py], axis=-1), mask
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        long format predictions: one row per (game_id, play_id, nfl_id, frame_id) with x, y,
+        frame_id = 1..num_frames_output as in the competition output files
+        """
+        try:
+            last, positions, mask = self.predict_trajectories(df)
+            player_idx, step = np.nonzero(mask)
+            out = {c: last[c].to_numpy()[player_idx] for c in PLAYER_KEY_COLS}
+            out["frame_id"] = (step + 1).astype(np.int16)
+            out["x"], out["y"] = positions[player_idx, step, 0], positions[player_idx, step, 1]
+            return pd.DataFrame(out)
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+
+# ---------------------------- WARM MODEL CACHE ----------------------------
+_BUNDLE_CACHE: Dict[Tuple[str, str], Tuple[Tuple[float, float], Any, dict]] = {}
+_BUNDLE_LOCK = threading.Lock()
+
+
+def load_model_bundle(model_file_path: str, state_file_path: str) -> Tuple[Any, dict]:
+    """
+    (model, transformation state), read from disk once per process. Later calls cost two
+    os.stat; the files are only reloaded when their mtime changed (a new promotion).
+    """
+    key = (os.path.abspath(model_file_path), os.path.abspath(state_file_path))
+    mtimes = (os.stat(model_file_path).st_mtime, os.stat(state_file_path).st_mtime)
+    cached = _BUNDLE_CACHE.get(key)
+    if cached is not None and cached[0] == mtimes:
+        return cached[1], cached[2]
+    with _BUNDLE_LOCK:
+        cached = _BUNDLE_CACHE.get(key)
+        if cached is None or cached[0] != mtimes:
+            logger.info(f"Loading model bundle: {model_file_path}")
+            cached = (mtimes, load_object(model_file_path), load_object(state_file_path))
+            _BUNDLE_CACHE[key] = cached
+    return cached[1], cached[2]
+
+
+class LatencyTracker:
+    """ring buffer of the most recent latencies (ms), thread safe"""
+    def __init__(self, window: int = 10000):
+        self.__values = np.zeros(window, dtype=np.float64)
+        self.__count = 0
+        self.__lock = threading.Lock()
+
+    def record(self, latency_ms: float) -> None:
+        with self.__lock:
+            self.__values[self.__count % len(self.__values)] = latency_ms
+            self.__count += 1
+
+    def report(self, percentiles: Tuple[float, ...] = (50, 90, 99)) -> LatencyReport:
+        with self.__lock:
+            values = self.__values[:min(self.__count, len(self.__values))].copy()
+        if values.size == 0:
+            return LatencyReport(count=0)
+        return LatencyReport(count=int(values.size),
+                             percentiles_ms={f"p{p:g}": float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))},
+                             mean_ms=float(values.mean()))
+
+
+class PredictPipeline:
+    def __init__(self, config: Optional[PredictPipelineConfig] = None):
+        try:
+            self.__config = config or PredictPipelineConfig()
+            self.latency = LatencyTracker(self.__config.latency_window)
+            self.feature_cache = PlayFeatureCache(self.__config.feature_cache_plays,
+                                                  self.__config.feature_cache_mb << 20)
+            self.__has_model = os.path.exists(self.__config.model_file_path) and os.path.exists(self.__config.state_file_path)
+            physics_mode, physics_steer = self.__config.physics_mode, self.__config.physics_steer
+            if self.__has_model:
+                _, state = self._bundle()  # warm up: load once at start, not on the first request
+                physics_mode = state.get("physics_mode", physics_mode)
+                physics_steer = state.get("physics_steer", physics_steer)
+            elif not self.__config.physics_fallback:
+                raise FileNotFoundError(f"no saved model at {self.__config.model_file_path}")
+            else:
+                logger.warning(f"No saved model at {self.__config.model_file_path}, serving the physics baseline")
+            self.__physics = PhysicsBaselinePredictor(mode=physics_mode, steer=physics_steer)
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def _bundle(self) -> Tuple[Any, dict]:
+        return load_model_bundle(self.__config.model_file_path, self.__config.state_file_path)
+
+    @property
+    def model_version(self) -> str:
+        return str(self._bundle()[1]["version"]) if self.__has_model else "physics"
+
+    # ---------------------------- PRIVATE INTERNAL STEPS ----------------------------
+    @staticmethod
+    def _prediction_rows(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        feature row of every (player to predict, output frame k) pair of sorted tracking rows.
+        As in training (input and output rows joined on frame_id), output frame k is predicted from
+        the player's input frame k; past the input history it is predicted from the last input frame
+        with an explicit horizon of k frames (see _prediction_features).
+        Returns:
+            tuple: (feature row index, player block start row, output frame_id) per prediction
+        """
+        g, p, n = (df[c].to_numpy() for c in ("game_id", "play_id", "nfl_id"))
+        new_block = np.ones(len(df), dtype=bool)
+        new_block[1:] = (g[1:] != g[:-1]) | (p[1:] != p[:-1]) | (n[1:] != n[:-1])
+        starts = np.flatnonzero(new_block)
+        lengths = np.diff(np.append(starts, len(df)))
+        if "player_to_predict" in df.columns:
+            keep = df["player_to_predict"].astype(str).str.lower().to_numpy()[starts] == "true"
+            starts, lengths = starts[keep], lengths[keep]
+        frames = df["num_frames_output"].to_numpy(dtype=np.int64)[starts]
+        block = np.repeat(np.arange(len(starts)), frames)
+        k = np.arange(len(block)) - np.repeat(np.cumsum(frames) - frames, frames) + 1
+        last = starts + lengths - 1
+        rows = np.where(k <= lengths[block], starts[block] + k - 1, last[block])
+        return rows, starts[block], k
+
+    @staticmethod
+    def _prediction_features(df: pd.DataFrame, features: np.ndarray, state: dict
+                             ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        model input of every prediction (see _prediction_rows). frame_id and phys_x / phys_y are set
+        from the output frame k: the physics baseline extrapolates the player's last input frame
+        k frames ahead, as compute_physics_features does for the training row of output frame k.
+        Returns:
+            tuple: (model input rows, player block start row, output frame_id) per prediction
+        """
+        rows, block_start, k = PredictPipeline._prediction_rows(df)
+        names = state["feature_names"]
+        inputs = features[rows]
+        states, block_id = compute_last_frame_states(df)
+        physics, physics_names = compute_physics_features(states[block_id[block_start]], k,
+                                                          inputs[:, names.index("ball_land_x")],
+                                                          inputs[:, names.index("ball_land_y")],
+                                                          state.get("physics_mode", "ca"),
+                                                          state.get("physics_steer", 0.5))
+        inputs[:, names.index("frame_id")] = k
+        inputs[:, [names.index(c) for c in physics_names]] = physics
+        return inputs, block_start, k
+
+    def _features(self, df: pd.DataFrame, state: dict) -> np.ndarray:
+        """
+        feature rows of sorted tracking rows. Plays found in the feature cache are reused, the
+        missing ones go through compute_features together in one call and are cached per play.
+        A play's cache key holds a fingerprint of its input rows, so changed input is recomputed.
+        """
+        self.feature_cache.bind((state["version"], tuple(state["feature_names"])))
+        g, p = df["game_id"].to_numpy(), df["play_id"].to_numpy()
+        new_play = np.ones(len(df), dtype=bool)
+        new_play[1:] = (g[1:] != g[:-1]) | (p[1:] != p[:-1])
+        starts = np.flatnonzero(new_play)
+        ends = np.append(starts[1:], len(df))
+        fingerprints = (np.add.reduceat(pd.util.hash_pandas_object(df, index=False).to_numpy(), starts)
+                        if len(df) else np.zeros(0, dtype=np.uint64))
+        keys = [(int(g[a]), int(p[a]), int(b - a), int(f)) for a, b, f in zip(starts, ends, fingerprints)]
+        blocks = [self.feature_cache.get(key) for key in keys]
+
+        missing = [i for i, block in enumerate(blocks) if block is None]
+        if missing:
+            rows = np.concatenate([np.arange(starts[i], ends[i]) for i in missing])
+            features, names = compute_features(df.iloc[rows].reset_index(drop=True), state["lags"],
+                                               state.get("neighbors_k", 3), state.get("neighbor_radius", 5.0),
+                                               state.get("physics_mode", "ca"), state.get("physics_steer", 0.5))
+            if names != state["feature_names"]:
+                raise ValueError(f"feature names differ from the saved transformation state (version {state['version']})")
+            offset = 0
+            for i in missing:
+                blocks[i] = features[offset:offset + ends[i] - starts[i]]
+                offset += ends[i] - starts[i]
+                self.feature_cache.put(keys[i], blocks[i])
+        if not blocks:
+            return np.zeros((0, len(state["feature_names"])), dtype=np.float32)
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+    def _predict_frame(self, tracking: pd.DataFrame) -> pd.DataFrame:
+        """one vectorized transform + inference pass over all plays of a batch"""
+        model, state = self._bundle()
+        columns = [c for c in dict.fromkeys([*INPUT_COLS, "player_to_predict"]) if c in tracking.columns]
+        df = sort_tracking(tracking[columns])
+        features = self._features(df, state)
+        inputs, block_start, k = self._prediction_features(df, features, state)
+        prediction = model.predict(inputs)
+        left = (df["play_direction"] == "left").to_numpy()[block_start]
+        x, y = normalize_play_direction(prediction[:, 0], prediction[:, 1], left)  # back to raw coordinates
+        out = {c: df[c].to_numpy()[block_start] for c in PLAYER_KEY_COLS}
+        out["frame_id"] = k.astype(np.int16)
+        out["x"], out["y"] = x.astype(np.float32), y.astype(np.float32)
+        return pd.DataFrame(out)
+
+    # ---------------------------- PUBLIC API ----------------------------
+    def predict_batch(self, tracking: pd.DataFrame, n_requests: int = 1) -> pd.DataFrame:
+        """
+        predictions of every player to predict in the tracking rows (any number of distinct plays).
+        The latency is recorded n_requests times (0 when the caller records it) and kept in
+        predictions.attrs["latency_ms"].
+        """
+        try:
+            start = time.perf_counter()
+            predictions = self._predict_frame(tracking) if self.__has_model else self.__physics.predict(tracking)
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            for _ in range(n_requests):
+                self.latency.record(latency_ms)
+            predictions.attrs["latency_ms"] = latency_ms
+            return predictions
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    @staticmethod
+    def _batch_rounds(requests: List[PredictionRequest]) -> Tuple[List[List[int]], List[int]]:
+        """
+        group requests so that no play appears twice in one concatenated frame: duplicate rows of a
+        play would interleave into one player block (zero distance neighbours, zero lag diffs).
+        Requests with identical tracking share one payload and are predicted once.
+        Returns:
+            tuple: (payload indices per round, payload index of every request)
+        """
+        payload_of_request, payload_index, payload_plays = [], {}, []
+        for request in requests:
+            tracking = request.tracking
+            plays = np.unique(pack_keys(tracking["game_id"].to_numpy(), tracking["play_id"].to_numpy()))
+            key = (plays.tobytes(), len(tracking), tuple(tracking.columns),
+                   int(pd.util.hash_pandas_object(tracking, index=False).to_numpy().sum()))
+            if key not in payload_index:
+                payload_index[key] = len(payload_plays)
+                payload_plays.append(set(plays.tolist()))
+            payload_of_request.append(payload_index[key])
+
+        rounds: List[List[int]] = []
+        round_plays: List[set] = []
+        for payload, plays in enumerate(payload_plays):
+            target = next((i for i, taken in enumerate(round_plays) if not taken & plays), None)
+            if target is None:
+                rounds.append([])
+                round_plays.append(set())
+                target = len(rounds) - 1
+            rounds[target].append(payload)
+            round_plays[target] |= plays
+        return rounds, payload_of_request
+
+    def predict(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        """
+        several requests in one batch: tracking rows of distinct plays are concatenated, predicted
+        once through predict_batch and split back by (game_id, play_id). Requests for a play already
+        in the batch go to a further round; identical requests are predicted once.
+        The latency of a request runs from its enqueued_at, so the micro-batcher queue wait is included.
+        """
+        try:
+            start = time.perf_counter()
+            rounds, payload_of_request = self._batch_rounds(requests)
+            first_request = {}
+            for request_idx, payload in enumerate(payload_of_request):
+                first_request.setdefault(payload, request_idx)
+
+            results = {}
+            for payloads in rounds:
+                tracking = pd.concat([requests[first_request[payload]].tracking for payload in payloads],
+                                     ignore_index=True)
+                predictions = self.predict_batch(tracking, n_requests=0)
+                # index the prediction rows once, then each payload takes the rows of its plays
+                index = TrackingIndex.from_frame(predictions)
+                for payload in payloads:
+                    payload_tracking = requests[first_request[payload]].tracking
+                    game_id, play_id, _, _ = unpack_keys(np.unique(pack_keys(payload_tracking["game_id"].to_numpy(),
+                                                                             payload_tracking["play_id"].to_numpy())))
+                    idx = index.rows(game_id, play_id)
+                    results[payload] = predictions.iloc[idx].reset_index(drop=True)
+
+            done = time.perf_counter()
+            responses = []
+            for request, payload in zip(requests, payload_of_request):
+                frame = results[payload]
+                latency_ms = (done - (start if request.enqueued_at is None else request.enqueued_at)) * 1000.0
+                self.latency.record(latency_ms)
+                responses.append(PredictionResponse(predictions=frame.copy(), request_id=request.request_id,
+                                                    model_version=self.model_version, latency_ms=latency_ms,
+                                                    batch_size=len(requests)))
+            return responses
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
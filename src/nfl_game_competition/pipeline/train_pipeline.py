@@ -2,16 +2,81 @@ import os, sys
 from src.nfl_game_competition.logger import get_logger
 from src.nfl_game_competition.exception import NFLGameCompetitionException
 
-from src.nfl_game_competition.entity.config_entity import (TrainingPipelineConfig, DataIngestionConfig)
-from src.nfl_game_competition.entity.artifact_entity import DataIngestionArtifact
+from src.nfl_game_competition.entity.config_entity import (TrainingPipelineConfig, DataIngestionConfig,
+                                                           DataValidationConfig, DataTransformationConfig,
+                                                           ModelTunerConfig, ModelTrainerConfig, ModelEvaluationConfig)
+from src.nfl_game_competition.entity.artifact_entity import (DataIngestionArtifact, DataValidationArtifact,
+                                                             DataTransformationArtifact, ModelTunerArtifact,
+                                                             ModelTrainerArtifact, ModelEvaluationArtifact)
 
-from src.nfl_game_competition.components.data_ingestion import DataIngestion
+# stage components are imported inside their _start_x step: a stage only pays the import
+# time of its own dependencies (kaggle, sklearn, ...) when it actually runs
+from src.nfl_game_competition.utils.common import read_yaml
+from src.nfl_game_competition.utils.stage_cache import StageCache
+from src.nfl_game_competition.utils.dag import DagScheduler, StageNode
+from src.nfl_game_competition.utils.instrumentation import stage_metrics, summarize
+from src.nfl_game_competition.constants.training_pipeline_constants import (PARAMS_FILEPATH,
+                                                                            DATA_INGESTION_MERGE_WORKERS,
+                                                                            DATA_VALIDATION_WORKERS)
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import json
+import glob
 import sys
 
 logger = get_logger(name="nfl_game_competition/pipelines/train_pipeline.py")
 class TrainingPipeline:
-    def __init__(self):
-        self.__training_pipeline_config = TrainingPipelineConfig()
+    def __init__(self, resume_from: Optional[str] = None, profile_stages: Optional[List[str]] = None,
+                 profiler: Optional[str] = None):
+        """
+        Args:
+            resume_from (str): timestamp (%d_%m_%Y_%H_%M_%S) of a failed / interrupted run; its
+                               finished stages are loaded and only the rest run, in the same run dir
+            profile_stages (list): stages to run under the profiler, default PIPELINE_PROFILE_STAGES
+            profiler (str): "cprofile" or "sample", default PIPELINE_PROFILER
+        """
+        timestamp = datetime.strptime(resume_from, "%d_%m_%Y_%H_%M_%S") if resume_from else datetime.now()
+        self.__training_pipeline_config = TrainingPipelineConfig(timestamp=timestamp)
+        config = self.__training_pipeline_config
+        if profile_stages is not None:
+            config.profile_stages = list(profile_stages)
+        if profiler is not None:
+            config.profiler = profiler
+        self.__stage_cache = (StageCache(config.stage_cache_dir, config.stage_cache_max_bytes,
+                                         config.stage_cache_max_age_days, config.artifact_dir,
+                                         ingestion_manifest_path=DataIngestionConfig(
+                                             training_pipeline_config=config).manifest_filepath)
+                              if config.stage_cache_enabled else None)
+
+    def _run_stage(self, stage: str, config, component, inputs: Optional[list], output_dir: str, run):
+        """
+        run a stage, or rehydrate its artifact from the stage cache when its config, code and
+        inputs are unchanged. inputs=None marks a run that must not be memoized.
+        Either way the stage metrics record is written to its output dir; a profiled stage always runs.
+        """
+        pipeline_config = self.__training_pipeline_config
+        profiler = pipeline_config.profiler if stage in pipeline_config.profile_stages else None
+        with stage_metrics(stage, output_dir, pipeline_config.stage_metrics_file_name, profiler) as metrics:
+            if self.__stage_cache is None or inputs is None:
+                metrics.record(stage_cache="off")
+                return run()
+            key = self.__stage_cache.key(stage, config, component.__module__, inputs)
+            artifact = None if profiler else self.__stage_cache.load(stage, key)
+            if artifact is not None:
+                logger.info(f">>> {stage} unchanged, artifact rehydrated from stage cache {key} <<<")
+                metrics.record(stage_cache="hit", stage_cache_key=key)
+                return artifact
+            artifact = run()
+            metrics.record(stage_cache="miss", stage_cache_key=key)
+        # stored after the record is written, so the cached outputs carry it too
+        return self.__stage_cache.store(stage, key, artifact, output_dir)
+
+    @staticmethod
+    def _params(*sections: str) -> dict:
+        """params.yaml sections a stage reads, part of its cache key"""
+        params = read_yaml(Path(PARAMS_FILEPATH))
+        return {section: params.get(section) for section in sections}
 
     """data ingestion 
             step 4 after : components/data_ingestion.py
@@ -20,27 +85,168 @@ class TrainingPipeline:
     """
     def _start_data_ingestion(self) -> DataIngestionArtifact:
         try:
+            from src.nfl_game_competition.components.data_ingestion import DataIngestion
             data_ingestion_config = DataIngestionConfig(training_pipeline_config=self.__training_pipeline_config)
-            data_ingestion = DataIngestion(config=data_ingestion_config)
+            zip_file = os.path.join(data_ingestion_config.zipped_data_filepath, f"{data_ingestion_config.data_source_url}.zip")
+            # the competition zip is the input; without it (or with refresh_download) kaggle has to be asked
+            inputs = None if data_ingestion_config.refresh_download or not os.path.exists(zip_file) else [zip_file]
             logger.info(">>> Initiate Data Ingestion..<<<")
-            data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
+            data_ingestion_artifact = self._run_stage(
+                "data_ingestion", data_ingestion_config, DataIngestion, inputs, data_ingestion_config.data_ingestion_dir,
+                lambda: DataIngestion(config=data_ingestion_config).initiate_data_ingestion())
             logger.info(f">>> Data Ingestion Completed, Data Ingestion Artifact: {data_ingestion_artifact}")
             return data_ingestion_artifact
         except Exception as e:
             raise NFLGameCompetitionException(e, sys)
+
+    def _start_data_validation(self, data_ingestion_artifact: DataIngestionArtifact) -> DataValidationArtifact:
+        try:
+            from src.nfl_game_competition.components.data_validation import DataValidation
+            data_validation_config = DataValidationConfig(training_pipeline_config=self.__training_pipeline_config)
+            logger.info(">>> Initiate Data Validation..<<<")
+            data_validation_artifact = self._run_stage(
+                "data_validation", data_validation_config, DataValidation,
+                [data_ingestion_artifact, data_validation_config.schema_file_path, data_validation_config.baseline_file_path],
+                data_validation_config.data_validation_dir,
+                lambda: DataValidation(data_ingestion_artifact=data_ingestion_artifact,
+                                       config=data_validation_config).initiate_data_validation())
+            if not data_validation_artifact.validation_status:
+                # features are built alongside validation; model evaluation refuses to promote the candidate
+                logger.warning(f"Data validation failed, see {data_validation_artifact.report_file_path}")
+            logger.info(f">>> Data Validation Completed, Data Validation Artifact: {data_validation_artifact}")
+            return data_validation_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    def _start_data_transformation(self, data_ingestion_artifact: DataIngestionArtifact) -> DataTransformationArtifact:
+        try:
+            from src.nfl_game_competition.components.data_transformation import DataTransformation
+            data_transformation_config = DataTransformationConfig(training_pipeline_config=self.__training_pipeline_config)
+            logger.info(">>> Initiate Data Transformation..<<<")
+            data_transformation_artifact = self._run_stage(
+                "data_transformation", data_transformation_config, DataTransformation,
+                [data_ingestion_artifact, data_transformation_config.schema_file_path],
+                data_transformation_config.data_transformation_dir,
+                lambda: DataTransformation(data_ingestion_artifact=data_ingestion_artifact,
+                                           config=data_transformation_config).initiate_data_transformation())
+            logger.info(f">>> Data Transformation Completed, Data Transformation Artifact: {data_transformation_artifact}")
+            return data_transformation_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    def _start_model_tuner(self, data_transformation_artifact: DataTransformationArtifact) -> Optional[ModelTunerArtifact]:
+        try:
+            if not read_yaml(Path(PARAMS_FILEPATH)).get("model_tuner", {}).get("enabled", False):
+                logger.info(">>> Model Tuner disabled in params.yaml, skipped <<<")
+                return None
+            from src.nfl_game_competition.components.model_tuner import ModelTuner
+            model_tuner_config = ModelTunerConfig(training_pipeline_config=self.__training_pipeline_config)
+            logger.info(">>> Initiate Model Tuner..<<<")
+            model_tuner_artifact = self._run_stage(
+                "model_tuner", model_tuner_config, ModelTuner,
+                [data_transformation_artifact, self._params("model_tuner", "model_trainer")],
+                model_tuner_config.model_tuner_dir,
+                lambda: ModelTuner(data_transformation_artifact=data_transformation_artifact,
+                                   config=model_tuner_config).initiate_model_tuner())
+            logger.info(f">>> Model Tuner Completed, Model Tuner Artifact: {model_tuner_artifact}")
+            return model_tuner_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    def _start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact,
+                             model_tuner_artifact: Optional[ModelTunerArtifact] = None) -> ModelTrainerArtifact:
+        try:
+            from src.nfl_game_competition.components.model_trainer import ModelTrainer
+            model_trainer_config = ModelTrainerConfig(training_pipeline_config=self.__training_pipeline_config)
+            logger.info(">>> Initiate Model Trainer..<<<")
+            model_trainer_artifact = self._run_stage(
+                "model_trainer", model_trainer_config, ModelTrainer,
+                [data_transformation_artifact, model_tuner_artifact, self._params("model_trainer", "cross_validation")],
+                model_trainer_config.model_trainer_dir,
+                lambda: ModelTrainer(data_transformation_artifact=data_transformation_artifact,
+                                     config=model_trainer_config,
+                                     model_tuner_artifact=model_tuner_artifact).initiate_model_trainer())
+            logger.info(f">>> Model Trainer Completed, Model Trainer Artifact: {model_trainer_artifact}")
+            return model_trainer_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
+
+    def _start_model_evaluation(self, data_validation_artifact: DataValidationArtifact,
+                                data_transformation_artifact: DataTransformationArtifact,
+                                model_trainer_artifact: ModelTrainerArtifact) -> ModelEvaluationArtifact:
+        try:
+            from src.nfl_game_competition.components.model_evaluation import ModelEvaluation
+            model_evaluation_config = ModelEvaluationConfig(training_pipeline_config=self.__training_pipeline_config)
+            logger.info(">>> Initiate Model Evaluation..<<<")
+            # the saved model it compares against is an input too: a new promotion re-runs the evaluation
+            model_evaluation_artifact = self._run_stage(
+                "model_evaluation", model_evaluation_config, ModelEvaluation,
+                [data_validation_artifact, data_transformation_artifact, model_trainer_artifact,
+                 self._params("model_evaluation"), model_evaluation_config.saved_model_file_path,
+                 model_evaluation_config.saved_state_file_path],
+                model_evaluation_config.model_evaluation_dir,
+                lambda: ModelEvaluation(data_validation_artifact=data_validation_artifact,
+                                        data_transformation_artifact=data_transformation_artifact,
+                                        model_trainer_artifact=model_trainer_artifact,
+                                        config=model_evaluation_config).initiate_model_evaluation())
+            logger.info(f">>> Model Evaluation Completed, Model Evaluation Artifact: {model_evaluation_artifact}")
+            return model_evaluation_artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys)
         
+    def _stage_nodes(self) -> List[StageNode]:
+        """
+        the stages as a DAG: each node produces one artifact entity, its inputs are the artifact
+        typed parameters of its _start_x step. Validation and transformation both only need the
+        ingestion artifact, so they run at the same time; cpus are the pool sizes a stage uses.
+        """
+        config = self.__training_pipeline_config
+        params = read_yaml(Path(PARAMS_FILEPATH))
+        default_workers = max(1, (os.cpu_count() or 1) - 1)
+        tuner = params.get("model_tuner", {})
+        cpus = {"data_ingestion": DATA_INGESTION_MERGE_WORKERS,
+                "data_validation": DATA_VALIDATION_WORKERS,
+                "model_tuner": (tuner.get("workers") or default_workers) if tuner.get("enabled", False) else 1,
+                "model_trainer": params.get("cross_validation", {}).get("workers") or default_workers}
+        stages = [("data_ingestion", self._start_data_ingestion, DataIngestionArtifact),
+                  ("data_validation", self._start_data_validation, DataValidationArtifact),
+                  ("data_transformation", self._start_data_transformation, DataTransformationArtifact),
+                  ("model_tuner", self._start_model_tuner, ModelTunerArtifact),
+                  ("model_trainer", self._start_model_trainer, ModelTrainerArtifact),
+                  ("model_evaluation", self._start_model_evaluation, ModelEvaluationArtifact)]
+        return [StageNode(name=name, fn=fn, produces=produces, cpus=max(1, int(cpus.get(name, 1))),
+                          memory_gb=config.stage_memory_gb.get(name, 1.0))
+                for name, fn, produces in stages]
+
+    def _write_pipeline_metrics(self) -> None:
+        """stage records of this run (resumed stages included) summarized by wall time"""
+        config = self.__training_pipeline_config
+        records = []
+        for file_path in sorted(glob.glob(os.path.join(config.artifact_dir, "*", config.stage_metrics_file_name))):
+            with open(file_path) as record_file:
+                records.append(json.load(record_file))
+        if not records:
+            return
+        summary = {"run": config.timestamp, **summarize(records)}
+        with open(config.pipeline_metrics_file_path, "w") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+        logger.info(f"Pipeline metrics: {config.pipeline_metrics_file_path}, slowest stage "
+                    f"{summary['stages'][0]['stage']} ({summary['stages'][0]['wall_s']:.1f}s)")
+
     # run pipeline
     def run_pipeline(self):
         try:
-            data_ingestion_artifact = self._start_data_ingestion()
-            # data_validation_artifact = self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
-            # data_transformation_artifact = self.start_data_transformation(data_validation_artifact=data_validation_artifact)
-            # model_trainer_artifact = self.start_model_training(data_transformation_artifact=data_transformation_artifact)
-            # model_evaluation_artifact = self.start_model_evaluation(data_validation_artifact=data_validation_artifact,
-            #                                                        model_trainer_artifact=model_trainer_artifact)
-            # model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
+            config = self.__training_pipeline_config
+            scheduler = DagScheduler(self._stage_nodes(), state_dir=config.pipeline_state_dir,
+                                     max_cpus=config.max_cpus, max_memory_gb=config.max_memory_gb)
+            logger.info(f">>> Training pipeline run {config.timestamp}, state in {config.pipeline_state_dir} <<<")
+            try:
+                artifacts = scheduler.run()
+            finally:
+                self._write_pipeline_metrics()
+            # model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=artifacts["model_evaluation"])
             # return model_pusher_artifact
-            return data_ingestion_artifact
+            return artifacts["model_evaluation"]
             
         except Exception as e:
             raise NFLGameCompetitionException(e, sys)
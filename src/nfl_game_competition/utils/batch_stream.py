@@ -0,0 +1,174 @@
+"""Mini-batch streaming
+
+Feeds incremental learners from memory mapped feature / target shards (the .npy blocks written
+by data transformation) without ever loading a split into memory:
+- batches are contiguous row ranges of a shard, so a batch is one sequential read of the memmap
+- the batch order is shuffled per epoch, rows are shuffled inside each batch
+- a background thread decodes (pages in and copies) the next batches while the current one trains;
+  numpy releases the GIL on the copy, so reading and fitting overlap
+"""
+import copy
+import os
+import sys
+import queue
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+
+logger = get_logger(name="nfl_game_competition.utils.batch_stream")
+
+_END = object()  # end of stream marker put on the prefetch queue
+
+
+def prefetch(batches: Iterator, depth: int = 2) -> Iterator:
+    """
+    run an iterator on a background thread, keeping up to `depth` items decoded ahead.
+    Errors of the producer are re-raised in the consumer; leaving the loop early stops the producer.
+    """
+    if depth <= 0:
+        yield from batches
+        return
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        """queue an item, giving up when the consumer has stopped; False if it was not queued"""
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in batches:
+                if not put(item):
+                    return
+            put(_END)
+        except BaseException as e:  # forwarded to the consumer
+            put(e)
+
+    producer = threading.Thread(target=produce, name="batch-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join(timeout=1.0)
+
+
+class MiniBatchStream:
+    def __init__(self, shard_dirs: Sequence[Path | str], features_file_name: str = "features.npy",
+                 targets_file_name: str = "targets.npy", batch_size: int = 65536, prefetch_batches: int = 2,
+                 feature_columns: Optional[Sequence[int]] = None,
+                 row_indices: Optional[Sequence[Optional[np.ndarray]]] = None):
+        """
+        Args:
+            shard_dirs (list): transformed split dirs, each holding a features / targets block pair
+            batch_size (int): rows per batch
+            prefetch_batches (int): batches decoded ahead by the background thread, 0 disables it
+            feature_columns (list): optional column subset of the feature block
+            row_indices (list): optional sorted row subset per shard (e.g. the rows of some folds),
+                None for a shard streams all of its rows
+        """
+        try:
+            self.shards: List[Tuple[np.ndarray, np.ndarray]] = []
+            for shard_dir in shard_dirs:
+                features = np.load(os.path.join(shard_dir, features_file_name), mmap_mode="r")
+                targets = np.load(os.path.join(shard_dir, targets_file_name), mmap_mode="r")
+                if len(features) != len(targets):
+                    raise ValueError(f"features / targets row mismatch in {shard_dir}: {len(features)} != {len(targets)}")
+                self.shards.append((features, targets))
+            self.row_indices = list(row_indices) if row_indices is not None else [None] * len(self.shards)
+            self.batch_size = int(batch_size)
+            self.prefetch_batches = int(prefetch_batches)
+            self.feature_columns = None if feature_columns is None else np.asarray(feature_columns)
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    @property
+    def n_rows(self) -> int:
+        return sum(self._shard_rows(s) for s in range(len(self.shards)))
+
+    @property
+    def n_features(self) -> int:
+        width = self.shards[0][0].shape[1] if self.shards else 0
+        return width if self.feature_columns is None else len(self.feature_columns)
+
+    def _shard_rows(self, shard: int) -> int:
+        rows = self.row_indices[shard]
+        return len(self.shards[shard][0]) if rows is None else len(rows)
+
+    def _ranges(self, rng: Optional[np.random.Generator], max_rows: Optional[int]) -> List[Tuple[int, int, int]]:
+        """(shard, start, stop) of every batch, in shuffled order when rng is given"""
+        ranges = [(s, start, min(start + self.batch_size, self._shard_rows(s)))
+                  for s in range(len(self.shards))
+                  for start in range(0, self._shard_rows(s), self.batch_size)]
+        if rng is not None:
+            ranges = [ranges[i] for i in rng.permutation(len(ranges))]
+        if max_rows is not None:
+            kept, rows = [], 0
+            for r in ranges:
+                if rows >= max_rows:
+                    break
+                kept.append(r)
+                rows += r[2] - r[1]
+            ranges = kept
+        return ranges
+
+    def _decode(self, shard: int, start: int, stop: int,
+                rng: Optional[np.random.Generator]) -> Tuple[np.ndarray, np.ndarray]:
+        features, targets = self.shards[shard]
+        rows = self.row_indices[shard]
+        # sorted row subsets keep the memmap reads (mostly) sequential
+        selection = slice(start, stop) if rows is None else rows[start:stop]
+        X = np.array(features[selection], dtype=np.float32)
+        Y = np.array(targets[selection], dtype=np.float32)
+        if self.feature_columns is not None:
+            X = X[:, self.feature_columns]
+        if rng is not None:
+            order = rng.permutation(len(X))
+            X, Y = X[order], Y[order]
+        return X, Y
+
+    def subset(self, max_rows: int, seed: Optional[int] = None) -> "MiniBatchStream":
+        """
+        stream over about max_rows rows (whole batches drawn once with seed); every pass over the
+        returned stream, shuffled or not, reads the same rows
+        """
+        picked = sorted(self._ranges(np.random.default_rng(seed), max_rows))
+        row_indices = []
+        for s in range(len(self.shards)):
+            spans = [np.arange(start, stop) for shard, start, stop in picked if shard == s]
+            positions = np.concatenate(spans) if spans else np.zeros(0, dtype=np.int64)
+            rows = self.row_indices[s]
+            row_indices.append(positions if rows is None else np.asarray(rows)[positions])
+        subset = copy.copy(self)
+        subset.row_indices = row_indices
+        return subset
+
+    def batches(self, shuffle: bool = False, seed: Optional[int] = None,
+                max_rows: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        (X, Y) float32 batches of every shard, decoded on the prefetch thread.
+        Args:
+            shuffle (bool): shuffle batch order and rows inside each batch
+            seed (int): shuffle seed, pass epoch dependent seeds for a new order per epoch
+            max_rows (int): stop after about this many rows (whole batches), used for data subsets
+        """
+        rng = np.random.default_rng(seed) if shuffle else None
+        ranges = self._ranges(rng, max_rows)
+        return prefetch((self._decode(s, start, stop, rng) for s, start, stop in ranges), self.prefetch_batches)
@@ -2,15 +2,20 @@ import os
 import sys
 from src.nfl_game_competition.logger import get_logger
 from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.constants.training_pipeline_constants import (SCHEMA_FILEPATH, DATA_INGESTION_PLAYER_COLS,
+                                                                           DATA_INGESTION_PLAYER_DERIVED_COLS,
+                                                                           DATA_INGESTION_PLAYER_DIM_NAME,
+                                                                           DATA_INGESTION_INPUT_TRACKING_NAME,
+                                                                           DATA_INGESTION_PARTITION_COLS)
 import json
-import joblib
 from ensure import ensure_annotations
 from box import ConfigBox
 from pathlib import Path 
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from box.exceptions import BoxValueError
 import yaml
 
+import numpy as np
 import pandas as pd
 
 from zipfile import ZipFile
@@ -64,7 +69,7 @@ def load_json(path: Path) -> ConfigBox:
     except Exception as e:
         raise NFLGameCompetitionException(e, sys)
     
-@ensure_annotations
+# @ensure_annotations  (ensure cannot isinstance-check typing.Any)
 def save_object(path: Path | str, obj: Any) -> None:
     """save object to file
     Args:
@@ -80,12 +85,13 @@ def save_object(path: Path | str, obj: Any) -> None:
         path = Path(path)
         dir_path = path.parent
         os.makedirs(dir_path, exist_ok=True)
+        import joblib  # imported on first use, keeps joblib / scipy out of the import time of every entry point
         joblib.dump(value=obj, filename=path)
         logger.info(f"object saved successfully at : {path}")
     except Exception as e:
         raise NFLGameCompetitionException(f"Failed to save object at {path}. Reason: {e}", sys)
 
-@ensure_annotations
+# @ensure_annotations
 def load_object(path: Path | str) -> Any:
     """load object from file
     Args:
@@ -104,43 +110,137 @@ def load_object(path: Path | str) -> Any:
         path = Path(path)
         if not path.exists():
             raise NFLGameCompetitionException(f"The file: {path} does not exist")
-        return joblib.load(path)              
+        import joblib
+        return joblib.load(path)
     except Exception as e: 
         raise NFLGameCompetitionException(f"Failed to load object from {path}. Reason: {e}", sys)
 
-def _detect_dtypes(path: Path, sample_n: int = 5000) -> dict:
+def read_schema_dtypes(schema_path: Path | str = SCHEMA_FILEPATH) -> Dict[str, str]:
+    """read {column: dtype} mapping from data_schema/schema.yaml
+    Args:
+        schema_path (Path): path of the schema yaml
+    Returns:
+        dict: column name -> dtype string, empty dict if schema file is missing
+    """
+    try:
+        schema_path = Path(schema_path)
+        if not schema_path.exists():
+            return {}
+        with open(schema_path) as f:
+            content = yaml.safe_load(f) or {}
+        return {col["name"]: col["dtype"] for col in content.get("schema", [])}
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
+
+def _parse_dtypes(dtype_map: Dict[str, str]) -> Dict[str, str]:
+    """
+    internal helper: dtypes handed to the csv parser. Narrow integers are parsed as int64 and
+    downcast afterwards, because read_csv silently wraps values that overflow a small int dtype.
+    """
+    return {c: ("int64" if pd.api.types.is_integer_dtype(t) else t)
+            for c, t in dtype_map.items() if t != "object"}
+
+def _downcast_integers(df: pd.DataFrame, dtype_map: Dict[str, str]) -> pd.DataFrame:
     """
-    internal helper: detect best dtypes from small sample to reduce memory
+    internal helper: cast parsed integer columns to their schema dtype when every value fits,
+    otherwise to the narrowest integer dtype that holds the observed range.
     """
-    sample_df = pd.read_csv(path, nrows=sample_n)
+    for col, dtype in dtype_map.items():
+        if col not in df.columns or not pd.api.types.is_integer_dtype(dtype) or str(df[col].dtype) == dtype:
+            continue
+        if not pd.api.types.is_integer_dtype(df[col]):
+            continue
+        info = np.iinfo(dtype)
+        col_min, col_max = (int(df[col].min()), int(df[col].max())) if len(df) else (0, 0)
+        if info.min <= col_min and col_max <= info.max:
+            df[col] = df[col].astype(dtype)
+        else:
+            safe = np.result_type(np.min_scalar_type(col_min), np.min_scalar_type(col_max))
+            logger.warning(f"Column {col} range [{col_min}, {col_max}] does not fit schema dtype {dtype}, using {safe}")
+            df[col] = df[col].astype(safe)
+    return df
 
-    dtype_map = {}
-    for col in sample_df.columns:
-        if pd.api.types.is_integer_dtype(sample_df[col]):
-            dtype_map[col] = 'int32'
-        elif pd.api.types.is_float_dtype(sample_df[col]):
-            dtype_map[col] = 'float32'
+def memory_savings_report(df: pd.DataFrame) -> pd.DataFrame:
+    """per column memory of df against pandas default dtypes (int64/float64/object)
+    Args:
+        df (pd.DataFrame): loaded dataframe
+    Returns:
+        pd.DataFrame: index=column, columns=[dtype, default_bytes, bytes, saved_bytes, saved_pct]
+    Default size of a categorical is estimated from its categories (8 byte pointer + string
+    object per row) without materialising the object column.
+    """
+    rows = []
+    for col in df.columns:
+        series = df[col]
+        current = int(series.memory_usage(index=False, deep=True))
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+            per_value = np.fromiter((sys.getsizeof(v) for v in series.cat.categories), dtype=np.int64,
+                                    count=len(series.cat.categories))
+            default = 8 * len(series) + int(counts @ per_value)
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            default = 8 * len(series)
         else:
-            dtype_map[col] = 'object'
-    return dtype_map
+            default = current
+        rows.append((col, str(series.dtype), default, current))
+    report = pd.DataFrame(rows, columns=["column", "dtype", "default_bytes", "bytes"]).set_index("column")
+    report["saved_bytes"] = report["default_bytes"] - report["bytes"]
+    report["saved_pct"] = (100 * report["saved_bytes"] / report["default_bytes"].clip(lower=1)).round(1)
+    return report
+
+def _read_compact_csv(source: Any, name: str, schema_path: Path | str, report_memory: bool,
+                      **pd_kwargs) -> pd.DataFrame:
+    """
+    internal helper: single pass read_csv of a path or file object with schema dtypes
+    """
+    dtype_map = read_schema_dtypes(schema_path)
+    parse_dtypes = {**_parse_dtypes(dtype_map), **pd_kwargs.pop("dtype", {})}
+
+    df = _downcast_integers(pd.read_csv(source, dtype=parse_dtypes, **pd_kwargs), dtype_map)
+    if report_memory:
+        report = memory_savings_report(df)
+        logger.info(f"Memory of {name}: {report['bytes'].sum() / 1e6:.1f} MB, "
+                    f"saved {report['saved_bytes'].sum() / 1e6:.1f} MB vs default dtypes\n{report.to_string()}")
+    return df
 
 @ensure_annotations
-def load_data(path: Path | str, **pd_kwargs) -> pd.DataFrame:
+def load_data(path: Path | str, schema_path: Path | str = SCHEMA_FILEPATH,
+              report_memory: bool = False, **pd_kwargs) -> pd.DataFrame:
     """load data from file
     Args:
         path (Path): path to load the file
+        schema_path (Path): schema yaml that holds the compact dtype of each column
+        report_memory (bool): log memory saved per column against pandas default dtypes
     Returns:                                                                            
         pd.DataFrame: loaded dataframe
+    Single pass read: dtypes come from the schema, low cardinality strings load as category,
+    integers are downcast to the schema dtype when their range allows it.
     """
     try:
         path = Path(path)
         if not path.exists():
             raise NFLGameCompetitionException(f"The file: {path} does not exist", sys)
-        # detect dtype from sample
-        dtype_map = _detect_dtypes(path)
+        return _read_compact_csv(path, path.name, schema_path, report_memory, **pd_kwargs)
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
 
-        # now read full file with optimized dtypes
-        return pd.read_csv(path, dtype=dtype_map, **pd_kwargs)
+@ensure_annotations
+def load_zip_member(zip_path: Path | str, member: str, schema_path: Path | str = SCHEMA_FILEPATH,
+                    report_memory: bool = False, **pd_kwargs) -> pd.DataFrame:
+    """load a csv member straight from a zip archive, nothing is extracted to disk
+    Args:
+        zip_path (Path): path of the zip archive
+        member (str): member name inside the archive, e.g. train/input_2023_w01.csv
+        schema_path (Path): schema yaml that holds the compact dtype of each column
+        report_memory (bool): log memory saved per column against pandas default dtypes
+    Returns:
+        pd.DataFrame: loaded dataframe
+    Every call opens its own handle on the archive, so members can be decompressed concurrently.
+    """
+    try:
+        with ZipFile(zip_path, "r") as zip_ref, zip_ref.open(member) as member_file:
+            return _read_compact_csv(member_file, member, schema_path, report_memory, **pd_kwargs)
     except Exception as e:
         raise NFLGameCompetitionException(e, sys) from e
     
@@ -161,6 +261,184 @@ def save_data(path: Path | str, data: pd.DataFrame, index: bool = False, **pd_kw
     except Exception as e:
         raise NFLGameCompetitionException(e, sys) from e
 
+# ---------------------------
+# Feature store helpers (partitioned parquet)
+# ---------------------------
+
+def _apply_schema_dtypes(df: pd.DataFrame, dtype_map: Dict[str, str]) -> pd.DataFrame:
+    """
+    internal helper: cast columns whose dtype drifted from the schema (e.g. hive partition keys)
+    """
+    casts = {c: t for c, t in dtype_map.items()
+             if c in df.columns and t != "object" and str(df[c].dtype) != t}
+    return df.astype(casts) if casts else df
+
+def save_feature_store(path: Path | str, data: pd.DataFrame, partition_cols: list | None = None,
+                       sort_cols: list | None = None, row_group_size: int = 16384) -> list:
+    """save data as hive partitioned parquet dataset (path/season=2023/week=1/part-0.parquet, ...)
+    Args:
+        path (Path): root dir of the dataset
+        data (pd.DataFrame): data to be saved, must contain partition_cols
+        partition_cols (list): columns used as partition keys, default ["week"] (the feature store: season, week)
+        sort_cols (list): optional row order inside each partition file
+        row_group_size (int): rows per parquet row group
+    Returns:
+        list: written partition file paths
+    Existing files of a partition being written are replaced, other partitions are untouched.
+    """
+    try:
+        import pyarrow as pa  # parquet writer imported on first use, keeps it out of the entry point imports
+        import pyarrow.parquet as pq
+        path = Path(path)
+        partition_cols = partition_cols or ["week"]
+        written = []
+        for keys, part in data.groupby(partition_cols, sort=True, observed=True):
+            keys = keys if isinstance(keys, tuple) else (keys,)
+            part_dir = path.joinpath(*[f"{c}={k}" for c, k in zip(partition_cols, keys)])
+            os.makedirs(part_dir, exist_ok=True)
+            for old_file in part_dir.glob("*.parquet"):
+                old_file.unlink()
+            part = part.drop(columns=partition_cols)
+            if sort_cols:
+                part = part.sort_values(sort_cols, kind="stable")
+            table = pa.Table.from_pandas(part, preserve_index=False)
+            file_path = part_dir / "part-0.parquet"
+            pq.write_table(table, file_path, row_group_size=row_group_size)
+            written.append(file_path)
+        logger.info(f"Writing parquet dataset: {path} (rows={len(data)}, partitions={len(written)})")
+        return written
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
+
+def load_feature_store(path: Path | str, columns: list | None = None, filters: list | None = None,
+                       schema_path: Path | str = SCHEMA_FILEPATH) -> pd.DataFrame:
+    """load (a slice of) the partitioned parquet feature store
+    Args:
+        path (Path): root dir of the dataset
+        columns (list): column projection, None loads all columns
+        filters (list): pyarrow/pandas style filters, e.g. [("season", "==", 2023), ("week", "in", [1, 2])]
+                        partition keys prune directories, other columns prune row groups by statistics
+        schema_path (Path): schema yaml used to restore dtypes
+    Returns:
+        pd.DataFrame: loaded dataframe
+    Player attributes live in the player dimension next to the store; they are joined on nfl_id only
+    when columns asks for them (or is None). Filters apply to the per frame columns.
+    """
+    try:
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+        path = Path(path)
+        if not path.exists():
+            raise NFLGameCompetitionException(f"The feature store: {path} does not exist", sys)
+        dtype_map = read_schema_dtypes(schema_path)
+        dim_path = player_dim_path(path)
+        player_cols = [*DATA_INGESTION_PLAYER_COLS, *DATA_INGESTION_PLAYER_DERIVED_COLS]
+        wanted = ([] if not dim_path.exists() else
+                  DATA_INGESTION_PLAYER_COLS if columns is None else [c for c in columns if c in player_cols])
+        read_columns = columns
+        if columns is not None and wanted:
+            read_columns = list(dict.fromkeys([*(c for c in columns if c not in player_cols), "nfl_id",
+                                               *(["game_id"] if "player_age" in wanted else [])]))
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+        expression = pq.filters_to_expression(filters) if filters else None
+        df = dataset.to_table(columns=read_columns, filter=expression).to_pandas()
+        if wanted:
+            df = join_player_attributes(df, load_player_dim(dim_path), wanted)
+            df = df[columns] if columns is not None else df[[*(c for c in dtype_map if c in df.columns),
+                                                            *(c for c in df.columns if c not in dtype_map)]]
+        return _apply_schema_dtypes(df, dtype_map)
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
+
+def player_dim_path(feature_store_path: Path | str) -> Path:
+    """player dimension dataset of a feature store (a sibling dir with the same season / week partitions)"""
+    return Path(feature_store_path).with_name(DATA_INGESTION_PLAYER_DIM_NAME)
+
+def input_tracking_path(feature_store_path: Path | str) -> Path:
+    """input tracking dataset of a feature store: the input frames of every player, predicted or not"""
+    return Path(feature_store_path).with_name(DATA_INGESTION_INPUT_TRACKING_NAME)
+
+def split_player_dimension(df: pd.DataFrame) -> tuple:
+    """split merged tracking rows into (fact rows without the player attributes, one row per nfl_id)
+    Args:
+        df (pd.DataFrame): merged rows holding nfl_id and the DATA_INGESTION_PLAYER_COLS
+    Returns:
+        tuple: (fact dataframe, player dimension dataframe sorted by nfl_id with player_height_in)
+    The dimension keeps the last row of every player; the attributes do not change inside a week.
+    """
+    cols = [c for c in DATA_INGESTION_PLAYER_COLS if c in df.columns]
+    if not cols:
+        return df, pd.DataFrame({"nfl_id": np.unique(df["nfl_id"].to_numpy())})
+    last = np.ones(len(df), dtype=bool)
+    nfl_id = df["nfl_id"].to_numpy()
+    order = np.argsort(nfl_id, kind="stable")
+    last[:-1] = nfl_id[order][1:] != nfl_id[order][:-1]
+    dim = df.iloc[order[last]][["nfl_id", *cols]].reset_index(drop=True)
+    if "player_height" in dim.columns:
+        feet_inches = dim["player_height"].astype(str).str.split("-", n=1, expand=True).reindex(columns=[0, 1])
+        feet_inches = feet_inches.apply(pd.to_numeric, errors="coerce")
+        dim["player_height_in"] = (feet_inches[0] * 12 + feet_inches[1]).astype(np.float32)
+    for c in dim.columns:
+        if isinstance(dim[c].dtype, pd.CategoricalDtype):
+            dim[c] = dim[c].astype(str)  # per week category sets differ, plain strings merge across weeks
+    return df.drop(columns=cols), dim
+
+def load_player_dim(path: Path | str) -> pd.DataFrame:
+    """player dimension, one row per nfl_id; a player seen in several weeks keeps the latest (season, week)"""
+    try:
+        import pyarrow.dataset as ds
+        dim = ds.dataset(Path(path), format="parquet", partitioning="hive").to_table().to_pandas()
+        partition_cols = [c for c in DATA_INGESTION_PARTITION_COLS if c in dim.columns]
+        if partition_cols:
+            dim = dim.sort_values(partition_cols, kind="stable").drop(columns=partition_cols)
+        return dim.drop_duplicates("nfl_id", keep="last").set_index("nfl_id")
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
+
+def join_player_attributes(df: pd.DataFrame, dim: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """add player attribute columns to tracking rows by nfl_id
+    Args:
+        df (pd.DataFrame): rows with nfl_id (and game_id for player_age)
+        dim (pd.DataFrame): load_player_dim output
+        columns (list): attributes to add, player_age is the age in years at the game date
+    Returns:
+        pd.DataFrame: df with the columns added
+    """
+    nfl_id = df["nfl_id"].to_numpy()
+    players, inverse = np.unique(nfl_id, return_inverse=True)
+    rows = dim.reindex(players)  # one lookup per distinct player, then a positional take per row
+    for c in columns:
+        if c == "player_age":
+            game_ids, game_inverse = np.unique(df["game_id"].to_numpy(), return_inverse=True)
+            game_days = pd.to_datetime(pd.Series(game_ids // 100).astype(str), format="%Y%m%d").to_numpy()
+            birth = pd.to_datetime(rows["player_birth_date"], errors="coerce").to_numpy()
+            age = (game_days[game_inverse] - birth[inverse]) / np.timedelta64(1, "D") / 365.25
+            df[c] = age.astype(np.float32)
+        else:
+            df[c] = rows[c].to_numpy()[inverse]
+    return df
+
+def list_feature_store_partitions(path: Path | str, key: str | list = "week") -> list:
+    """sorted values of a hive partition key, read from directory names only (no data is read).
+    A list of nested keys gives value tuples, e.g. ["season", "week"] -> [(2023, 1), (2023, 2), (2024, 1)]
+    """
+    path = Path(path)
+    keys = [key] if isinstance(key, str) else list(key)
+    dirs = [path]
+    for k in keys:
+        dirs = [p for d in dirs for p in d.glob(f"{k}=*") if p.is_dir()]
+    values = [tuple(int(part.split("=", 1)[1]) for part in p.relative_to(path).parts) for p in dirs]
+    return sorted(v[0] for v in values) if isinstance(key, str) else sorted(values)
+
+def partition_filters(partition: Tuple[int, ...], keys: list = DATA_INGESTION_PARTITION_COLS) -> list:
+    """load_feature_store filters selecting one partition, e.g. (2023, 5) -> [("season", "==", 2023), ("week", "==", 5)]"""
+    return [(k, "==", int(v)) for k, v in zip(keys, partition)]
+
+def feature_store_exists(path: Path | str) -> bool:
+    """True if the parquet dataset at path holds at least one partition file"""
+    path = Path(path)
+    return path.is_dir() and any(path.rglob("*.parquet"))
+
 # ---------------------------
 # YAML helpers
 # ---------------------------
@@ -200,3 +478,58 @@ def write_yaml(content: Dict[str, Any], file_path: str) -> None:
         logger.debug(f"YAML written successfully: {file_path}")
     except Exception as e:
         raise NFLGameCompetitionException(f"Failed to write YAML: {file_path}. Error: {e}")
+
+# ---------------------------
+# Split helpers (play key arrays pointing into the feature store)
+# ---------------------------
+
+def play_keys(game_id: np.ndarray, play_id: np.ndarray) -> np.ndarray:
+    """pack (game_id, play_id) into one int64 per play, play_id takes the low 16 bits"""
+    return (np.asarray(game_id, dtype=np.int64) << 16) | np.asarray(play_id, dtype=np.int64)
+
+def save_split_keys(path: Path | str, keys: np.ndarray) -> None:
+    """save an (n_plays, 2) [game_id, play_id] key array as .npy
+    Args:
+        path (Path): .npy file path
+        keys (np.ndarray): play keys of the split
+    """
+    try:
+        path = Path(path)
+        os.makedirs(path.parent, exist_ok=True)
+        np.save(path, np.ascontiguousarray(keys, dtype=np.int32))
+        logger.info(f"split keys saved at: {path} (plays={len(keys)})")
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
+
+def load_split_keys(path: Path | str) -> np.ndarray:
+    """memory mapped (n_plays, 2) [game_id, play_id] key array, nothing is read until sliced"""
+    try:
+        return np.load(Path(path), mmap_mode="r")
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
+
+def load_split_data(feature_store_path: Path | str, keys_path: Path | str, columns: list | None = None,
+                    filters: list | None = None, schema_path: Path | str = SCHEMA_FILEPATH) -> pd.DataFrame:
+    """load the feature store rows of one split (train/test/fold)
+    Args:
+        feature_store_path (Path): root dir of the parquet feature store
+        keys_path (Path): .npy play keys written by data ingestion
+        columns (list): column projection, None loads all columns
+        filters (list): extra pyarrow filters, e.g. [("season", "==", 2023), ("week", "<=", 9)]
+        schema_path (Path): schema yaml used to restore dtypes
+    Returns:
+        pd.DataFrame: rows whose (game_id, play_id) is part of the split
+    game_id membership is pushed down to parquet, the exact play match is a vectorized np.isin.
+    """
+    try:
+        keys = load_split_keys(keys_path)
+        games = np.unique(keys[:, 0]).tolist()
+        read_columns = None if columns is None else list(dict.fromkeys([*columns, "game_id", "play_id"]))
+        df = load_feature_store(feature_store_path, columns=read_columns,
+                                filters=[*(filters or []), ("game_id", "in", games)], schema_path=schema_path)
+        mask = np.isin(play_keys(df["game_id"].to_numpy(), df["play_id"].to_numpy()),
+                       play_keys(keys[:, 0], keys[:, 1]))
+        df = df.loc[mask].reset_index(drop=True)
+        return df if columns is None else df[columns]
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
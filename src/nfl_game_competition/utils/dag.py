@@ -0,0 +1,163 @@
+"""Stage DAG scheduler
+
+Pipeline stages as a DAG declared through their artifact entities:
+- a StageNode produces one artifact type; its inputs are the artifact typed parameters of its
+  function (Optional[X] included), so the edges come from the signatures, not from a hand kept list
+- nodes whose inputs are complete run concurrently on a thread pool while their declared cpus and
+  memory fit the limits; a node larger than a limit runs alone
+- every finished node's artifact is saved to the state dir, a resumed run loads them and only
+  runs the nodes that did not finish (failed, interrupted or never started)
+- on a failure no new node is started, the running ones finish and are recorded, then the error is raised
+"""
+import os
+import json
+import time
+import typing
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.utils.common import load_object, save_object
+
+logger = get_logger(name="nfl_game_competition.utils.dag")
+
+STATE_FILE_NAME = "dag_state.json"
+
+
+@dataclass
+class StageNode:
+    name: str
+    fn: Callable[..., Any]                  # called with its input artifacts as keyword arguments
+    produces: type                          # artifact entity type of the result
+    cpus: int = 1                           # cores the stage keeps busy (its process / thread pool size)
+    memory_gb: float = 1.0                  # peak resident memory estimate
+
+
+def total_memory_gb() -> Optional[float]:
+    """physical memory of the machine, None where sysconf does not report it"""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1 << 30)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _artifact_type(annotation: Any) -> Optional[type]:
+    """X for X and Optional[X] annotations, None for anything else"""
+    if isinstance(annotation, type):
+        return annotation
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    return args[0] if typing.get_origin(annotation) is typing.Union and len(args) == 1 else None
+
+
+class DagScheduler:
+    def __init__(self, nodes: List[StageNode], state_dir: str, max_cpus: Optional[int] = None,
+                 max_memory_gb: Optional[float] = None):
+        """
+        Args:
+            nodes (list): stage nodes, one producer per artifact type
+            state_dir (str): finished artifacts + dag_state.json of this run
+            max_cpus (int): cores shared by concurrent nodes, default os.cpu_count()
+            max_memory_gb (float): memory shared by concurrent nodes, default the physical memory
+        """
+        self.nodes = {node.name: node for node in nodes}
+        self.state_dir = Path(state_dir)
+        self.max_cpus = int(max_cpus or os.cpu_count() or 1)
+        self.max_memory_gb = float(max_memory_gb or total_memory_gb() or float("inf"))
+        producers = {node.produces: node.name for node in nodes}
+        self.inputs: Dict[str, Dict[str, str]] = {}
+        for node in nodes:
+            hints = typing.get_type_hints(node.fn)
+            hints.pop("return", None)
+            self.inputs[node.name] = {param: producers[_artifact_type(hint)] for param, hint in hints.items()
+                                      if _artifact_type(hint) in producers}
+        self.__lock = threading.Lock()
+
+    # ---------------------------- STATE ----------------------------
+    def _load_state(self) -> Dict[str, Any]:
+        """artifacts of the nodes a previous attempt of this run finished"""
+        state_path = self.state_dir / STATE_FILE_NAME
+        if not state_path.exists():
+            return {}
+        completed = json.loads(state_path.read_text()).get("completed", {})
+        return {name: load_object(self.state_dir / f"{name}.pkl") for name in completed if name in self.nodes}
+
+    def _save_state(self, done: Dict[str, Any], timings: Dict[str, float], failed: Optional[str] = None) -> None:
+        with self.__lock:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_dir / (STATE_FILE_NAME + ".tmp")
+            tmp.write_text(json.dumps({"completed": {name: round(timings.get(name, 0.0), 3) for name in done},
+                                       "failed": failed, "updated": time.time()}, indent=2))
+            os.replace(tmp, self.state_dir / STATE_FILE_NAME)
+
+    # ---------------------------- PUBLIC API ----------------------------
+    def run(self) -> Dict[str, Any]:
+        """
+        run every node not finished yet
+        Returns:
+            dict: {node name: artifact} of all nodes
+        """
+        done = self._load_state()
+        if done:
+            logger.info(f"Resuming run {self.state_dir}: {sorted(done)} already completed")
+        timings: Dict[str, float] = {}
+        pending = [name for name in self.nodes if name not in done]
+        running: Dict[Future, str] = {}
+        started: Dict[str, float] = {}
+        cpus = memory = 0.0
+        error: Optional[BaseException] = None
+        failed: Optional[str] = None
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.nodes))) as executor:
+            try:
+                while pending or running:
+                    if error is None:
+                        for name in list(pending):
+                            node = self.nodes[name]
+                            if any(dep not in done for dep in self.inputs[name].values()):
+                                continue
+                            fits = cpus + node.cpus <= self.max_cpus and memory + node.memory_gb <= self.max_memory_gb
+                            if running and not fits:
+                                continue
+                            kwargs = {param: done[dep] for param, dep in self.inputs[name].items()}
+                            logger.info(f">>> DAG node {name} started ({node.cpus} cpu, {node.memory_gb} GB) <<<")
+                            running[executor.submit(node.fn, **kwargs)] = name
+                            started[name] = time.perf_counter()
+                            pending.remove(name)
+                            cpus, memory = cpus + node.cpus, memory + node.memory_gb
+                    if not running:
+                        if error is None and pending:
+                            raise RuntimeError(f"DAG nodes {pending} can never start, their inputs form a cycle")
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        node = self.nodes[name]
+                        cpus, memory = cpus - node.cpus, memory - node.memory_gb
+                        timings[name] = time.perf_counter() - started[name]
+                        try:
+                            artifact = future.result()
+                        except BaseException as e:
+                            logger.error(f"DAG node {name} failed after {timings[name]:.1f}s: {e}")
+                            error, failed = error or e, failed or name
+                            continue
+                        save_object(self.state_dir / f"{name}.pkl", artifact)
+                        done[name] = artifact
+                        self._save_state(done, timings)
+                        logger.info(f">>> DAG node {name} completed in {timings[name]:.1f}s <<<")
+            except KeyboardInterrupt as e:
+                # nodes already running cannot be stopped from here; they finish, unstarted ones stay pending
+                logger.warning(f"Interrupted, waiting for {sorted(running.values())}; resume with the same run dir")
+                error, failed = e, failed or "interrupted"
+                for future, name in running.items():
+                    try:
+                        done[name] = future.result()
+                        save_object(self.state_dir / f"{name}.pkl", done[name])
+                    except BaseException:
+                        pass
+        self._save_state(done, timings, failed)
+        if error is not None:
+            raise error  # stage errors already are NFLGameCompetitionException with their origin
+        return done
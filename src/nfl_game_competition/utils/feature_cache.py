@@ -0,0 +1,87 @@
+"""Play feature cache
+
+LRU cache of computed feature rows per play for the prediction path:
+- features only depend on the rows of their own play (lags per player, neighbours per frame),
+  so a play seen again skips compute_features entirely
+- keys carry a fingerprint of the play's input rows, a play sent again with more / other frames
+  is a miss, never a stale hit
+- the cache is bound to one transformation version; a different version (new promoted model)
+  clears it before use
+- bounded by number of plays and by bytes, least recently used plays go first
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+
+from src.nfl_game_competition.logger import get_logger
+
+logger = get_logger(name="nfl_game_competition.utils.feature_cache")
+
+
+class PlayFeatureCache:
+    def __init__(self, max_plays: int = 4096, max_bytes: int = 256 << 20):
+        """
+        Args:
+            max_plays (int): plays kept at most, 0 disables the cache
+            max_bytes (int): feature bytes kept at most
+        """
+        self.max_plays, self.max_bytes = int(max_plays), int(max_bytes)
+        self.__entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self.__bytes = 0
+        self.__version: Optional[Hashable] = None
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self.__lock = threading.Lock()
+
+    def bind(self, version: Hashable) -> None:
+        """use the cache for features of this transformation version, drop entries of any other"""
+        with self.__lock:
+            if version == self.__version:
+                return
+            if self.__entries:
+                logger.info(f"Feature cache invalidated: version {self.__version} -> {version}, "
+                            f"{len(self.__entries)} play(s) dropped")
+                self.__stats["invalidations"] += 1
+            self.__entries.clear()
+            self.__bytes = 0
+            self.__version = version
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self.__lock:
+            features = self.__entries.get(key)
+            if features is None:
+                self.__stats["misses"] += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__stats["hits"] += 1
+            return features
+
+    def put(self, key: Hashable, features: np.ndarray) -> None:
+        if self.max_plays <= 0 or features.nbytes > self.max_bytes:
+            return
+        features = np.array(features, copy=True)  # a slice would keep the whole batch block alive
+        features.setflags(write=False)  # shared between requests
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__bytes -= previous.nbytes
+            self.__entries[key] = features
+            self.__bytes += features.nbytes
+            while len(self.__entries) > self.max_plays or self.__bytes > self.max_bytes:
+                _, evicted = self.__entries.popitem(last=False)
+                self.__bytes -= evicted.nbytes
+                self.__stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["plays"], stats["bytes"] = len(self.__entries), self.__bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,302 @@
+"""Stage instrumentation
+
+Structured metrics of pipeline stages and their sub-steps instead of free-text log lines:
+- stage_metrics(stage, output_dir) wraps a whole stage and writes one json record (stage_metrics.json)
+  into the stage's artifact dir: wall / cpu seconds, peak rss, rows in / out, rows/sec and the same
+  numbers for every step(...) entered while it runs (download, extract, merge, split, ...)
+- step(name) nests under the innermost open span of the calling thread; outside a stage it only logs
+- record(rows_in=..., rows_out=..., **extra) sets counts of the innermost open span
+- rss is sampled by one background thread while spans are open (linux /proc), so a peak between two
+  log lines is not missed; it is the process rss, shared with stages running at the same time.
+  cpu seconds are process wide too; pool workers count once they exit (children cpu / max rss).
+- opt-in profile of a stage: "cprofile" (profile.prof + top functions in profile.txt) or "sample",
+  a stack sampler of the stage thread writing folded stacks (profile.folded, flamegraph input)
+"""
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.nfl_game_competition.logger import get_logger
+
+logger = get_logger(name="nfl_game_competition.utils.instrumentation")
+
+PROFILERS = ("cprofile", "sample")
+RSS_SAMPLE_INTERVAL_S = 0.05
+STACK_SAMPLE_INTERVAL_S = 0.005
+
+_current: contextvars.ContextVar = contextvars.ContextVar("nfl_instrumentation_span", default=None)
+
+
+def rss_mb() -> Optional[float]:
+    """current resident memory of this process, None where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _maxrss_mb(children: bool = False) -> Optional[float]:
+    """lifetime peak rss of this process / of its exited children"""
+    try:
+        import resource
+    except ImportError:  # windows
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024) / (1 << 20)
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+def _children_cpu_s() -> float:
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+class Span:
+    def __init__(self, name: str):
+        self.name = name
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self.extra: Dict[str, Any] = {}
+        self.steps: List["Span"] = []
+        self.error: Optional[str] = None
+        self.peak_rss_mb: Optional[float] = None
+        self.__wall = self.__cpu = self.__children_cpu = 0.0
+        self.__rss_start: Optional[float] = None
+        self.__rss_end: Optional[float] = None
+
+    def record(self, rows_in: Optional[int] = None, rows_out: Optional[int] = None, **extra: Any) -> "Span":
+        """set row counts (kept when None) and extra json-able values of this span"""
+        self.rows_in = int(rows_in) if rows_in is not None else self.rows_in
+        self.rows_out = int(rows_out) if rows_out is not None else self.rows_out
+        self.extra.update(extra)
+        return self
+
+    def _observe(self, rss: Optional[float]) -> None:
+        if rss is not None and (self.peak_rss_mb is None or rss > self.peak_rss_mb):
+            self.peak_rss_mb = rss
+
+    def _start(self) -> None:
+        self.__rss_start = rss_mb()
+        self._observe(self.__rss_start)
+        self.__children_cpu = _children_cpu_s()
+        self.__cpu, self.__wall = time.process_time(), time.perf_counter()
+
+    def _stop(self) -> None:
+        self.__wall = time.perf_counter() - self.__wall
+        self.__cpu = time.process_time() - self.__cpu + _children_cpu_s() - self.__children_cpu
+        self.__rss_end = rss_mb()
+        self._observe(self.__rss_end)
+        if self.__rss_start is None:
+            self.peak_rss_mb = _maxrss_mb()  # no sampling here: lifetime peak is the best bound
+
+    @property
+    def wall_s(self) -> float:
+        return self.__wall
+
+    def as_dict(self) -> Dict[str, Any]:
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        result = {"name": self.name, "wall_s": round(self.__wall, 4), "cpu_s": round(self.__cpu, 4),
+                  "peak_rss_mb": _round(self.peak_rss_mb), "rss_start_mb": _round(self.__rss_start),
+                  "rss_end_mb": _round(self.__rss_end),
+                  "rows_in": self.rows_in, "rows_out": self.rows_out,
+                  "rows_per_s": round(rows / self.__wall, 1) if rows is not None and self.__wall > 0 else None}
+        if self.error is not None:
+            result["error"] = self.error
+        result.update(self.extra)
+        if self.steps:
+            result["steps"] = [s.as_dict() for s in self.steps]
+        return result
+
+
+class _RssSampler:
+    """one daemon thread updating the peak rss of every open span; runs only while spans are open"""
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.__spans: List[Span] = []
+        self.__lock = threading.Lock()
+        self.__thread: Optional[threading.Thread] = None
+
+    def add(self, span: Span) -> None:
+        with self.__lock:
+            self.__spans.append(span)
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self._loop, name="rss-sampler", daemon=True)
+                self.__thread.start()
+
+    def remove(self, span: Span) -> None:
+        with self.__lock:
+            self.__spans.remove(span)
+
+    def _loop(self) -> None:
+        while True:
+            rss = rss_mb()
+            with self.__lock:
+                if not self.__spans or rss is None:
+                    self.__thread = None
+                    return
+                for span in self.__spans:
+                    span._observe(rss)
+            time.sleep(self.interval)
+
+
+_sampler = _RssSampler(RSS_SAMPLE_INTERVAL_S)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def record(rows_in: Optional[int] = None, rows_out: Optional[int] = None, **extra: Any) -> None:
+    """row counts / extra values of the innermost open span of this thread; no-op outside a span"""
+    span = _current.get()
+    if span is not None:
+        span.record(rows_in, rows_out, **extra)
+
+
+@contextmanager
+def step(name: str, rows_in: Optional[int] = None) -> Iterator[Span]:
+    """time a sub-step; nested under the open span of this thread, if there is one"""
+    parent = _current.get()
+    span = Span(name).record(rows_in=rows_in)
+    if parent is not None:
+        parent.steps.append(span)
+    token = _current.set(span)
+    _sampler.add(span)
+    span._start()
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span._stop()
+        _sampler.remove(span)
+        _current.reset(token)
+        if parent is not None:
+            parent._observe(span.peak_rss_mb)
+        rows = f", rows {span.rows_out if span.rows_out is not None else span.rows_in}" \
+            if span.rows_in is not None or span.rows_out is not None else ""
+        logger.info(f"[metrics] {name}: {span.wall_s:.2f}s, peak rss "
+                    f"{'n/a' if span.peak_rss_mb is None else f'{span.peak_rss_mb:.0f} MB'}{rows}")
+
+
+# ---------------------------- PROFILERS ----------------------------
+class _StackSampler:
+    """samples the python stack of one thread at a fixed interval, counted as folded stacks"""
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id, self.interval = thread_id, interval
+        self.stacks: Counter = Counter()
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self._loop, name="stack-sampler", daemon=True)
+
+    def _loop(self) -> None:
+        while not self.__stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stop.set()
+        self.__thread.join()
+
+    def write(self, path: Path) -> None:
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+
+
+@contextmanager
+def _profile(profiler: Optional[str], output_dir: Path) -> Iterator[None]:
+    if profiler is None:
+        yield
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(f"profiler must be one of {PROFILERS}, got {profiler}")
+    if profiler == "cprofile":
+        import cProfile
+        import pstats
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            output_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(str(output_dir / "profile.prof"))
+            with open(output_dir / "profile.txt", "w") as report:
+                pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(40)
+            logger.info(f"cProfile of the stage written to {output_dir / 'profile.prof'}")
+    else:
+        sampler = _StackSampler(threading.get_ident(), STACK_SAMPLE_INTERVAL_S)
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            output_dir.mkdir(parents=True, exist_ok=True)
+            sampler.write(output_dir / "profile.folded")
+            logger.info(f"Stack samples of the stage ({sum(sampler.stacks.values())}) written to "
+                        f"{output_dir / 'profile.folded'}")
+
+
+# ---------------------------- PUBLIC API ----------------------------
+@contextmanager
+def stage_metrics(stage: str, output_dir: str, file_name: str = "stage_metrics.json",
+                  profiler: Optional[str] = None) -> Iterator[Span]:
+    """
+    instrument one pipeline stage; the json record is written to output_dir/file_name when the
+    stage ends, failed stages included (with their error)
+    Args:
+        stage (str): stage name, the root span of the record
+        output_dir (str): artifact dir of the stage
+        profiler (str): None, "cprofile" or "sample"
+    """
+    output_dir = Path(output_dir)
+    span: Optional[Span] = None
+    try:
+        with _profile(profiler, output_dir), step(stage) as span:
+            yield span
+    finally:
+        if span is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            content = {"stage": stage, "finished": time.time(), "pid": os.getpid(),
+                       "children_peak_rss_mb": _round(_maxrss_mb(children=True)), "profiler": profiler,
+                       **span.as_dict()}
+            tmp = output_dir / (file_name + ".tmp")
+            tmp.write_text(json.dumps(content, indent=2, default=str))
+            os.replace(tmp, output_dir / file_name)
+
+
+def summarize(records: List[Dict[str, Any]], top_steps: int = 5) -> Dict[str, Any]:
+    """run level view of stage records: stages by wall time with their slowest steps"""
+    def flatten(record: Dict[str, Any], prefix: str = "") -> Iterator[Dict[str, Any]]:
+        for sub in record.get("steps", []):
+            name = f"{prefix}{sub['name']}"
+            yield {"step": name, "wall_s": sub["wall_s"], "peak_rss_mb": sub["peak_rss_mb"],
+                   "rows_per_s": sub["rows_per_s"]}
+            yield from flatten(sub, name + "/")
+
+    stages = sorted(records, key=lambda r: r.get("wall_s", 0.0), reverse=True)
+    return {"wall_s": round(sum(r.get("wall_s", 0.0) for r in records), 4),
+            "peak_rss_mb": max((r["peak_rss_mb"] for r in records if r.get("peak_rss_mb") is not None), default=None),
+            "stages": [{key: r.get(key) for key in ("stage", "wall_s", "cpu_s", "peak_rss_mb", "rows_in",
+                                                     "rows_out", "rows_per_s", "stage_cache", "error")}
+                       | {"slowest_steps": sorted(flatten(r), key=lambda s: s["wall_s"], reverse=True)[:top_steps]}
+                       for r in stages]}
@@ -0,0 +1,139 @@
+"""Ingestion manifest
+
+Keeps content hash, size and mtime of every source file and derived feature store partition
+in one json file, so data ingestion can redo only the weeks whose inputs changed.
+Week entries are keyed on the (season, week) partition key of the feature store.
+A file is only re-hashed when its size, mtime or ctime moved since it was recorded.
+"""
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+
+logger = get_logger(name="nfl_game_competition.utils.manifest")
+
+HASH_CHUNK_SIZE: int = 1 << 20  # 1 MB read blocks while hashing
+
+
+def file_sha256(path: Path | str) -> str:
+    """sha256 hex digest of a file, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _week_key(week: Tuple[int, int]) -> str:
+    """json key of a (season, week) partition, e.g. (2023, 5) -> "2023/5" """
+    return "/".join(str(int(k)) for k in week)
+
+
+class IngestionManifest:
+    def __init__(self, path: Path | str):
+        try:
+            self.path = Path(path)
+            self.__content: Dict[str, Any] = {"files": {}, "weeks": {}}
+            if self.path.exists():
+                with open(self.path) as f:
+                    self.__content.update(json.load(f))
+                logger.info(f"Ingestion manifest loaded: {self.path} "
+                            f"(files={len(self.__content['files'])}, weeks={len(self.__content['weeks'])})")
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    # ---------------------------- FILE ENTRIES ----------------------------
+    def recorded_hash(self, path: Path | str) -> Optional[str]:
+        """
+        recorded hash of a file whose size, mtime and ctime did not move since it was recorded.
+        ctime cannot be set back like mtime, so a rewrite that restores size and mtime is still seen;
+        entries written before ctime was recorded are matched on size and mtime only.
+        """
+        recorded = self.__content["files"].get(str(Path(path)))
+        if recorded is None:
+            return None
+        stat = os.stat(path)
+        unchanged = (recorded["size"] == stat.st_size and recorded["mtime"] == stat.st_mtime
+                     and recorded.get("ctime", stat.st_ctime_ns) == stat.st_ctime_ns)
+        return recorded["hash"] if unchanged else None
+
+    def file_state(self, path: Path | str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """
+        current {hash, size, mtime, ctime} of a file. The recorded hash is reused while the file is
+        unchanged (see recorded_hash); content_hash (e.g. a zip member crc) skips hashing altogether.
+        """
+        stat = os.stat(path)
+        if content_hash is None:
+            content_hash = self.recorded_hash(path) or f"sha256:{file_sha256(path)}"
+        return {"hash": content_hash, "size": stat.st_size, "mtime": stat.st_mtime, "ctime": stat.st_ctime_ns}
+
+    def files(self) -> List[str]:
+        return list(self.__content["files"])
+
+    def get_file(self, path: Path | str) -> Optional[Dict[str, Any]]:
+        return self.__content["files"].get(str(Path(path)))
+
+    def record_file(self, path: Path | str, state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        state = state or self.file_state(path)
+        self.__content["files"][str(Path(path))] = state
+        return state
+
+    def forget_file(self, path: Path | str) -> None:
+        self.__content["files"].pop(str(Path(path)), None)
+
+    def is_file_unchanged(self, path: Path | str) -> bool:
+        """True if the file exists and its content matches the recorded entry"""
+        recorded = self.get_file(path)
+        if recorded is None or not os.path.exists(path):
+            return False
+        return self.file_state(path)["hash"] == recorded["hash"]
+
+    # ---------------------------- WEEK ENTRIES ----------------------------
+    def get_week(self, week: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        return self.__content["weeks"].get(_week_key(week))
+
+    def weeks(self) -> List[Tuple[int, ...]]:
+        """
+        recorded (season, week) keys. Entries of the week-only layout come back as 1-tuples, so they
+        match no source week and data ingestion drops their partitions.
+        """
+        return sorted(tuple(int(k) for k in key.split("/")) for key in self.__content["weeks"])
+
+    def record_week(self, week: Tuple[int, int], sources: Dict[str, str], partition_files: List[str],
+                    rows: int, dtypes: list) -> None:
+        """sources: {source path: hash}; partition files are hashed and recorded as file entries"""
+        for file_path in partition_files:
+            self.record_file(file_path)
+        self.__content["weeks"][_week_key(week)] = {"sources": sources,
+                                              "partition_files": [str(Path(p)) for p in partition_files],
+                                              "rows": int(rows),
+                                              "dtypes": [list(d) for d in dtypes]}
+
+    def forget_week(self, week: Tuple[int, ...]) -> None:
+        entry = self.__content["weeks"].pop(_week_key(week), None)
+        for file_path in (entry or {}).get("partition_files", []):
+            self.forget_file(file_path)
+
+    def is_week_unchanged(self, week: Tuple[int, int], sources: Dict[str, str]) -> bool:
+        """True if the week was merged from the same source hashes and its partition is intact"""
+        entry = self.get_week(week)
+        if entry is None or entry["sources"] != sources:
+            return False
+        return all(self.is_file_unchanged(p) for p in entry["partition_files"])
+
+    # ---------------------------- PERSISTENCE ----------------------------
+    def save(self) -> None:
+        """atomic write (tmp file + replace) so an interrupted run never leaves a broken manifest"""
+        try:
+            os.makedirs(self.path.parent, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self.__content, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
@@ -0,0 +1,131 @@
+"""Micro-batching
+
+Collects concurrent single requests into batches for one vectorized predict call:
+- a batch is flushed when it reaches max_batch_size or when max_wait_ms passed since its first item
+- submit() never blocks: with max_queue_depth items already waiting it raises QueueFullError,
+  so callers can shed load (HTTP 503) instead of queueing without bound
+- one worker thread runs the batch function; each caller waits on its own Future
+- items with an `enqueued_at` attribute get the time.perf_counter() of submit(), so the latency
+  reported downstream includes the queue wait the batching adds
+- when a batch fails, its items are run one by one, so one bad item does not fail the others
+"""
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from src.nfl_game_competition.logger import get_logger
+
+logger = get_logger(name="nfl_game_competition.utils.micro_batcher")
+
+
+class QueueFullError(RuntimeError):
+    """raised by MicroBatcher.submit when max_queue_depth requests are already waiting"""
+
+
+class MicroBatcher:
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, max_queue_depth: int = 256):
+        """
+        Args:
+            batch_fn: called with a list of items, returns one result per item in the same order
+            max_batch_size (int): flush once this many items are collected
+            max_wait_ms (float): flush at most this long after the first item of a batch arrived
+            max_queue_depth (int): items allowed to wait before submit() rejects
+        """
+        self.__batch_fn = batch_fn
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = float(max_wait_ms) / 1000.0
+        self.__queue: queue.Queue = queue.Queue(maxsize=int(max_queue_depth))
+        self.__stats = {"batches": 0, "items": 0, "rejected": 0, "failed_batches": 0, "failed_items": 0,
+                        "flush_on_size": 0, "flush_on_deadline": 0}
+        self.__stats_lock = threading.Lock()
+        self.__closed = threading.Event()
+        self.__worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self.__worker.start()
+
+    # ---------------------------- PRIVATE INTERNAL STEPS ----------------------------
+    def _collect(self) -> List[tuple]:
+        """block for the first item, then gather until the batch is full or its deadline passed"""
+        try:
+            batch = [self.__queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.__queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_one_by_one(self, items: List[Any], futures: List[Future], error: Exception) -> int:
+        """
+        after a failed batch, every item runs on its own so only the bad ones fail.
+        Returns:
+            int: items that failed on their own
+        """
+        if len(items) == 1:
+            futures[0].set_exception(error)
+            return 1
+        failed = 0
+        for item, future in zip(items, futures):
+            try:
+                future.set_result(self.__batch_fn([item])[0])
+            except Exception as e:
+                future.set_exception(e)
+                failed += 1
+        return failed
+
+    def _run(self) -> None:
+        while not (self.__closed.is_set() and self.__queue.empty()):
+            batch = self._collect()
+            if not batch:
+                continue
+            items, futures = [item for item, _ in batch], [future for _, future in batch]
+            try:
+                results = self.__batch_fn(items)
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+                failed_batches, failed_items = 0, 0
+            except Exception as e:
+                logger.error(f"Micro-batch of {len(items)} failed: {e}")
+                failed_batches, failed_items = 1, self._run_one_by_one(items, futures, e)
+            with self.__stats_lock:
+                self.__stats["batches"] += 1
+                self.__stats["items"] += len(items)
+                self.__stats["failed_batches"] += failed_batches
+                self.__stats["failed_items"] += failed_items
+                self.__stats["flush_on_size" if len(items) >= self.max_batch_size else "flush_on_deadline"] += 1
+
+    # ---------------------------- PUBLIC API ----------------------------
+    def submit(self, item: Any) -> Future:
+        """queue one item; the returned future resolves with its result once its batch ran"""
+        if self.__closed.is_set():
+            raise RuntimeError("micro-batcher is closed")
+        future: Future = Future()
+        if hasattr(item, "enqueued_at"):
+            item.enqueued_at = time.perf_counter()
+        try:
+            self.__queue.put_nowait((item, future))
+        except queue.Full:
+            with self.__stats_lock:
+                self.__stats["rejected"] += 1
+            raise QueueFullError(f"{self.__queue.maxsize} requests already waiting")
+        return future
+
+    def stats(self) -> Dict[str, float]:
+        with self.__stats_lock:
+            stats = dict(self.__stats)
+        stats["queue_depth"] = self.__queue.qsize()
+        stats["mean_batch_size"] = stats["items"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """stop accepting items, finish the queued ones"""
+        self.__closed.set()
+        self.__worker.join(timeout=timeout)
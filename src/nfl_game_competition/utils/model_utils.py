@@ -0,0 +1,127 @@
+"""Model helpers
+
+Incremental (partial_fit) regressors trained batch by batch from utils.batch_stream, and the
+streaming metric used to score them. Models predict the displacement of (target_x, target_y)
+from the current (x, y) in play direction normalized coordinates; predict() adds the anchor back.
+"""
+import sys
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+
+
+def build_incremental_estimator(name: str, params: Optional[dict] = None, random_state: Optional[int] = None):
+    """
+    partial_fit estimator for 2 targets by name (params.yaml model_trainer.estimator)
+    - sgd: one SGDRegressor per target
+    - mlp: mini-batch MLPRegressor, multi output natively
+    """
+    # sklearn is imported when a model is built (or unpickled), not when the module is imported
+    from sklearn.linear_model import SGDRegressor
+    from sklearn.multioutput import MultiOutputRegressor
+    from sklearn.neural_network import MLPRegressor
+
+    params = dict(params or {})
+    if name == "sgd":
+        return MultiOutputRegressor(SGDRegressor(random_state=random_state, **params))
+    if name == "mlp":
+        if "hidden_layer_sizes" in params:
+            params["hidden_layer_sizes"] = tuple(params["hidden_layer_sizes"])
+        return MLPRegressor(random_state=random_state, **params)
+    raise ValueError(f"unknown incremental estimator: {name}, expected one of ['sgd', 'mlp']")
+
+
+class IncrementalRegressor:
+    def __init__(self, estimator, feature_names: Sequence[str], anchor_cols: Sequence[str] = ("x", "y")):
+        """
+        Args:
+            estimator: unfitted partial_fit estimator, see build_incremental_estimator
+            feature_names (list): columns of the feature block, from the transformation state
+            anchor_cols (list): feature columns the predicted displacement is added to
+        """
+        self.estimator = estimator
+        from sklearn.preprocessing import StandardScaler
+        self.scaler = StandardScaler()
+        self.feature_names: List[str] = list(feature_names)
+        self.anchor_idx: List[int] = [self.feature_names.index(c) for c in anchor_cols]
+        self.rows_seen: int = 0
+
+    def _anchor(self, X: np.ndarray) -> np.ndarray:
+        return X[:, self.anchor_idx]
+
+    def partial_fit_scaler(self, X: np.ndarray) -> "IncrementalRegressor":
+        """first pass over the stream: running mean / variance of the features"""
+        self.scaler.partial_fit(X)
+        return self
+
+    def partial_fit(self, X: np.ndarray, Y: np.ndarray) -> "IncrementalRegressor":
+        self.estimator.partial_fit(self.scaler.transform(X), Y - self._anchor(X))
+        self.rows_seen += len(X)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """(n_rows, 2) float32 predicted target_x / target_y"""
+        X = np.asarray(X, dtype=np.float32)
+        return (self.estimator.predict(self.scaler.transform(X)) + self._anchor(X)).astype(np.float32)
+
+    def fresh_copy(self) -> "IncrementalRegressor":
+        """unfitted copy with the same estimator params, used per fold / per trial"""
+        from sklearn.base import clone
+        return IncrementalRegressor(clone(self.estimator), self.feature_names,
+                                    [self.feature_names[i] for i in self.anchor_idx])
+
+
+class StreamingRMSE:
+    """competition RMSE, sqrt(mean((pred - true)^2)) over target_x and target_y, accumulated per batch"""
+    def __init__(self):
+        self.squared_error: float = 0.0
+        self.rows: int = 0
+
+    def update(self, Y_pred: np.ndarray, Y_true: np.ndarray) -> None:
+        diff = np.asarray(Y_pred, dtype=np.float64) - np.asarray(Y_true, dtype=np.float64)
+        self.squared_error += float(np.einsum("ij,ij->", diff, diff))
+        self.rows += len(diff)
+
+    @property
+    def value(self) -> float:
+        return float(np.sqrt(self.squared_error / (2 * self.rows))) if self.rows else float("nan")
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"rmse": self.value, "rows": self.rows}
+
+
+def fit_incremental(model: IncrementalRegressor, stream, epochs: int = 1, seed: Optional[int] = None,
+                    max_rows: Optional[int] = None, fit_scaler: bool = True,
+                    subset_seed: Optional[int] = None) -> IncrementalRegressor:
+    """
+    scaler pass (optional) then `epochs` shuffled passes of partial_fit over a MiniBatchStream.
+    max_rows limits training to a subset of whole batches, drawn once with subset_seed (default
+    seed) and reused by the scaler pass and every epoch; models fitted with the same subset_seed
+    see the same rows whatever their own seed.
+    """
+    try:
+        if max_rows is not None:
+            stream = stream.subset(max_rows, seed=seed if subset_seed is None else subset_seed)
+        if fit_scaler:
+            for X, _ in stream.batches(shuffle=True, seed=seed):
+                model.partial_fit_scaler(X)
+        for epoch in range(epochs):
+            epoch_seed = None if seed is None else seed + epoch + 1
+            for X, Y in stream.batches(shuffle=True, seed=epoch_seed):
+                model.partial_fit(X, Y)
+        return model
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
+
+
+def score_incremental(model: IncrementalRegressor, stream, max_rows: Optional[int] = None) -> StreamingRMSE:
+    """streaming RMSE of a fitted model over a MiniBatchStream"""
+    try:
+        metric = StreamingRMSE()
+        for X, Y in stream.batches(shuffle=False, max_rows=max_rows):
+            metric.update(model.predict(X), Y)
+        return metric
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
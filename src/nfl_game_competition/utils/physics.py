@@ -0,0 +1,81 @@
+"""Physics baseline kernel
+
+Closed form extrapolation of player positions, evaluated for any number of (player, horizon)
+pairs in one set of numpy expressions:
+- cv: constant velocity along the current heading
+- ca: constant signed tangential acceleration, speed clamped to [0, max_speed]
+  (the tracking column `a` is a magnitude; pass the signed speed change per second instead)
+- optional steering: the heading turns towards (ball_land_x, ball_land_y), the blend weight grows
+  linearly with time (steer = share of the turn per second) and the travelled distance is laid
+  along the blended heading
+- optional clipping to the field box
+Works in raw or play direction normalized coordinates (the field box is symmetric under the mirror).
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.nfl_game_competition.constants.training_pipeline_constants import FIELD_LENGTH, FIELD_WIDTH
+
+FRAME_DT: float = 0.1       # seconds per tracking frame (10 Hz)
+MAX_SPEED: float = 12.0     # yards / second, above any recorded player speed
+MODES: Tuple[str, ...] = ("cv", "ca")
+
+
+def travel_distance(speed: np.ndarray, accel: np.ndarray, t: np.ndarray, max_speed: float = MAX_SPEED) -> np.ndarray:
+    """
+    distance covered after t seconds with speed(t) = clip(speed + accel * t, 0, max_speed).
+    Piecewise closed form: quadratic until the speed hits 0 or max_speed, then constant speed.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_limit = np.where(accel > 0, (max_speed - speed) / accel, np.where(accel < 0, speed / -accel, np.inf))
+    t_limit = np.maximum(t_limit, 0.0)
+    t_quad = np.minimum(t, t_limit)
+    end_speed = np.clip(speed + accel * t_quad, 0.0, max_speed)
+    return speed * t_quad + 0.5 * accel * t_quad * t_quad + end_speed * np.maximum(t - t_limit, 0.0)
+
+
+def extrapolate(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray, t: np.ndarray,
+                accel: Optional[np.ndarray] = None, ball_x: Optional[np.ndarray] = None,
+                ball_y: Optional[np.ndarray] = None, mode: str = "cv", steer: float = 0.0,
+                clip: bool = True, max_speed: float = MAX_SPEED) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    positions t seconds ahead; every argument broadcasts, so (players,) states with (players, H)
+    horizons give whole trajectories and per-row horizons give one position per row.
+    Args:
+        vx, vy (np.ndarray): velocity components (yards / second)
+        t (np.ndarray): horizon in seconds (frames * FRAME_DT)
+        accel (np.ndarray): signed tangential acceleration, used by mode "ca"
+        ball_x, ball_y (np.ndarray): steering target, used when steer > 0
+        mode (str): "cv" or "ca"
+        steer (float): heading share turned towards the ball per second, 0 disables steering
+    Returns:
+        tuple: (x, y) float32 arrays of the broadcast shape
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown physics mode: {mode}, expected one of {list(MODES)}")
+    x, y, vx, vy, t = (np.asarray(v, dtype=np.float32) for v in (x, y, vx, vy, t))
+    speed = np.hypot(vx, vy)
+    safe_speed = np.where(speed > 0, speed, 1.0)
+    ux, uy = vx / safe_speed, vy / safe_speed
+
+    if mode == "ca" and accel is not None:
+        distance = travel_distance(speed, np.asarray(accel, dtype=np.float32), t, max_speed)
+    else:
+        distance = np.minimum(speed, max_speed) * t
+
+    if steer > 0 and ball_x is not None and ball_y is not None:
+        to_ball_x, to_ball_y = np.asarray(ball_x, dtype=np.float32) - x, np.asarray(ball_y, dtype=np.float32) - y
+        ball_dist = np.hypot(to_ball_x, to_ball_y)
+        safe_ball = np.where(ball_dist > 0, ball_dist, 1.0)
+        weight = np.clip(steer * t, 0.0, 1.0)
+        hx = (1.0 - weight) * ux + weight * to_ball_x / safe_ball
+        hy = (1.0 - weight) * uy + weight * to_ball_y / safe_ball
+        norm = np.hypot(hx, hy)
+        safe_norm = np.where(norm > 0, norm, 1.0)
+        ux, uy = hx / safe_norm, hy / safe_norm
+
+    px, py = x + distance * ux, y + distance * uy
+    if clip:
+        px, py = np.clip(px, 0.0, FIELD_LENGTH), np.clip(py, 0.0, FIELD_WIDTH)
+    return px.astype(np.float32, copy=False), py.astype(np.float32, copy=False)
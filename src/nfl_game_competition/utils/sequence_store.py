@@ -0,0 +1,131 @@
+"""Ragged sequence store
+
+Per player (game_id, play_id, nfl_id) input histories and target trajectories in CSR layout:
+- inputs are the rows of the transformed features.npy block (already contiguous per player,
+  so they are referenced, not copied) sliced by seq_input_offsets.npy
+- targets are the first num_frames_output target rows of every player, packed into
+  seq_targets.npy and sliced by seq_target_offsets.npy
+- seq_keys.npy holds the (game_id, play_id, nfl_id) of every sequence, sorted
+Everything is opened memory mapped, so a sequence is an O(1) zero-copy slice.
+"""
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.utils.common import play_keys
+
+logger = get_logger(name="nfl_game_competition.utils.sequence_store")
+
+INPUT_OFFSETS_FILE_NAME: str = "seq_input_offsets.npy"
+TARGET_OFFSETS_FILE_NAME: str = "seq_target_offsets.npy"
+TARGETS_FILE_NAME: str = "seq_targets.npy"
+KEYS_FILE_NAME: str = "seq_keys.npy"
+
+
+def build_sequence_store(split_dir: Path | str, num_frames_output: np.ndarray, features_file_name: str = "features.npy",
+                         targets_file_name: str = "targets.npy", keys_file_name: str = "keys.npy") -> int:
+    """write the CSR index of one transformed split dir
+    Args:
+        split_dir (Path): transformed split dir holding features / targets / keys blocks sorted by key
+        num_frames_output (np.ndarray): num_frames_output of every row of the split
+    Returns:
+        int: number of sequences
+    """
+    try:
+        split_dir = Path(split_dir)
+        keys = np.load(split_dir / keys_file_name, mmap_mode="r")
+        targets = np.load(split_dir / targets_file_name, mmap_mode="r")
+        game_id, play_id, nfl_id = (np.asarray(keys[:, j]) for j in range(3))
+        n_rows = len(game_id)
+
+        new_block = np.ones(n_rows, dtype=bool)
+        new_block[1:] = (game_id[1:] != game_id[:-1]) | (play_id[1:] != play_id[:-1]) | (nfl_id[1:] != nfl_id[:-1])
+        starts = np.flatnonzero(new_block)
+        input_offsets = np.append(starts, n_rows).astype(np.int64)
+        lengths = np.diff(input_offsets)
+
+        # target trajectory = first num_frames_output rows of each block
+        block_id = np.cumsum(new_block) - 1
+        position = np.arange(n_rows) - starts[block_id]
+        keep = position < np.asarray(num_frames_output)[starts][block_id]
+        target_lengths = np.minimum(lengths, np.asarray(num_frames_output)[starts])
+        target_offsets = np.concatenate([[0], np.cumsum(target_lengths)]).astype(np.int64)
+
+        np.save(split_dir / INPUT_OFFSETS_FILE_NAME, input_offsets)
+        np.save(split_dir / TARGET_OFFSETS_FILE_NAME, target_offsets)
+        np.save(split_dir / TARGETS_FILE_NAME, np.ascontiguousarray(targets[keep], dtype=np.float32))
+        np.save(split_dir / KEYS_FILE_NAME, np.column_stack([game_id[starts], play_id[starts], nfl_id[starts]]))
+        logger.info(f"Sequence store written: {split_dir} (sequences={len(starts)}, rows={n_rows})")
+        return len(starts)
+    except Exception as e:
+        raise NFLGameCompetitionException(e, sys) from e
+
+
+class SequenceStore:
+    def __init__(self, split_dir: Path | str, features_file_name: str = "features.npy"):
+        try:
+            split_dir = Path(split_dir)
+            self.inputs = np.load(split_dir / features_file_name, mmap_mode="r")
+            self.targets = np.load(split_dir / TARGETS_FILE_NAME, mmap_mode="r")
+            self.input_offsets = np.load(split_dir / INPUT_OFFSETS_FILE_NAME)
+            self.target_offsets = np.load(split_dir / TARGET_OFFSETS_FILE_NAME)
+            self.keys = np.load(split_dir / KEYS_FILE_NAME)
+            self.__play_keys = play_keys(self.keys[:, 0], self.keys[:, 1])
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(input history (frames, n_features), target trajectory (frames, 2)) as memmap views"""
+        return (self.inputs[self.input_offsets[i]:self.input_offsets[i + 1]],
+                self.targets[self.target_offsets[i]:self.target_offsets[i + 1]])
+
+    @property
+    def input_lengths(self) -> np.ndarray:
+        return np.diff(self.input_offsets)
+
+    @property
+    def target_lengths(self) -> np.ndarray:
+        return np.diff(self.target_offsets)
+
+    def find(self, game_id: int, play_id: int, nfl_id: Optional[int] = None) -> np.ndarray:
+        """sequence indices of a play (or one player of it) by binary search over the sorted keys"""
+        key = play_keys(game_id, play_id)
+        lo, hi = np.searchsorted(self.__play_keys, key, side="left"), np.searchsorted(self.__play_keys, key, side="right")
+        if nfl_id is None:
+            return np.arange(lo, hi)
+        pos = lo + np.searchsorted(self.keys[lo:hi, 2], nfl_id)
+        return np.arange(pos, pos + 1) if pos < hi and self.keys[pos, 2] == nfl_id else np.arange(0)
+
+    def padded_batch(self, indices: np.ndarray, max_input_len: Optional[int] = None,
+                     max_target_len: Optional[int] = None, pad_value: float = 0.0
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """dense batch of sequences built with one gather per array
+        Args:
+            indices (np.ndarray): sequence indices
+            max_input_len (int): keep the most recent frames of each history, default longest in batch
+            max_target_len (int): keep the first frames of each trajectory, default longest in batch
+        Returns:
+            tuple: inputs (B, T, F) pre-padded, input mask (B, T), targets (B, H, 2) post-padded, target mask (B, H)
+        """
+        indices = np.asarray(indices)
+        in_start, in_end = self.input_offsets[indices], self.input_offsets[indices + 1]
+        t_start, t_end = self.target_offsets[indices], self.target_offsets[indices + 1]
+        T = int(max_input_len or (in_end - in_start).max(initial=0))
+        H = int(max_target_len or (t_end - t_start).max(initial=0))
+
+        # inputs right aligned: last frame of every history sits at position T-1
+        in_idx = in_end[:, None] - T + np.arange(T)[None, :]
+        in_mask = in_idx >= in_start[:, None]
+        inputs = np.where(in_mask[..., None], self.inputs[np.where(in_mask, in_idx, 0)], pad_value).astype(np.float32)
+
+        t_idx = t_start[:, None] + np.arange(H)[None, :]
+        t_mask = t_idx < t_end[:, None]
+        targets = np.where(t_mask[..., None], self.targets[np.where(t_mask, t_idx, 0)], pad_value).astype(np.float32)
+        return inputs, in_mask, targets, t_mask
@@ -0,0 +1,254 @@
+"""Stage cache
+
+Content addressed memoization of TrainingPipeline stages:
+- key = sha256 of the stage name, its config (run dir replaced by a placeholder), the source of the
+  stage module and every package module it imports, and the fingerprints of its inputs
+- inputs are artifact entities of upstream stages or plain paths; a path is fingerprinted by the
+  relative name and content hash of every file below it. Hashes already in the ingestion manifest
+  (raw files, feature store partitions) are reused, other files are hashed once and kept in the
+  cache's own hash manifest; as in the ingestion manifest, a recorded hash is reused while the size,
+  mtime and ctime of the file are unchanged, so a rerun only reads files that were rewritten
+- a stored entry holds the stage output dir (hard linked when possible, copied otherwise) and the
+  artifact entity with its paths moved into the entry; a hit hands that artifact back, so the
+  fingerprints seen by the next stage are the same as on the run that stored it
+- entries not used for max_age_days go first, then least recently used ones until the cache fits max_bytes
+"""
+import os
+import sys
+import ast
+import json
+import time
+import shutil
+import hashlib
+import threading
+import dataclasses
+import importlib.util
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.nfl_game_competition.logger import get_logger
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.utils.common import load_object, save_object
+from src.nfl_game_competition.utils.manifest import IngestionManifest, file_sha256
+
+logger = get_logger(name="nfl_game_competition.utils.stage_cache")
+
+PACKAGE = "src.nfl_game_competition"
+ARTIFACT_FILE_NAME = "artifact.pkl"
+META_FILE_NAME = "meta.json"
+HASHES_FILE_NAME = "file_hashes.json"
+
+FileHash = Callable[[Path], str]
+
+
+def _sha256(path: Path) -> str:
+    return f"sha256:{file_sha256(path)}"
+
+
+def fingerprint_path(path: str, file_hash: FileHash = _sha256) -> str:
+    """(relative name, content hash) of every file below path; 'missing' when it does not exist"""
+    path = Path(path)
+    if not path.exists():
+        return "missing"
+    files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+    digest = hashlib.sha256()
+    for file_path in files:
+        digest.update(f"{file_path.relative_to(path) if file_path != path else ''}|{file_hash(file_path)}\n".encode())
+    return digest.hexdigest()
+
+
+def fingerprint_value(value: Any, file_hash: FileHash = _sha256) -> Any:
+    """json-able fingerprint of an artifact entity / path / plain value"""
+    if dataclasses.is_dataclass(value):
+        return {f.name: fingerprint_value(getattr(value, f.name), file_hash) for f in dataclasses.fields(value)}
+    if isinstance(value, (list, tuple)):
+        return [fingerprint_value(v, file_hash) for v in value]
+    if isinstance(value, dict):
+        return {str(k): fingerprint_value(v, file_hash) for k, v in value.items()}
+    if isinstance(value, (str, Path)) and os.path.exists(value):
+        return fingerprint_path(str(value), file_hash)
+    return repr(value)
+
+
+def module_closure(module_name: str) -> List[str]:
+    """source files of a package module and every package module it imports, directly or not"""
+    seen, files, pending = set(), [], [module_name]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+            continue
+        files.append(spec.origin)
+        for node in ast.walk(ast.parse(Path(spec.origin).read_text())):
+            names = ([alias.name for alias in node.names] if isinstance(node, ast.Import) else
+                     [node.module] if isinstance(node, ast.ImportFrom) and node.module else [])
+            pending.extend(n for n in names if n.startswith(PACKAGE))
+    return sorted(files)
+
+
+def code_version(module_name: str) -> str:
+    """hash of the source of a stage module and its package imports; edits elsewhere do not count"""
+    digest = hashlib.sha256()
+    for file_path in module_closure(module_name):
+        digest.update(Path(file_path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _replace_paths(value: Any, source: str, target: str) -> Any:
+    """copy of an artifact entity with every path below source moved below target"""
+    if dataclasses.is_dataclass(value):
+        return dataclasses.replace(value, **{f.name: _replace_paths(getattr(value, f.name), source, target)
+                                             for f in dataclasses.fields(value)})
+    if isinstance(value, list):
+        return [_replace_paths(v, source, target) for v in value]
+    if isinstance(value, str) and (value == source or value.startswith(source + os.sep)):
+        return target + value[len(source):]
+    return value
+
+
+def _existing_paths(value: Any) -> Iterable[str]:
+    """paths held by an artifact entity that exist on disk"""
+    if dataclasses.is_dataclass(value):
+        for f in dataclasses.fields(value):
+            yield from _existing_paths(getattr(value, f.name))
+    elif isinstance(value, str) and os.path.exists(value):
+        yield value
+
+
+class StageCache:
+    def __init__(self, root: str, max_bytes: int, max_age_days: float, run_dir: str,
+                 ingestion_manifest_path: Optional[str] = None):
+        """
+        Args:
+            root (str): cache dir shared by all runs
+            max_bytes (int): total size the cache is trimmed to after every store
+            max_age_days (float): entries unused for longer are evicted
+            run_dir (str): artifact dir of the current run, normalized out of config values
+            ingestion_manifest_path (str): manifest whose file hashes are reused for input files
+        """
+        self.root = Path(root)
+        self.max_bytes, self.max_age = int(max_bytes), float(max_age_days) * 86400.0
+        self.run_dir = str(run_dir)
+        self.ingestion_manifest_path = ingestion_manifest_path
+        self.__hashes = IngestionManifest(self.root / HASHES_FILE_NAME)
+        self.__lock = threading.Lock()  # stages of the dag compute their keys from several threads
+
+    def _file_hash(self, path: Path, ingestion_manifest: Optional[IngestionManifest]) -> str:
+        """content hash of an input file: from the ingestion manifest when it has the file unchanged,
+        else from the cache's own hash manifest (hashed now if new or changed)"""
+        recorded = ingestion_manifest.recorded_hash(path) if ingestion_manifest is not None else None
+        return recorded or self.__hashes.record_file(path)["hash"]
+
+    def _entry(self, stage: str, key: str) -> Path:
+        return self.root / stage / key
+
+    def key(self, stage: str, config: Any, code_module: str, inputs: List[Any]) -> str:
+        """cache key of one stage run"""
+        try:
+            settings = {k: v for k, v in vars(config).items() if k != "training_pipeline_config"}
+            with self.__lock:
+                # read per key: ingestion may have rewritten the manifest earlier in the same run
+                ingestion_manifest = (IngestionManifest(self.ingestion_manifest_path)
+                                      if self.ingestion_manifest_path and os.path.exists(self.ingestion_manifest_path)
+                                      else None)
+                inputs = [fingerprint_value(value, lambda p: self._file_hash(p, ingestion_manifest))
+                          for value in inputs]
+                self.__hashes.save()
+            content = json.dumps({"stage": stage, "code": code_version(code_module),
+                                  "config": json.loads(json.dumps(settings, default=repr).replace(self.run_dir, "<run>")),
+                                  "inputs": inputs},
+                                 sort_keys=True, default=repr)
+            return hashlib.sha256(content.encode()).hexdigest()[:24]
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def load(self, stage: str, key: str) -> Optional[Any]:
+        """artifact entity of a stored run, None on a miss or when a path it points to is gone"""
+        entry = self._entry(stage, key)
+        artifact_path = entry / ARTIFACT_FILE_NAME
+        if not artifact_path.exists():
+            return None
+        try:
+            artifact = load_object(artifact_path)
+        except Exception as e:
+            logger.warning(f"Stage cache entry {entry} unreadable, ignored: {e}")
+            return None
+        meta_path = entry / META_FILE_NAME
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+        missing = [p for p in meta.get("paths", []) if not os.path.exists(p)]
+        if missing:
+            logger.warning(f"Stage cache entry {entry} points to missing paths {missing}, ignored")
+            return None
+        meta["last_used"] = time.time()
+        meta_path.write_text(json.dumps(meta))
+        return artifact
+
+    def store(self, stage: str, key: str, artifact: Any, output_dir: str) -> Any:
+        """
+        link the stage output dir into the cache and save the artifact pointing there.
+        Returns:
+            the artifact entity with its output paths moved into the cache entry
+        """
+        try:
+            entry = self._entry(stage, key)
+            tmp = entry.with_name(f".{key}.{os.getpid()}.tmp")
+            shutil.rmtree(tmp, ignore_errors=True)
+            outputs = tmp / "outputs"
+            if os.path.isdir(output_dir):
+                shutil.copytree(output_dir, outputs, copy_function=_link_or_copy)
+            else:
+                outputs.mkdir(parents=True)
+            cached = _replace_paths(artifact, os.path.normpath(output_dir), str(entry / "outputs"))
+            save_object(tmp / ARTIFACT_FILE_NAME, cached)
+            size = sum(p.stat().st_size for p in tmp.rglob("*") if p.is_file())
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)  # entry appears complete or not at all
+            # paths the artifact points to (in the entry or shared, e.g. the feature store); a hit needs them all
+            (entry / META_FILE_NAME).write_text(json.dumps({"stage": stage, "created": time.time(),
+                                                            "last_used": time.time(), "bytes": size,
+                                                            "paths": sorted(set(_existing_paths(cached)))}))
+            logger.info(f"Stage {stage} stored in cache: {entry} ({size / 1e6:.1f} MB)")
+            self.evict()
+            return cached if entry.exists() else artifact
+        except Exception as e:
+            raise NFLGameCompetitionException(e, sys) from e
+
+    def entries(self) -> List[Dict[str, Any]]:
+        result = []
+        for meta_path in self.root.glob(f"*/*/{META_FILE_NAME}"):
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                meta = {"last_used": 0.0, "bytes": 0}
+            result.append({"path": meta_path.parent, **meta})
+        return result
+
+    def evict(self) -> int:
+        """drop entries unused for max_age_days, then least recently used until max_bytes fit"""
+        entries = sorted(self.entries(), key=lambda e: e.get("last_used", 0.0))
+        now, total, removed = time.time(), sum(e.get("bytes", 0) for e in entries), 0
+        for entry in entries:
+            if now - entry.get("last_used", 0.0) <= self.max_age and total <= self.max_bytes:
+                continue
+            shutil.rmtree(entry["path"], ignore_errors=True)
+            total -= entry.get("bytes", 0)
+            removed += 1
+            logger.info(f"Stage cache entry evicted: {entry['path']}")
+        with self.__lock:
+            for file_path in self.__hashes.files():
+                if not os.path.exists(file_path):
+                    self.__hashes.forget_file(file_path)
+            self.__hashes.save()
+        return removed
+
+
+def _link_or_copy(source: str, target: str) -> str:
+    """hard link (no data copied, same file system), plain copy otherwise"""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+    return target
@@ -0,0 +1,172 @@
+"""Tracking key index
+
+Packed 64-bit composite key of a tracking row (game_id, play_id, nfl_id, frame_id), most to least
+significant, so sorting the packed key sorts rows exactly like the four key columns:
+
+    bits 62..40  game_id  YYYYMMDDNN as (YY-2000)<<16 | MM<<12 | DD<<7 | NN   (23 bits)
+    bits 39..26  play_id  (14 bits, < 16384)
+    bits 25..9   nfl_id   (17 bits, < 131072)
+    bits  8..0   frame_id (9 bits, < 512)
+
+- TrackingIndex: sorted packed keys of a frame; rows of a game / play / player / frame come from
+  two binary searches (O(log n)), never from a boolean mask over the whole frame
+- sorted_merge_join: inner join on the key columns by binary search of the (already sorted)
+  competition files into each other, no hash table is built
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+KEY_COLS: List[str] = ["game_id", "play_id", "nfl_id", "frame_id"]
+
+GAME_BITS, PLAY_BITS, NFL_BITS, FRAME_BITS = 23, 14, 17, 9
+FRAME_SHIFT = 0
+NFL_SHIFT = FRAME_SHIFT + FRAME_BITS
+PLAY_SHIFT = NFL_SHIFT + NFL_BITS
+GAME_SHIFT = PLAY_SHIFT + PLAY_BITS
+
+
+def _check_range(name: str, values: np.ndarray, bits: int) -> None:
+    if values.size and (values.min() < 0 or values.max() >= 1 << bits):
+        raise ValueError(f"{name} outside the packed key range [0, {1 << bits})")
+
+
+def pack_game_id(game_id: np.ndarray) -> np.ndarray:
+    """YYYYMMDDNN game ids -> 23 bit order preserving codes"""
+    game_id = np.asarray(game_id, dtype=np.int64)
+    year, rest = np.divmod(game_id, 1_000_000)
+    month, rest = np.divmod(rest, 10_000)
+    day, number = np.divmod(rest, 100)
+    _check_range("game_id year", year - 2000, 7)
+    _check_range("game_id month", month, 4)
+    _check_range("game_id day", day, 5)
+    _check_range("game_id number", number, 7)
+    return ((year - 2000) << 16) | (month << 12) | (day << 7) | number
+
+
+def unpack_game_id(code: np.ndarray) -> np.ndarray:
+    code = np.asarray(code, dtype=np.int64)
+    return ((code >> 16) + 2000) * 1_000_000 + ((code >> 12) & 0xF) * 10_000 + ((code >> 7) & 0x1F) * 100 + (code & 0x7F)
+
+
+def pack_keys(game_id: np.ndarray, play_id: np.ndarray, nfl_id: Optional[np.ndarray] = None,
+              frame_id: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    int64 composite keys; a missing nfl_id / frame_id packs as 0, the lowest key of that play / player
+    Raises:
+        ValueError: a component does not fit its bit field
+    """
+    play_id = np.asarray(play_id, dtype=np.int64)
+    _check_range("play_id", play_id, PLAY_BITS)
+    packed = (pack_game_id(game_id) << GAME_SHIFT) | (play_id << PLAY_SHIFT)
+    if nfl_id is not None:
+        nfl_id = np.asarray(nfl_id, dtype=np.int64)
+        _check_range("nfl_id", nfl_id, NFL_BITS)
+        packed = packed | (nfl_id << NFL_SHIFT)
+    if frame_id is not None:
+        frame_id = np.asarray(frame_id, dtype=np.int64)
+        _check_range("frame_id", frame_id, FRAME_BITS)
+        packed = packed | frame_id
+    return packed
+
+
+def unpack_keys(packed: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(game_id, play_id, nfl_id, frame_id) of packed keys"""
+    packed = np.asarray(packed, dtype=np.int64)
+    return (unpack_game_id(packed >> GAME_SHIFT), (packed >> PLAY_SHIFT) & ((1 << PLAY_BITS) - 1),
+            (packed >> NFL_SHIFT) & ((1 << NFL_BITS) - 1), packed & ((1 << FRAME_BITS) - 1))
+
+
+def frame_keys(df: pd.DataFrame) -> np.ndarray:
+    """packed keys of the rows of a tracking frame"""
+    return pack_keys(*(df[c].to_numpy() for c in KEY_COLS))
+
+
+class TrackingIndex:
+    def __init__(self, packed: np.ndarray):
+        """
+        Args:
+            packed (np.ndarray): packed keys in row order; rows already in key order (the competition
+                                 files, the feature store partitions) are indexed without a sort
+        """
+        packed = np.asarray(packed, dtype=np.int64)
+        if packed.size and np.any(packed[1:] < packed[:-1]):
+            self.order: Optional[np.ndarray] = np.argsort(packed, kind="stable")
+            self.keys = packed[self.order]
+        else:
+            self.order, self.keys = None, packed
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "TrackingIndex":
+        return cls(frame_keys(df))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def is_sorted(self) -> bool:
+        """True when the indexed rows are in key order"""
+        return self.order is None
+
+    def _positions(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        starts, ends = np.searchsorted(self.keys, lo, "left"), np.searchsorted(self.keys, hi, "left")
+        lengths = ends - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return positions if self.order is None else self.order[positions]
+
+    def rows(self, game_id, play_id=None, nfl_id=None, frame_id=None) -> np.ndarray:
+        """
+        row positions (in row order of the indexed frame) of one or more key prefixes, e.g.
+        rows(game) / rows(game, play) / rows(games, plays) for several plays at once.
+        A prefix has to be complete from the left: nfl_id needs play_id, frame_id needs nfl_id.
+        """
+        game_id = np.atleast_1d(np.asarray(game_id, dtype=np.int64))
+        parts = [game_id, play_id, nfl_id, frame_id]
+        depth = next((i for i, part in enumerate(parts) if part is None), 4)
+        if any(part is not None for part in parts[depth:]):
+            raise ValueError("key prefix has to be complete from the left (game, play, player, frame)")
+        parts = [np.broadcast_to(np.asarray(part if i < depth else 0, dtype=np.int64), game_id.shape)
+                 for i, part in enumerate(parts)]
+        lo = pack_keys(*parts)
+        span = [GAME_SHIFT, PLAY_SHIFT, NFL_SHIFT, FRAME_SHIFT][depth - 1]
+        return self._positions(lo, lo + (1 << span))
+
+    def take(self, df: pd.DataFrame, game_id, play_id=None, nfl_id=None, frame_id=None) -> pd.DataFrame:
+        """rows of a key prefix from the indexed frame (see rows)"""
+        return df.iloc[self.rows(game_id, play_id, nfl_id, frame_id)]
+
+    def lookup(self, packed: np.ndarray) -> np.ndarray:
+        """row position of every exact packed key, -1 where the key is not indexed (first match on duplicates)"""
+        packed = np.asarray(packed, dtype=np.int64)
+        at = np.minimum(np.searchsorted(self.keys, packed, "left"), max(len(self.keys) - 1, 0))
+        found = (self.keys[at] == packed) if len(self.keys) else np.zeros(packed.shape, dtype=bool)
+        rows = at if self.order is None else self.order[at]
+        return np.where(found, rows, -1)
+
+
+def sorted_merge_join(left: pd.DataFrame, right: pd.DataFrame, on: List[str] = KEY_COLS) -> pd.DataFrame:
+    """
+    inner join on the tracking key columns (same rows and columns as pd.merge(how="inner"), in key
+    order). Every left key is binary searched in the sorted right keys; inputs already in key order,
+    like the competition week files, are not sorted again.
+    Raises:
+        ValueError: duplicate keys on the right side, or keys outside the packed ranges
+    """
+    if list(on) != KEY_COLS:
+        raise ValueError(f"sorted_merge_join joins on {KEY_COLS}, got {on}")
+    left_index, right_index = TrackingIndex.from_frame(left), TrackingIndex.from_frame(right)
+    if right_index.keys.size and np.any(right_index.keys[1:] == right_index.keys[:-1]):
+        raise ValueError("sorted_merge_join needs unique keys on the right side")
+    right_rows = right_index.lookup(left_index.keys)
+    matched = right_rows >= 0
+    left_rows = np.arange(len(left)) if left_index.order is None else left_index.order
+    left_rows, right_rows = left_rows[matched], right_rows[matched]
+
+    joined = left.iloc[left_rows].reset_index(drop=True)
+    extra = right.drop(columns=list(on)).iloc[right_rows].reset_index(drop=True)
+    clashes = joined.columns.intersection(extra.columns)
+    if len(clashes):
+        joined = joined.rename(columns={c: f"{c}_x" for c in clashes})
+        extra = extra.rename(columns={c: f"{c}_y" for c in clashes})
+    return pd.concat([joined, extra], axis=1)
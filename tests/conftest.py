@@ -0,0 +1,88 @@
+"""Shared fixtures: small synthetic tracking plays, a saved model bundle for the predict path and
+one small ingestion -> validation -> transformation run shared by the component tests."""
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import _plays, build_rosters, generate_chunk
+from benchmarks.synthetic_data import write_weeks
+from src.nfl_game_competition.components.data_ingestion import DataIngestion
+from src.nfl_game_competition.components.data_validation import DataValidation
+from src.nfl_game_competition.components.data_transformation import (DataTransformation, compute_features,
+                                                                     sort_tracking)
+from src.nfl_game_competition.entity.artifact_entity import DataIngestionArtifact
+from src.nfl_game_competition.entity.config_entity import (TrainingPipelineConfig, DataIngestionConfig,
+                                                           DataValidationConfig, DataTransformationConfig,
+                                                           PredictPipelineConfig)
+from src.nfl_game_competition.utils.common import save_object
+
+
+class SumModel:
+    """deterministic stand-in for a trained regressor: output depends on every feature of the row"""
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        features = np.nan_to_num(np.asarray(features, dtype=np.float64))
+        return np.stack([features.sum(axis=1), features[:, ::2].sum(axis=1)], axis=1)
+
+
+def make_tracking(n_plays: int = 4, seed: int = 0) -> pd.DataFrame:
+    """input rows of n_plays synthetic plays, in key order"""
+    rng = np.random.default_rng(seed)
+    inputs, _ = generate_chunk(_plays(n_plays, week=1, rng=rng), build_rosters(rng), rng)
+    return inputs
+
+
+@pytest.fixture
+def tracking() -> pd.DataFrame:
+    return make_tracking()
+
+
+@pytest.fixture
+def model_config(tmp_path, tracking) -> PredictPipelineConfig:
+    """predict config pointing at a SumModel bundle saved in tmp_path"""
+    _, names = compute_features(sort_tracking(tracking), [1, 2, 3])
+    config = PredictPipelineConfig()
+    config.model_file_path = str(tmp_path / "model.pkl")
+    config.state_file_path = str(tmp_path / "transformation_state.pkl")
+    save_object(config.model_file_path, SumModel())
+    save_object(config.state_file_path, {"version": "test", "feature_names": names, "lags": [1, 2, 3],
+                                         "neighbors_k": 3, "neighbor_radius": 5.0, "physics_mode": "ca",
+                                         "physics_steer": 0.5})
+    return config
+
+
+def make_configs(root: str) -> SimpleNamespace:
+    """ingestion / validation / transformation configs with every path, relative ones included, under root"""
+    pipeline_config = TrainingPipelineConfig()
+    pipeline_config.artifact_dir = os.path.join(root, "run")
+    ingestion = DataIngestionConfig(training_pipeline_config=pipeline_config)
+    ingestion.feature_store_filepath = os.path.join(root, "feature_store", "merged_data.parquet")
+    ingestion.manifest_filepath = os.path.join(root, "feature_store", "ingestion_manifest.json")
+    ingestion.generated_schema_file_path = os.path.join(root, "feature_store", "feature_store_schema.yaml")
+    validation = DataValidationConfig(training_pipeline_config=pipeline_config)
+    validation.baseline_file_path = os.path.join(root, "drift_baseline.json")
+    transformation = DataTransformationConfig(training_pipeline_config=pipeline_config)
+    return SimpleNamespace(root=root, pipeline=pipeline_config, ingestion=ingestion, validation=validation,
+                           transformation=transformation)
+
+
+@pytest.fixture(scope="session")
+def pipeline_run(tmp_path_factory) -> SimpleNamespace:
+    """two synthetic weeks (~45k input rows) ingested, validated and transformed once per session"""
+    root = str(tmp_path_factory.mktemp("pipeline_run"))
+    raw_dir = os.path.join(root, "raw")
+    write_weeks(raw_dir, scale=0.01, weeks=2)
+    run = make_configs(root)
+    run.raw_dir = raw_dir
+    ingestion = DataIngestion(config=run.ingestion)
+    ingestion._train_test_split_and_save(ingestion._merge_all_input_output(unzipped_dir=raw_dir))
+    run.ingestion_artifact = DataIngestionArtifact(feature_store_file_path=run.ingestion.feature_store_filepath,
+                                                   train_file_path=run.ingestion.training_filepath,
+                                                   test_file_path=run.ingestion.testing_filepath)
+    run.validation_artifact = DataValidation(data_ingestion_artifact=run.ingestion_artifact,
+                                             config=run.validation).initiate_data_validation()
+    run.transformation_artifact = DataTransformation(data_ingestion_artifact=run.ingestion_artifact,
+                                                     config=run.transformation).initiate_data_transformation()
+    return run
@@ -0,0 +1,37 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def client(model_config):
+    app = create_app(model_config)
+    yield app.test_client()
+    app.config["BATCHER"].close()
+
+
+def _rows(tracking):
+    play = tracking[tracking["play_id"] == tracking["play_id"].iloc[0]]
+    return play.to_dict(orient="records")
+
+
+def test_valid_payload_is_predicted(client, tracking):
+    response = client.post("/predict", json={"request_id": "ok", "tracking": _rows(tracking)})
+    assert response.status_code == 200
+    assert response.get_json()["predictions"]
+
+
+def test_missing_column_is_rejected(client, tracking):
+    rows = [{k: v for k, v in row.items() if k != "x"} for row in _rows(tracking)]
+    response = client.post("/predict", json={"tracking": rows})
+    assert response.status_code == 400
+    assert "x" in response.get_json()["error"]
+
+
+def test_non_numeric_value_is_rejected(client, tracking):
+    rows = _rows(tracking)
+    rows[0]["x"] = "left hash"
+    response = client.post("/predict", json={"tracking": rows})
+    assert response.status_code == 400
+    assert "numeric" in response.get_json()["error"]
+    assert client.get("/health").get_json()["batcher"]["items"] == 0
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.nfl_game_competition.utils.batch_stream import MiniBatchStream, prefetch
+from src.nfl_game_competition.utils.model_utils import (IncrementalRegressor, StreamingRMSE,
+                                                        build_incremental_estimator, fit_incremental,
+                                                        score_incremental)
+
+
+def _shard(path, rows: int, offset: int = 0, seed: int = 0):
+    """features [row id, x, y, noise], targets = anchor (x, y) + a linear displacement"""
+    rng = np.random.default_rng(seed)
+    features = np.column_stack([np.arange(offset, offset + rows), rng.uniform(0, 100, (rows, 2)),
+                                rng.normal(size=rows)]).astype(np.float32)
+    targets = features[:, 1:3] + np.column_stack([2.0 * features[:, 3], -features[:, 3]])
+    path.mkdir()
+    np.save(path / "features.npy", features)
+    np.save(path / "targets.npy", targets.astype(np.float32))
+    return str(path)
+
+
+@pytest.fixture
+def shards(tmp_path):
+    return [_shard(tmp_path / "a", 1000), _shard(tmp_path / "b", 350, offset=1000, seed=1)]
+
+
+def test_every_row_is_streamed_once(shards):
+    stream = MiniBatchStream(shards, batch_size=128)
+    for shuffle in (False, True):
+        ids = np.concatenate([X[:, 0] for X, _ in stream.batches(shuffle=shuffle, seed=3)])
+        np.testing.assert_array_equal(np.sort(ids), np.arange(1350))
+    ordered = np.concatenate([X[:, 0] for X, _ in stream.batches()])
+    np.testing.assert_array_equal(ordered, np.arange(1350))
+
+
+def test_shuffle_is_seeded_and_rows_keep_their_targets(shards):
+    stream = MiniBatchStream(shards, batch_size=128)
+    first = [X[:, 0] for X, _ in stream.batches(shuffle=True, seed=5)]
+    second = [X[:, 0] for X, _ in stream.batches(shuffle=True, seed=5)]
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    for X, Y in stream.batches(shuffle=True, seed=5):
+        np.testing.assert_allclose(Y[:, 0], X[:, 1] + 2.0 * X[:, 3], rtol=1e-5, atol=1e-4)
+
+
+def test_row_subsets_columns_and_max_rows(shards):
+    stream = MiniBatchStream(shards, batch_size=100, feature_columns=[0],
+                             row_indices=[np.array([1, 5, 999]), None])
+    X = np.concatenate([X for X, _ in stream.batches()])
+    assert X.shape == (3 + 350, 1)
+    np.testing.assert_array_equal(X[:3, 0], [1, 5, 999])
+    assert sum(len(X) for X, _ in MiniBatchStream(shards, batch_size=100).batches(max_rows=250)) == 300
+
+
+def test_prefetch_forwards_producer_errors():
+    def broken():
+        yield 1
+        raise RuntimeError("decode failed")
+    with pytest.raises(RuntimeError):
+        list(prefetch(broken(), depth=2))
+
+
+def test_incremental_model_learns_the_displacement(shards):
+    stream = MiniBatchStream(shards, batch_size=128)
+    model = IncrementalRegressor(build_incremental_estimator("sgd", {"alpha": 1e-6}, random_state=0),
+                                 ["row", "x", "y", "noise"], anchor_cols=["x", "y"])
+    fit_incremental(model, stream, epochs=5, seed=0)
+    assert model.rows_seen == 5 * 1350
+    assert score_incremental(model, stream).value < 0.1
+    baseline = StreamingRMSE()
+    for X, Y in stream.batches():
+        baseline.update(X[:, 1:3], Y)
+    assert baseline.value > 1.0
+
+
+def test_prefetch_producer_exits_when_the_consumer_stops_early():
+    batches = prefetch(iter(range(3)), depth=1)
+    assert next(batches) == 0
+    time.sleep(0.3)  # the producer has queued item 1 and now waits on the full queue
+    batches.close()
+    assert not any(t.name == "batch-prefetch" and t.is_alive() for t in threading.enumerate())
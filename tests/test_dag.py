@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from src.nfl_game_competition.utils.dag import STATE_FILE_NAME, DagScheduler, StageNode
+
+
+@dataclass
+class RawArtifact:
+    rows: int
+
+
+@dataclass
+class CleanArtifact:
+    rows: int
+
+
+@dataclass
+class ReportArtifact:
+    text: str
+
+
+def _nodes(calls: list, fail_report: bool = False) -> list:
+    def ingest() -> RawArtifact:
+        calls.append("ingest")
+        return RawArtifact(rows=10)
+
+    def clean(raw: RawArtifact) -> CleanArtifact:
+        calls.append("clean")
+        return CleanArtifact(rows=raw.rows - 1)
+
+    def report(raw: RawArtifact, clean: Optional[CleanArtifact], label: str = "x") -> ReportArtifact:
+        calls.append("report")
+        if fail_report:
+            raise ValueError("report failed")
+        return ReportArtifact(text=f"{label}:{raw.rows}->{clean.rows}")
+
+    return [StageNode("report", report, ReportArtifact), StageNode("clean", clean, CleanArtifact),
+            StageNode("ingest", ingest, RawArtifact)]
+
+
+def test_edges_come_from_artifact_type_hints(tmp_path):
+    calls = []
+    scheduler = DagScheduler(_nodes(calls), state_dir=str(tmp_path), max_cpus=2, max_memory_gb=4)
+    assert scheduler.inputs == {"ingest": {}, "clean": {"raw": "ingest"},
+                                "report": {"raw": "ingest", "clean": "clean"}}
+    done = scheduler.run()
+    assert calls == ["ingest", "clean", "report"]
+    assert done["report"] == ReportArtifact(text="x:10->9")
+
+
+def test_resume_runs_only_unfinished_nodes(tmp_path):
+    calls = []
+    with pytest.raises(ValueError):
+        DagScheduler(_nodes(calls, fail_report=True), state_dir=str(tmp_path)).run()
+    state = json.loads((tmp_path / STATE_FILE_NAME).read_text())
+    assert sorted(state["completed"]) == ["clean", "ingest"] and state["failed"] == "report"
+
+    calls.clear()
+    done = DagScheduler(_nodes(calls), state_dir=str(tmp_path)).run()
+    assert calls == ["report"]
+    assert done["clean"] == CleanArtifact(rows=9) and done["report"].text == "x:10->9"
+
+
+def test_cpu_limit_serialises_independent_nodes(tmp_path):
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def busy() -> None:
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    nodes = [StageNode(f"n{i}", busy, type(f"Artifact{i}", (), {}), cpus=2) for i in range(3)]
+    DagScheduler(nodes, state_dir=str(tmp_path / "serial"), max_cpus=2).run()
+    assert peak[0] == 1
+    peak[0] = 0
+    DagScheduler(nodes, state_dir=str(tmp_path / "parallel"), max_cpus=6).run()
+    assert peak[0] == 3
+
+
+def test_cycle_is_reported(tmp_path):
+    def first(second: CleanArtifact) -> RawArtifact:
+        return RawArtifact(rows=second.rows)
+
+    def second(first: RawArtifact) -> CleanArtifact:
+        return CleanArtifact(rows=first.rows)
+
+    with pytest.raises(RuntimeError, match="cycle"):
+        DagScheduler([StageNode("first", first, RawArtifact), StageNode("second", second, CleanArtifact)],
+                     state_dir=str(tmp_path)).run()
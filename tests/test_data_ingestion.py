@@ -0,0 +1,146 @@
+import json
+import os
+from pathlib import Path
+from zipfile import ZipFile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import ARCHIVE_NAME, write_weeks
+from src.nfl_game_competition.components.data_ingestion import DataIngestion
+from src.nfl_game_competition.components.data_validation import DataValidation
+from src.nfl_game_competition.entity.artifact_entity import DataIngestionArtifact
+from src.nfl_game_competition.constants.training_pipeline_constants import SCHEMA_FILEPATH
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.utils.common import (list_feature_store_partitions, load_feature_store,
+                                                   load_split_keys, read_schema_dtypes, read_yaml)
+
+from tests.conftest import make_configs
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    write_weeks(str(tmp_path / "raw"), scale=0.005, weeks=2)
+    return str(tmp_path / "raw")
+
+
+def _store(run) -> pd.DataFrame:
+    df = load_feature_store(run.ingestion.feature_store_filepath)
+    return df.sort_values(["game_id", "play_id", "nfl_id", "frame_id"]).reset_index(drop=True)
+
+
+def _partition_mtimes(store: str) -> dict:
+    return {str(p): p.stat().st_mtime_ns for p in Path(store).rglob("*.parquet") if p.is_file()}
+
+
+def test_merge_writes_generated_schema_not_the_checked_in_one(tmp_path, raw_dir):
+    checked_in = Path(SCHEMA_FILEPATH).read_bytes()
+    run = make_configs(str(tmp_path))
+    DataIngestion(config=run.ingestion)._merge_all_input_output(unzipped_dir=raw_dir)
+    assert Path(SCHEMA_FILEPATH).read_bytes() == checked_in
+    generated = read_schema_dtypes(run.ingestion.generated_schema_file_path)
+    assert generated == {c: t for c, t in read_schema_dtypes(SCHEMA_FILEPATH).items() if c in generated}
+
+
+def test_unchanged_weeks_are_reused_and_a_lost_schema_is_rewritten(tmp_path, raw_dir):
+    run = make_configs(str(tmp_path))
+    DataIngestion(config=run.ingestion)._merge_all_input_output(unzipped_dir=raw_dir)
+    partitions = _partition_mtimes(run.ingestion.feature_store_filepath)
+    schema_mtime = os.stat(run.ingestion.generated_schema_file_path).st_mtime_ns
+
+    DataIngestion(config=run.ingestion)._merge_all_input_output(unzipped_dir=raw_dir)
+    assert _partition_mtimes(run.ingestion.feature_store_filepath) == partitions
+    assert os.stat(run.ingestion.generated_schema_file_path).st_mtime_ns == schema_mtime
+
+    os.remove(run.ingestion.generated_schema_file_path)
+    DataIngestion(config=run.ingestion)._merge_all_input_output(unzipped_dir=raw_dir)
+    assert _partition_mtimes(run.ingestion.feature_store_filepath) == partitions
+    assert os.path.exists(run.ingestion.generated_schema_file_path)
+
+
+def test_parallel_merge_equals_serial_merge(tmp_path, raw_dir):
+    stores = []
+    for workers in (1, 2):
+        run = make_configs(str(tmp_path / f"workers_{workers}"))
+        run.ingestion.merge_workers = workers
+        DataIngestion(config=run.ingestion)._merge_all_input_output(unzipped_dir=raw_dir)
+        stores.append(_store(run))
+    pd.testing.assert_frame_equal(*stores)
+    with open(os.path.join(raw_dir, "synthetic_meta.json")) as meta:
+        assert len(stores[0]) == json.load(meta)["output_rows"]  # every output frame finds its input row
+
+
+def test_merge_streamed_from_zip_equals_merge_from_disk(tmp_path):
+    write_weeks(str(tmp_path / "raw"), scale=0.005, weeks=2, zip_archive=True)
+    from_disk, from_zip = make_configs(str(tmp_path / "disk")), make_configs(str(tmp_path / "zip"))
+    DataIngestion(config=from_disk.ingestion)._merge_all_input_output(unzipped_dir=str(tmp_path / "raw"))
+    DataIngestion(config=from_zip.ingestion)._merge_all_input_output(zip_file=str(tmp_path / "raw" / ARCHIVE_NAME))
+    pd.testing.assert_frame_equal(_store(from_zip), _store(from_disk))
+
+
+def test_merge_without_week_files_names_the_searched_source(tmp_path):
+    ingestion = DataIngestion(config=make_configs(str(tmp_path)).ingestion)
+    (tmp_path / "raw" / "train").mkdir(parents=True)
+    with pytest.raises(NFLGameCompetitionException, match="week pairs found in .*raw"):
+        ingestion._merge_all_input_output(unzipped_dir=str(tmp_path / "raw"))
+    archive = tmp_path / ARCHIVE_NAME
+    with ZipFile(archive, "w") as zip_ref:
+        zip_ref.writestr("train/readme.txt", "no weeks")
+    with pytest.raises(NFLGameCompetitionException, match=f"week pairs found in .*{ARCHIVE_NAME}"):
+        ingestion._merge_all_input_output(zip_file=str(archive))
+
+
+def test_equal_week_numbers_of_two_seasons_keep_separate_partitions(tmp_path):
+    meta = write_weeks(str(tmp_path / "raw"), scale=0.005, weeks=1, seasons=2)
+    run = make_configs(str(tmp_path))
+    run.ingestion.merge_workers = 2
+    ingestion = DataIngestion(config=run.ingestion)
+    store_path = ingestion._merge_all_input_output(unzipped_dir=str(tmp_path / "raw"))
+    assert list_feature_store_partitions(store_path, ["season", "week"]) == [(2023, 1), (2024, 1)]
+    store = _store(run)
+    assert len(store) == meta["output_rows"]
+    assert (store["game_id"] // 1_000_000 == store["season"]).all()  # YYYYMMDDNN ids stay in their season
+
+    train_path, test_path = ingestion._train_test_split_and_save(store_path)
+    for path in (train_path, test_path):
+        assert np.unique(load_split_keys(path)[:, 0] // 1_000_000).tolist() == [2023, 2024]
+
+    artifact = DataIngestionArtifact(feature_store_file_path=str(store_path), train_file_path=train_path,
+                                     test_file_path=test_path)
+    validation = DataValidation(data_ingestion_artifact=artifact, config=run.validation).initiate_data_validation()
+    report = read_yaml(Path(validation.report_file_path))
+    assert report.partitions == [{"season": 2023, "week": 1}, {"season": 2024, "week": 1}]
+    assert report["keys"]["duplicate_keys"] == 0 and report.column_stats.x.rows == len(store)
+
+
+def test_only_the_changed_season_of_a_week_is_merged_again(tmp_path):
+    write_weeks(str(tmp_path / "raw"), scale=0.005, weeks=1, seasons=2)
+    run = make_configs(str(tmp_path))
+    DataIngestion(config=run.ingestion)._merge_all_input_output(unzipped_dir=str(tmp_path / "raw"))
+    store = Path(run.ingestion.feature_store_filepath)
+    before = _partition_mtimes(store)
+
+    source = tmp_path / "raw" / "train" / "output_2024_w01.csv"
+    outputs = pd.read_csv(source)
+    outputs.assign(x=outputs["x"] + 0.5).to_csv(source, index=False, float_format="%.2f")
+    ingestion = DataIngestion(config=run.ingestion)
+    ingestion._merge_all_input_output(unzipped_dir=str(tmp_path / "raw"))
+
+    after = _partition_mtimes(store)
+    changed = {path for path in after if after[path] != before.get(path)}
+    assert changed == {str(store / "season=2024" / "week=1" / "part-0.parquet")}
+    assert ingestion._store_rows() == len(_store(run))
+
+
+def test_partitions_of_the_week_only_layout_are_dropped(tmp_path, raw_dir):
+    run = make_configs(str(tmp_path))
+    old_partition = Path(run.ingestion.feature_store_filepath) / "week=1" / "part-0.parquet"
+    old_partition.parent.mkdir(parents=True)
+    old_partition.write_bytes(b"old layout")
+    with open(run.ingestion.manifest_filepath, "w") as manifest:
+        json.dump({"files": {}, "weeks": {"1": {"sources": {}, "partition_files": [str(old_partition)],
+                                                 "rows": 1, "dtypes": []}}}, manifest)
+    DataIngestion(config=run.ingestion)._merge_all_input_output(unzipped_dir=raw_dir)
+    assert not old_partition.parent.exists()
+    assert list_feature_store_partitions(run.ingestion.feature_store_filepath, ["season", "week"]) == [(2023, 1), (2023, 2)]
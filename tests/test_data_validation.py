@@ -0,0 +1,62 @@
+import copy
+import dataclasses
+import shutil
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.nfl_game_competition.components.data_validation import DataValidation
+from src.nfl_game_competition.utils.common import player_dim_path, read_yaml
+
+
+def _store_copy(pipeline_run, tmp_path, column: str, arrow_type: pa.DataType):
+    """copy of the session feature store with one column rewritten as arrow_type in every partition"""
+    source = Path(pipeline_run.ingestion.feature_store_filepath)
+    store = tmp_path / source.name
+    shutil.copytree(source, store)
+    shutil.copytree(player_dim_path(source), player_dim_path(store))
+    for part in store.rglob("*.parquet"):
+        table = pq.read_table(part, partitioning=None)
+        index = table.schema.get_field_index(column)
+        pq.write_table(table.set_column(index, column, table.column(column).cast(arrow_type)), part)
+    return dataclasses.replace(pipeline_run.ingestion_artifact, feature_store_file_path=str(store))
+
+
+def test_generated_store_matches_schema(pipeline_run):
+    report = DataValidation(data_ingestion_artifact=pipeline_run.ingestion_artifact,
+                            config=pipeline_run.validation)._validate_columns()
+    assert report == {"missing_columns": [], "unexpected_columns": [], "dtype_mismatches": {}}
+    assert pipeline_run.validation_artifact.validation_status
+
+
+def test_stored_dtype_mismatch_fails_validation(pipeline_run, tmp_path):
+    artifact = _store_copy(pipeline_run, tmp_path, "x", pa.float64())
+    config = copy.copy(pipeline_run.validation)
+    config.data_validation_dir = str(tmp_path / "data_validation")
+    config.report_file_path = str(tmp_path / "data_validation" / "report.yaml")
+    config.drift_report_file_path = str(tmp_path / "data_validation" / "drift_report.yaml")
+    config.distributions_file_path = str(tmp_path / "data_validation" / "drift_distributions.json")
+    validation = DataValidation(data_ingestion_artifact=artifact, config=config)
+    assert validation._validate_columns()["dtype_mismatches"] == {"x": ["float32", "float64"]}
+    assert not validation.initiate_data_validation().validation_status
+
+
+def test_missing_baseline_is_reported_not_created(pipeline_run, tmp_path):
+    config = copy.copy(pipeline_run.validation)
+    config.report_file_path = str(tmp_path / "report.yaml")
+    config.drift_report_file_path = str(tmp_path / "drift_report.yaml")
+    config.distributions_file_path = str(tmp_path / "drift_distributions.json")
+    config.baseline_file_path = str(tmp_path / "saved_models" / "drift_baseline.json")
+    DataValidation(data_ingestion_artifact=pipeline_run.ingestion_artifact, config=config).initiate_data_validation()
+    report = read_yaml(Path(config.drift_report_file_path))
+    assert report.drift_status == "no baseline" and report.drift_detected is None
+    assert not Path(config.baseline_file_path).exists()
+
+    # the distributions of a promoted run become the baseline: the same data shows no drift
+    Path(config.baseline_file_path).parent.mkdir()
+    shutil.copy(config.distributions_file_path, config.baseline_file_path)
+    DataValidation(data_ingestion_artifact=pipeline_run.ingestion_artifact, config=config).initiate_data_validation()
+    report = read_yaml(Path(config.drift_report_file_path))
+    assert report.drift_status == "no drift" and report.drift_detected is False
+    assert set(report.columns) == set(config.drift_columns)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.nfl_game_competition.utils.feature_cache import PlayFeatureCache
+
+
+def _block(rows: int, fill: float = 1.0) -> np.ndarray:
+    return np.full((rows, 4), fill, dtype=np.float32)  # 16 bytes per row
+
+
+def test_get_returns_read_only_copy_and_counts_hits():
+    cache = PlayFeatureCache(max_plays=4)
+    block = _block(3)
+    cache.put("a", block)
+    block[:] = 0
+
+    cached = cache.get("a")
+    assert cached is not None and (cached == 1).all()
+    with pytest.raises(ValueError):
+        cached[0, 0] = 5
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["plays"], stats["hit_rate"]) == (1, 1, 1, 0.5)
+
+
+def test_evicts_least_recently_used_by_plays_and_bytes():
+    cache = PlayFeatureCache(max_plays=2, max_bytes=1 << 20)
+    cache.put("a", _block(1))
+    cache.put("b", _block(1))
+    cache.get("a")
+    cache.put("c", _block(1))
+    assert cache.get("b") is None and cache.get("a") is not None and cache.get("c") is not None
+
+    by_bytes = PlayFeatureCache(max_plays=10, max_bytes=100)
+    by_bytes.put("a", _block(3))
+    by_bytes.put("b", _block(3))
+    by_bytes.put("c", _block(3))
+    by_bytes.put("too_big", _block(10))
+    assert by_bytes.get("a") is None and by_bytes.get("b") is not None and by_bytes.get("too_big") is None
+    assert by_bytes.stats()["bytes"] == 96 and by_bytes.stats()["evictions"] == 1
+
+
+def test_bind_to_new_version_drops_entries():
+    cache = PlayFeatureCache()
+    cache.bind(("v1", ("x", "y")))
+    cache.put("a", _block(2))
+    cache.bind(("v1", ("x", "y")))
+    assert cache.get("a") is not None
+
+    cache.bind(("v2", ("x", "y")))
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_zero_plays_disables_cache():
+    cache = PlayFeatureCache(max_plays=0)
+    cache.put("a", _block(1))
+    assert cache.get("a") is None and cache.stats()["plays"] == 0
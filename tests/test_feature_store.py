@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from src.nfl_game_competition.utils.common import (feature_store_exists, list_feature_store_partitions,
+                                                   load_feature_store, player_dim_path, save_feature_store,
+                                                   split_player_dimension)
+
+
+def _rows(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"game_id": rng.choice([2023090700, 2023091000], n).astype(np.int32),
+                         "play_id": rng.integers(1, 50, n).astype(np.int16),
+                         "nfl_id": rng.integers(40000, 40100, n).astype(np.int32),
+                         "frame_id": rng.integers(1, 30, n).astype(np.int16),
+                         "x": rng.uniform(0, 120, n).astype(np.float32),
+                         "week": rng.integers(1, 4, n).astype(np.int8)})
+
+
+def test_roundtrip_by_week_partition(tmp_path):
+    df = _rows()
+    store = tmp_path / "merged_data.parquet"
+    written = save_feature_store(store, df, partition_cols=["week"], sort_cols=["game_id", "play_id", "nfl_id", "frame_id"])
+    assert len(written) == df["week"].nunique()
+    assert feature_store_exists(store)
+    assert list_feature_store_partitions(store) == sorted(df["week"].unique().tolist())
+
+    week = load_feature_store(store, filters=[("week", "==", 2)], schema_path=tmp_path / "no_schema.yaml")
+    expected = df[df["week"] == 2].sort_values(["game_id", "play_id", "nfl_id", "frame_id"], kind="stable")
+    np.testing.assert_array_equal(week["x"].to_numpy(), expected["x"].to_numpy())
+    assert (week["week"] == 2).all()
+
+
+def test_rewriting_a_week_leaves_the_others(tmp_path):
+    df = _rows()
+    store = tmp_path / "merged_data.parquet"
+    save_feature_store(store, df)
+    save_feature_store(store, df[df["week"] == 1].head(5))
+    loaded = load_feature_store(store, columns=["week"], schema_path=tmp_path / "no_schema.yaml")
+    counts = loaded["week"].value_counts().to_dict()
+    assert counts[1] == 5
+    assert counts[2] == (df["week"] == 2).sum()
+
+
+def test_schema_dtypes_are_restored(pipeline_run):
+    df = load_feature_store(pipeline_run.ingestion.feature_store_filepath, columns=["game_id", "play_id", "nfl_id",
+                                                                                     "frame_id", "x", "week"],
+                            filters=[("week", "==", 1)])
+    assert str(df["week"].dtype) == "int8"  # hive partition keys come back as int32 without the schema
+    assert str(df["x"].dtype) == "float32"
+    keys = df[["game_id", "play_id", "nfl_id", "frame_id"]]
+    assert not keys.duplicated().any()
+
+
+def test_player_attributes_are_stored_once_and_joined_on_read(tmp_path):
+    df = _rows(n=200)
+    players = pd.DataFrame({"nfl_id": np.arange(40000, 40100, dtype=np.int32)})
+    players["player_height"] = np.where(players["nfl_id"] % 2 == 0, "6-2", "5-11")
+    players["player_birth_date"] = "1999-09-07"
+    players["player_position"] = np.where(players["nfl_id"] % 3 == 0, "QB", "WR")
+    df = df.merge(players, on="nfl_id", how="left")
+
+    fact, dim = split_player_dimension(df)
+    assert "player_position" not in fact.columns
+    assert dim["nfl_id"].is_unique and len(dim) == df["nfl_id"].nunique()
+    store = tmp_path / "merged_data.parquet"
+    save_feature_store(store, fact)
+    save_feature_store(player_dim_path(store), dim.assign(week=1))
+
+    loaded = load_feature_store(store, columns=["nfl_id", "x", "player_position", "player_height_in", "player_age"],
+                                schema_path=tmp_path / "no_schema.yaml")
+    expected = loaded[["nfl_id"]].merge(players, on="nfl_id", how="left")
+    assert loaded["player_position"].tolist() == expected["player_position"].tolist()
+    assert set(loaded["player_height_in"]) == {74.0, 71.0}
+    assert np.allclose(loaded["player_age"], 24.0, atol=0.1)  # 2023-09-07 / 2023-09-10 games
+    assert "player_position" not in load_feature_store(store, columns=["nfl_id", "x"],
+                                                       schema_path=tmp_path / "no_schema.yaml").columns
@@ -0,0 +1,28 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_import_time import DEFERRED, ENTRY_POINTS, OVERHEAD_BUDGET_S, import_overhead
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_entry_point_import_defers_heavy_modules_and_log_file(module, tmp_path):
+    code = (f"import sys, json; import {module}; "
+            f"print(json.dumps(sorted(m for m in {DEFERRED!r} if m in sys.modules)))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True, check=True,
+                            env={**os.environ, "PYTHONPATH": str(REPO_ROOT), "PYTHONDONTWRITEBYTECODE": "1"})
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+    assert not (tmp_path / "artifacts").exists()
+
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_entry_point_import_time_over_pandas_is_within_budget(module):
+    # best of three fresh interpreters; pandas itself is imported first and not counted
+    seconds = min(import_overhead(module) for _ in range(3))
+    assert seconds < OVERHEAD_BUDGET_S, f"import {module} took {seconds:.3f} s on top of pandas"
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from src.nfl_game_competition.utils.instrumentation import record, stage_metrics, step, summarize
+
+
+def test_stage_record_nests_steps_and_row_counts(tmp_path):
+    with stage_metrics("data_ingestion", str(tmp_path)) as span:
+        with step("merge", rows_in=100):
+            with step("read"):
+                record(rows_out=60)
+            record(rows_out=80)
+        record(rows_in=100, rows_out=80, weeks=2)
+    assert span.rows_out == 80
+
+    content = json.loads((tmp_path / "stage_metrics.json").read_text())
+    assert (content["stage"], content["rows_in"], content["rows_out"], content["weeks"]) == ("data_ingestion", 100, 80, 2)
+    merge = content["steps"][0]
+    assert (merge["name"], merge["rows_in"], merge["rows_out"]) == ("merge", 100, 80)
+    assert merge["steps"][0]["name"] == "read" and merge["steps"][0]["rows_out"] == 60
+    assert content["wall_s"] >= merge["wall_s"] >= merge["steps"][0]["wall_s"]
+
+
+def test_failed_stage_is_recorded_with_its_error(tmp_path):
+    with pytest.raises(KeyError):
+        with stage_metrics("model_trainer", str(tmp_path)):
+            with step("fit"):
+                raise KeyError("target")
+    content = json.loads((tmp_path / "stage_metrics.json").read_text())
+    assert content["error"].startswith("KeyError")
+    assert content["steps"][0]["error"].startswith("KeyError")
+
+
+def test_step_and_record_outside_a_stage_are_harmless():
+    record(rows_in=5)
+    with step("standalone") as span:
+        record(rows_out=3)
+    assert span.rows_out == 3 and span.steps == []
+
+
+def test_profiler_output_and_summary(tmp_path):
+    with stage_metrics("data_transformation", str(tmp_path), profiler="cprofile"):
+        with step("features"):
+            sum(range(10000))
+    assert (tmp_path / "profile.prof").exists() and (tmp_path / "profile.txt").exists()
+    with pytest.raises(ValueError):
+        with stage_metrics("x", str(tmp_path / "bad"), profiler="perf"):
+            pass
+
+    slow = {"stage": "slow", "wall_s": 2.0, "peak_rss_mb": 300.0, "rows_per_s": 10.0,
+            "steps": [{"name": "a", "wall_s": 1.5, "peak_rss_mb": 300.0, "rows_per_s": None,
+                       "steps": [{"name": "b", "wall_s": 1.0, "peak_rss_mb": 250.0, "rows_per_s": None}]}]}
+    fast = {"stage": "fast", "wall_s": 0.5, "peak_rss_mb": None}
+    summary = summarize([fast, slow])
+    assert summary["wall_s"] == 2.5 and summary["peak_rss_mb"] == 300.0
+    assert [s["stage"] for s in summary["stages"]] == ["slow", "fast"]
+    assert [s["step"] for s in summary["stages"][0]["slowest_steps"]] == ["a", "a/b"]
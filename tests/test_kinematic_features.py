@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+
+from src.nfl_game_competition.components.data_transformation import compute_kinematic_features, sort_tracking
+
+from tests.conftest import make_tracking
+
+
+def test_lagged_diffs_match_groupby_diff():
+    df = sort_tracking(make_tracking(n_plays=3, seed=1).sample(frac=1.0, random_state=0))
+    features, names = compute_kinematic_features(df, lags=[1, 3])
+    x = features[:, names.index("x")]
+    grouped = df.assign(x_norm=x).groupby(["game_id", "play_id", "nfl_id"], sort=False)["x_norm"]
+    for lag in (1, 3):
+        expected = grouped.diff(lag).fillna(0.0).to_numpy(dtype=np.float32)
+        np.testing.assert_allclose(features[:, names.index(f"dx_lag{lag}")], expected, atol=1e-4)
+
+
+def test_left_plays_are_mirrored():
+    df = sort_tracking(make_tracking(n_plays=2, seed=2))
+    right = df.assign(play_direction="right")
+    left = right.assign(play_direction="left", x=120.0 - right["x"], y=53.3 - right["y"],
+                        dir=np.mod(right["dir"] + 180.0, 360.0), o=np.mod(right["o"] + 180.0, 360.0),
+                        ball_land_x=120.0 - right["ball_land_x"], ball_land_y=53.3 - right["ball_land_y"])
+    (f_right, names), (f_left, left_names) = compute_kinematic_features(right), compute_kinematic_features(left)
+    assert names == left_names and len(names) == f_right.shape[1]
+    np.testing.assert_allclose(f_left, f_right, atol=1e-3)
+
+
+def test_sort_tracking_orders_by_key():
+    df = make_tracking(n_plays=2, seed=3)
+    shuffled = sort_tracking(df.sample(frac=1.0, random_state=1))
+    keys = shuffled[["game_id", "play_id", "nfl_id", "frame_id"]].to_numpy()
+    assert shuffled.equals(sort_tracking(shuffled))
+    np.testing.assert_array_equal(np.lexsort(keys.T[::-1]), np.arange(len(keys)))
+
+
+def test_transformed_blocks_cover_every_split_row(pipeline_run):
+    artifact = pipeline_run.transformation_artifact
+    for split_dir in (artifact.transformed_train_dir, artifact.transformed_test_dir):
+        features = np.load(os.path.join(split_dir, "features.npy"), mmap_mode="r")
+        targets = np.load(os.path.join(split_dir, "targets.npy"), mmap_mode="r")
+        keys = np.load(os.path.join(split_dir, "keys.npy"), mmap_mode="r")
+        assert features.dtype == np.float32 and len(features) == len(targets) == len(keys) > 0
+        assert np.isfinite(features).all()
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from src.nfl_game_competition.utils.common import load_data, memory_savings_report, write_yaml
+
+
+def _schema(tmp_path) -> str:
+    path = str(tmp_path / "schema.yaml")
+    write_yaml({"schema": [{"name": "play_id", "dtype": "int16"}, {"name": "player_side", "dtype": "category"},
+                           {"name": "player_name", "dtype": "object"}, {"name": "x", "dtype": "float32"}]}, path)
+    return path
+
+
+def test_load_data_uses_compact_schema_dtypes(tmp_path):
+    csv = tmp_path / "input.csv"
+    pd.DataFrame({"play_id": [1, 2, 3], "player_side": ["Offense", "Defense", "Offense"],
+                  "player_name": ["A", "B", "C"], "x": [1.5, 2.5, 3.5]}).to_csv(csv, index=False)
+
+    df = load_data(csv, schema_path=_schema(tmp_path))
+
+    assert df["play_id"].dtype == "int16"
+    assert isinstance(df["player_side"].dtype, pd.CategoricalDtype)
+    assert df["x"].dtype == "float32"
+    assert df["player_side"].tolist() == ["Offense", "Defense", "Offense"]
+    assert (memory_savings_report(df)["saved_bytes"] >= 0).all()
+
+
+def test_load_data_widens_int_that_overflows_schema_dtype(tmp_path):
+    csv = tmp_path / "input.csv"
+    pd.DataFrame({"play_id": [1, 40000], "player_side": ["Offense", "Defense"],
+                  "player_name": ["A", "B"], "x": [0.0, 1.0]}).to_csv(csv, index=False)
+
+    df = load_data(csv, schema_path=_schema(tmp_path))
+
+    assert df["play_id"].tolist() == [1, 40000]
+    assert df["play_id"].dtype == "uint16"
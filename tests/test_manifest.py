@@ -0,0 +1,62 @@
+import os
+
+from src.nfl_game_competition.utils.manifest import IngestionManifest, file_sha256
+
+
+def _write(path, text):
+    path.write_text(text)
+    return path
+
+
+def test_file_entries_follow_content(tmp_path):
+    manifest = IngestionManifest(tmp_path / "manifest.json")
+    source = _write(tmp_path / "input.csv", "a,b\n1,2\n")
+    state = manifest.record_file(source)
+    assert state["hash"] == f"sha256:{file_sha256(source)}"
+    assert manifest.is_file_unchanged(source)
+
+    _write(source, "a,b\n1,3\n")
+    assert not manifest.is_file_unchanged(source)
+    os.remove(source)
+    assert not manifest.is_file_unchanged(source)
+
+
+def test_recorded_hash_is_reused_while_size_and_mtime_hold(tmp_path):
+    manifest = IngestionManifest(tmp_path / "manifest.json")
+    source = _write(tmp_path / "input.csv", "a,b\n1,2\n")
+    state = manifest.record_file(source)
+    manifest.record_file(source, {**state, "hash": "sha256:recorded"})
+    assert manifest.file_state(source)["hash"] == "sha256:recorded"
+    assert manifest.file_state(source, content_hash="crc:1")["hash"] == "crc:1"
+
+
+def test_weeks_survive_a_reload(tmp_path):
+    path = tmp_path / "manifest.json"
+    partition = _write(tmp_path / "part-0.parquet", "rows")
+    sources = {"input_2023_w01.csv": "sha256:in", "output_2023_w01.csv": "sha256:out"}
+    manifest = IngestionManifest(path)
+    manifest.record_week((2023, 1), sources, [str(partition)], rows=10, dtypes=[("x", "float32")])
+    manifest.save()
+
+    reloaded = IngestionManifest(path)
+    assert reloaded.weeks() == [(2023, 1)]
+    assert reloaded.get_week((2023, 1))["dtypes"] == [["x", "float32"]]
+    assert reloaded.is_week_unchanged((2023, 1), sources)
+    assert not reloaded.is_week_unchanged((2023, 1), {**sources, "input_2023_w01.csv": "sha256:new"})
+
+    _write(partition, "other rows")
+    assert not reloaded.is_week_unchanged((2023, 1), sources)
+    reloaded.forget_week((2023, 1))
+    assert reloaded.weeks() == [] and reloaded.get_file(partition) is None
+
+
+def test_equal_week_numbers_of_two_seasons_are_separate_entries(tmp_path):
+    manifest = IngestionManifest(tmp_path / "manifest.json")
+    parts = [_write(tmp_path / f"part-{season}.parquet", str(season)) for season in (2023, 2024)]
+    for season, part in zip((2023, 2024), parts):
+        manifest.record_week((season, 1), {f"input_{season}_w01.csv": f"sha256:{season}"}, [str(part)],
+                             rows=season, dtypes=[])
+    assert manifest.weeks() == [(2023, 1), (2024, 1)]
+    assert manifest.get_week((2023, 1))["rows"] == 2023
+    assert manifest.is_week_unchanged((2024, 1), {"input_2024_w01.csv": "sha256:2024"})
+    assert not manifest.is_week_unchanged((2023, 1), {"input_2024_w01.csv": "sha256:2024"})
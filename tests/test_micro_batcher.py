@@ -0,0 +1,47 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.nfl_game_competition.utils.micro_batcher import MicroBatcher
+
+
+def _double(items):
+    if any(item < 0 for item in items):
+        raise ValueError("negative item")
+    return [item * 2 for item in items]
+
+
+def test_failed_batch_only_fails_the_bad_item():
+    batcher = MicroBatcher(_double, max_batch_size=8, max_wait_ms=200)
+    try:
+        futures = [batcher.submit(item) for item in (1, -1, 3)]
+        assert futures[0].result(timeout=5) == 2
+        assert futures[2].result(timeout=5) == 6
+        with pytest.raises(ValueError):
+            futures[1].result(timeout=5)
+        stats = batcher.stats()
+        assert stats["failed_items"] == 1
+    finally:
+        batcher.close()
+
+
+def test_results_follow_submission_order():
+    batcher = MicroBatcher(_double, max_batch_size=4, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(item) for item in range(10)]
+        assert [f.result(timeout=5) for f in futures] == [item * 2 for item in range(10)]
+    finally:
+        batcher.close()
+
+
+def test_submit_stamps_the_enqueue_time():
+    batcher = MicroBatcher(lambda items: [item.value for item in items], max_batch_size=8, max_wait_ms=50)
+    try:
+        before = time.perf_counter()
+        item = SimpleNamespace(value=1, enqueued_at=None)
+        future = batcher.submit(item)
+        assert before <= item.enqueued_at <= time.perf_counter()
+        assert future.result(timeout=5) == 1
+    finally:
+        batcher.close()
@@ -0,0 +1,90 @@
+import dataclasses
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.nfl_game_competition.components.model_evaluation import (ModelEvaluation, bootstrap_play_rmse,
+                                                                  percentile_interval, rmse, rmse_by_group)
+from src.nfl_game_competition.entity.artifact_entity import ModelTrainerArtifact, RegressionMetricArtifact
+from src.nfl_game_competition.entity.config_entity import ModelEvaluationConfig
+from src.nfl_game_competition.utils.common import read_yaml, save_object
+
+from tests.conftest import SumModel
+
+
+@pytest.fixture
+def evaluation(pipeline_run, tmp_path):
+    """ModelEvaluation factory of a SumModel candidate, saving into tmp_path instead of models/"""
+    config = ModelEvaluationConfig(training_pipeline_config=pipeline_run.pipeline)
+    config.model_evaluation_dir = str(tmp_path / "model_evaluation")
+    config.report_file_path = str(tmp_path / "model_evaluation" / "report.yaml")
+    config.saved_model_file_path = str(tmp_path / "saved_models" / "model.pkl")
+    config.saved_state_file_path = str(tmp_path / "saved_models" / "transformation_state.pkl")
+    config.saved_baseline_file_path = str(tmp_path / "saved_models" / "drift_baseline.json")
+    model_path = str(tmp_path / "model.pkl")
+    save_object(model_path, SumModel())
+    metric = RegressionMetricArtifact(rmse=0.0, rows=0)
+    trainer_artifact = ModelTrainerArtifact(trained_model_file_path=model_path, train_metric_artifact=metric,
+                                            test_metric_artifact=metric)
+
+    def make(validation_status: bool) -> ModelEvaluation:
+        validation_artifact = dataclasses.replace(pipeline_run.validation_artifact,
+                                                  validation_status=validation_status)
+        return ModelEvaluation(data_validation_artifact=validation_artifact,
+                               data_transformation_artifact=pipeline_run.transformation_artifact,
+                               model_trainer_artifact=trainer_artifact, config=config)
+    return make, config
+
+
+def test_first_candidate_is_promoted(evaluation):
+    make, config = evaluation
+    artifact = make(validation_status=True).initiate_model_evaluation()
+    assert artifact.is_model_accepted
+    assert read_yaml(Path(config.report_file_path)).validation_status is True
+    assert os.path.exists(config.saved_model_file_path)
+    assert os.path.exists(config.saved_baseline_file_path)  # drift of later runs is measured against its data
+
+
+def test_failed_validation_blocks_promotion(evaluation):
+    make, config = evaluation
+    artifact = make(validation_status=False).initiate_model_evaluation()
+    assert not artifact.is_model_accepted
+    report = read_yaml(Path(config.report_file_path))
+    assert report.validation_status is False
+    assert report.is_model_accepted is False
+    assert not os.path.exists(config.saved_model_file_path)
+    assert not os.path.exists(config.saved_baseline_file_path)
+
+
+def test_bootstrap_resamples_whole_plays():
+    rng = np.random.default_rng(0)
+    play_codes = rng.integers(0, 20, 500)
+    sq = rng.exponential(size=500)
+    replicates = bootstrap_play_rmse([sq], play_codes, n_bootstrap=50, seed=7, chunk=16)
+
+    draws = np.random.default_rng(7)
+    expected = []
+    for size in (16, 16, 16, 2):
+        for plays in draws.integers(0, 20, size=(size, 20)):
+            rows = np.concatenate([np.flatnonzero(play_codes == p) for p in plays])
+            expected.append(rmse(sq[rows]))
+    np.testing.assert_allclose(replicates[0], expected)
+
+
+def test_bootstrap_replicates_are_paired_across_models():
+    rng = np.random.default_rng(1)
+    play_codes = rng.integers(0, 30, 400)
+    sq = rng.exponential(size=400)
+    replicates = bootstrap_play_rmse([sq, 4 * sq], play_codes, n_bootstrap=100)
+    assert replicates.shape == (2, 100)
+    np.testing.assert_allclose(replicates[1], 2 * replicates[0])
+    low, high = percentile_interval(replicates[0], 0.9)
+    assert low <= rmse(sq) <= high
+
+
+def test_rmse_by_group_matches_per_group_rmse():
+    sq = np.array([1.0, 3.0, 8.0, 0.0])
+    by_group = rmse_by_group(sq, np.array([0, 0, 2, 2]), ["a", "b", "c"])
+    assert by_group == {"a": {"rmse": rmse(sq[:2]), "rows": 2}, "c": {"rmse": rmse(sq[2:]), "rows": 2}}
@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.nfl_game_competition.components.model_trainer import ModelTrainer
+from src.nfl_game_competition.entity.artifact_entity import ModelTunerArtifact
+from src.nfl_game_competition.entity.config_entity import ModelTrainerConfig
+
+
+def _sgd_params(trainer: ModelTrainer) -> dict:
+    return trainer._build_model().estimator.estimator.get_params()
+
+
+def test_tuned_params_override_only_what_was_searched(pipeline_run):
+    tuned = ModelTunerArtifact(best_params_file_path="", trial_log_file_path="", estimator="sgd",
+                               best_params={"alpha": 0.01}, best_rmse=1.0)
+    trainer = ModelTrainer(data_transformation_artifact=pipeline_run.transformation_artifact,
+                           config=ModelTrainerConfig(training_pipeline_config=pipeline_run.pipeline),
+                           model_tuner_artifact=tuned)
+    params = _sgd_params(trainer)
+    assert params["alpha"] == 0.01
+    assert (params["learning_rate"], params["eta0"], params["penalty"]) == ("invscaling", 0.01, "l2")
+
+
+def test_untuned_model_uses_params_yaml(pipeline_run):
+    trainer = ModelTrainer(data_transformation_artifact=pipeline_run.transformation_artifact,
+                           config=ModelTrainerConfig(training_pipeline_config=pipeline_run.pipeline))
+    assert _sgd_params(trainer)["alpha"] == 0.0001
+
+
+def test_folds_keep_every_play_in_one_fold(pipeline_run):
+    config = ModelTrainerConfig(training_pipeline_config=pipeline_run.pipeline)
+    trainer = ModelTrainer(data_transformation_artifact=pipeline_run.transformation_artifact, config=config)
+    fold_ids = trainer._assign_folds(n_splits=3)
+    keys = np.load(os.path.join(pipeline_run.transformation_artifact.transformed_train_dir, config.keys_file_name))
+
+    folds_per_play = pd.DataFrame({"game_id": keys[:, 0], "play_id": keys[:, 1], "fold": fold_ids}) \
+        .groupby(["game_id", "play_id"])["fold"].nunique()
+    assert (folds_per_play == 1).all()
+    assert set(np.unique(fold_ids)) == {0, 1, 2}
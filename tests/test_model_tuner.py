@@ -0,0 +1,134 @@
+import math
+
+import numpy as np
+import pytest
+import yaml
+
+from src.nfl_game_competition.components.model_tuner import ModelTuner, _run_trial, sample_search_space
+from src.nfl_game_competition.entity.artifact_entity import DataTransformationArtifact
+from src.nfl_game_competition.entity.config_entity import ModelTunerConfig, TrainingPipelineConfig
+from src.nfl_game_competition.exception import NFLGameCompetitionException
+from src.nfl_game_competition.utils.common import save_object
+from src.nfl_game_competition.utils.batch_stream import MiniBatchStream
+from src.nfl_game_competition.utils.model_utils import fit_incremental
+
+SPACE = {"alpha": {"type": "loguniform", "low": 1e-5, "high": 1e-1},
+         "eta0": {"type": "uniform", "low": 0.001, "high": 0.1},
+         "max_iter": {"type": "int", "low": 1, "high": 3},
+         "penalty": {"type": "choice", "values": ["l2", "l1"]}}
+
+
+def test_configurations_stay_inside_the_space():
+    configs = sample_search_space(SPACE, 50, seed=7)
+    assert len(configs) == 50
+    for config in configs:
+        assert 1e-5 <= config["alpha"] <= 1e-1
+        assert 0.001 <= config["eta0"] <= 0.1
+        assert config["max_iter"] in (1, 2, 3)
+        assert config["penalty"] in ("l2", "l1")
+    # loguniform spreads over decades instead of piling up near the high end
+    assert min(math.log10(c["alpha"]) for c in configs) < -3
+
+
+def test_same_seed_same_configurations():
+    assert sample_search_space(SPACE, 5, seed=1) == sample_search_space(SPACE, 5, seed=1)
+    assert sample_search_space(SPACE, 5, seed=1) != sample_search_space(SPACE, 5, seed=2)
+
+
+def test_unknown_type_is_rejected():
+    with pytest.raises(ValueError):
+        sample_search_space({"alpha": {"type": "normal"}}, 3, seed=0)
+
+
+class _RowRecorder:
+    """stands in for IncrementalRegressor: records the row ids of the scaler pass and of every fit batch"""
+    def __init__(self):
+        self.scaler_rows, self.fit_rows = [], []
+
+    def partial_fit_scaler(self, X):
+        self.scaler_rows += X[:, 0].tolist()
+        return self
+
+    def partial_fit(self, X, Y):
+        self.fit_rows += X[:, 0].tolist()
+        return self
+
+
+def test_rung_subset_is_shared_by_passes_and_configurations(tmp_path):
+    np.save(tmp_path / "features.npy", np.arange(1000, dtype=np.float32).reshape(-1, 1).repeat(2, axis=1))
+    np.save(tmp_path / "targets.npy", np.zeros((1000, 2), dtype=np.float32))
+    stream = MiniBatchStream([str(tmp_path)], batch_size=50)
+    models = [fit_incremental(_RowRecorder(), stream, epochs=3, seed=trial_seed, max_rows=200, subset_seed=7)
+              for trial_seed in (1, 2)]
+    rows = sorted(models[0].scaler_rows)
+    assert len(rows) == 200
+    for model in models:
+        assert sorted(model.scaler_rows) == rows
+        assert sorted(model.fit_rows) == sorted(rows * 3)  # every epoch passes over exactly the subset
+
+
+FEATURES = ["x", "y", "s", "a"]
+
+
+def _train_block(split_dir, seed=0, plays=40, frames=25):
+    """features / targets / keys of a small transformed train split"""
+    rng = np.random.default_rng(seed)
+    n = plays * frames
+    features = rng.normal(size=(n, len(FEATURES))).astype(np.float32) * 10
+    split_dir.mkdir(parents=True, exist_ok=True)
+    np.save(split_dir / "features.npy", features)
+    np.save(split_dir / "targets.npy", (features[:, :2] + rng.normal(size=(n, 2))).astype(np.float32))
+    play = np.repeat(np.arange(plays), frames)
+    np.save(split_dir / "keys.npy", np.stack([2023090700 + play // 10, play, np.zeros(n, dtype=np.int64),
+                                              np.tile(np.arange(frames), plays)], axis=1).astype(np.int32))
+    return split_dir
+
+
+def _trial(split_dir, params, estimator="sgd"):
+    np.save(split_dir / "holdout.npy", np.arange(800, 1000))
+    return _run_trial(0, 0, 400, estimator, params, FEATURES, ["x", "y"], str(split_dir),
+                      str(split_dir / "holdout.npy"), 1, 100, 0, 0, "features.npy", "targets.npy")
+
+
+def test_diverged_configuration_loses_the_trial(tmp_path):
+    split_dir = _train_block(tmp_path / "train")
+    assert _trial(split_dir, {"eta0": 1e300, "learning_rate": "constant"})["rmse"] is None
+    assert np.isfinite(_trial(split_dir, {"eta0": 0.01})["rmse"])
+
+
+def test_invalid_parameter_stops_the_search(tmp_path):
+    with pytest.raises(RuntimeError, match="penalty"):
+        _trial(_train_block(tmp_path / "train"), {"penalty": "bogus"})
+
+
+def _tuner(tmp_path, eta0):
+    params = {"model_trainer": {"anchor_cols": ["x", "y"], "sgd": {"learning_rate": "constant"}},
+              "model_tuner": {"estimator": "sgd", "n_trials": 2, "eta": 2, "min_rows": 200, "max_rows": 400,
+                              "epochs": 1, "holdout_fraction": 0.2, "workers": 1,
+                              "search_space": {"sgd": {"eta0": {"type": "uniform", "low": eta0, "high": eta0}}}}}
+    (tmp_path / "params.yaml").write_text(yaml.safe_dump(params))
+    pipeline_config = TrainingPipelineConfig()
+    pipeline_config.artifact_dir = str(tmp_path / "run")
+    config = ModelTunerConfig(training_pipeline_config=pipeline_config)
+    config.params_file_path = str(tmp_path / "params.yaml")
+    config.trial_log_file_path = str(tmp_path / "trial_log.jsonl")
+    save_object(tmp_path / "state.pkl", {"version": "test", "feature_names": FEATURES})
+    artifact = DataTransformationArtifact(transformed_train_dir=str(_train_block(tmp_path / "train")),
+                                          transformed_test_dir=str(tmp_path / "test"),
+                                          transformation_state_file_path=str(tmp_path / "state.pkl"))
+    return ModelTuner(data_transformation_artifact=artifact, config=config)
+
+
+def test_search_without_a_finite_final_trial_fails(tmp_path):
+    with pytest.raises(NFLGameCompetitionException, match="diverged"):
+        _tuner(tmp_path, eta0=1e300).initiate_model_tuner()
+    assert not (tmp_path / "run" / "model_tuner" / "best_params.yaml").exists()
+
+
+def test_search_id_follows_the_train_block_content(tmp_path):
+    tuner = _tuner(tmp_path, eta0=0.01)
+    state, space = {"version": "test", "feature_names": FEATURES}, {"eta0": {"type": "uniform"}}
+    before = tuner._search_id(space, state, train_rows=800)
+    assert tuner._search_id(space, state, train_rows=800) == before
+    _train_block(tmp_path / "train", seed=1)  # re-transformed data, same row count
+    assert tuner._search_id(space, state, train_rows=800) != before
@@ -0,0 +1,75 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.nfl_game_competition.components.data_transformation import (compute_features, compute_neighbor_features,
+                                                                     sort_tracking)
+from src.nfl_game_competition.utils.common import play_keys
+from src.nfl_game_competition.utils.tracking_index import TrackingIndex, pack_keys
+
+from tests.conftest import make_tracking
+
+
+def _brute_force(df, k, radius):
+    """one python loop per row: distances to every other player of the same frame"""
+    x, y, offense = df["x"].to_numpy(), df["y"].to_numpy(), (df["player_side"] == "Offense").to_numpy()
+    frame = df[["game_id", "play_id", "frame_id"]].astype(np.int64).to_numpy()
+    opp, mate, opp_within = np.full((len(df), k), 120.0), np.full((len(df), k), 120.0), np.zeros(len(df))
+    for i in range(len(df)):
+        others = np.flatnonzero((frame == frame[i]).all(axis=1))
+        others = others[others != i]
+        dist = np.hypot(x[others] - x[i], y[others] - y[i])
+        opp_d = np.sort(dist[offense[others] != offense[i]])[:k]
+        mate_d = np.sort(dist[offense[others] == offense[i]])[:k]
+        opp[i, :len(opp_d)], mate[i, :len(mate_d)] = opp_d, mate_d
+        opp_within[i] = (dist[offense[others] != offense[i]] <= radius).sum()
+    return opp, mate, opp_within
+
+
+def test_matches_brute_force_distances():
+    df = make_tracking(n_plays=2, seed=4).sample(frac=1.0, random_state=2).reset_index(drop=True)
+    df = df[df["frame_id"] <= 3].reset_index(drop=True)  # keep the python reference small
+    assert df["frame_id"].nunique() > 1 and len(df) > 20
+    zeros = np.zeros(len(df), dtype=np.float32)
+    features, names = compute_neighbor_features(
+        df["game_id"].to_numpy(), df["play_id"].to_numpy(), df["frame_id"].to_numpy(),
+        (df["player_side"] == "Offense").to_numpy(), (df["player_role"] == "Targeted Receiver").to_numpy(),
+        df["x"].to_numpy(dtype=np.float32), df["y"].to_numpy(dtype=np.float32), zeros, zeros, k=2, radius=5.0,
+        chunk_bytes=1)  # one frame per chunk, exercises the chunk loop
+    opp, mate, opp_within = _brute_force(df, k=2, radius=5.0)
+    np.testing.assert_allclose(features[:, [names.index("opp_dist_1"), names.index("opp_dist_2")]], opp, atol=1e-3)
+    np.testing.assert_allclose(features[:, [names.index("mate_dist_1"), names.index("mate_dist_2")]], mate, atol=1e-3)
+    np.testing.assert_array_equal(features[:, names.index("opp_within_5")], opp_within)
+
+
+def test_lone_player_gets_field_length_and_no_closing_speed():
+    one = np.array([1])
+    features, names = compute_neighbor_features(one * 2023090700, one, one, np.array([True]), np.array([False]),
+                                                np.array([10.0]), np.array([20.0]), np.array([1.0]), np.array([0.0]))
+    row = dict(zip(names, features[0]))
+    assert row["opp_dist_1"] == row["mate_dist_1"] == row["dist_to_targeted"] == 120.0
+    assert row["opp_rel_vx"] == row["opp_closing_1"] == 0.0
+
+
+def test_training_and_serving_build_the_same_neighbor_features(pipeline_run):
+    """transformed train rows carry the neighbour features serving computes from the full input frame"""
+    run = pipeline_run
+    train_dir = run.transformation_artifact.transformed_train_dir
+    features = np.load(os.path.join(train_dir, run.transformation.features_file_name), mmap_mode="r")
+    keys = np.load(os.path.join(train_dir, run.transformation.keys_file_name), mmap_mode="r")
+    inputs = pd.read_csv(glob.glob(os.path.join(run.raw_dir, "train", "input_*_w01.csv"))[0])
+    plays = np.unique(keys[:, :2], axis=0)
+    plays = plays[np.isin(plays[:, 0], inputs["game_id"].unique())][:5]
+    inputs = inputs[np.isin(play_keys(inputs["game_id"], inputs["play_id"]), play_keys(plays[:, 0], plays[:, 1]))]
+    assert inputs["player_to_predict"].nunique() == 2  # neighbours include players that are not predicted
+
+    serving, names = compute_features(sort_tracking(inputs.reset_index(drop=True)), run.transformation.lags,
+                                      run.transformation.neighbors_k, run.transformation.neighbor_radius)
+    serving_keys = sort_tracking(inputs.reset_index(drop=True))[["game_id", "play_id", "nfl_id", "frame_id"]]
+    rows = TrackingIndex.from_frame(serving_keys).lookup(pack_keys(*keys.T))
+    trained = rows >= 0
+    assert trained.sum() > 50
+    neighbor_cols = [names.index(c) for c in names if c.startswith(("opp_", "mate_")) or c == "dist_to_targeted"]
+    np.testing.assert_allclose(features[trained][:, neighbor_cols], serving[rows[trained]][:, neighbor_cols], atol=1e-5)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.nfl_game_competition.components.data_transformation import (compute_features, normalize_play_direction,
+                                                                     sort_tracking)
+from src.nfl_game_competition.pipeline.predict_pipeline import PhysicsBaselinePredictor
+from src.nfl_game_competition.utils.physics import extrapolate, travel_distance
+from tests.conftest import make_tracking
+
+
+def test_travel_distance_clamps_speed_at_zero_and_max():
+    t = np.array([1.0, 3.0, 4.0])
+    # 2 yd/s decelerating at 1 yd/s^2 stops after 2 s, having covered 2 yd
+    np.testing.assert_allclose(travel_distance(np.full(3, 2.0), np.full(3, -1.0), t), [1.5, 2.0, 2.0])
+    # 10 yd/s accelerating at 2 yd/s^2 reaches 12 yd/s after 1 s (11 yd), then stays there
+    np.testing.assert_allclose(travel_distance(np.full(3, 10.0), np.full(3, 2.0), t), [11.0, 35.0, 47.0])
+    np.testing.assert_allclose(travel_distance(np.full(3, 5.0), np.zeros(3), t), 5.0 * t)
+
+
+def test_extrapolate_broadcasts_players_over_horizons():
+    t = np.arange(1, 4, dtype=np.float32) * 0.5
+    px, py = extrapolate(np.array([[10.0], [50.0]]), np.array([[20.0], [20.0]]), np.array([[2.0], [0.0]]),
+                         np.array([[0.0], [-4.0]]), t[None, :])
+    assert px.shape == py.shape == (2, 3) and px.dtype == np.float32
+    np.testing.assert_allclose(px, [[11.0, 12.0, 13.0], [50.0, 50.0, 50.0]])
+    np.testing.assert_allclose(py, [[20.0, 20.0, 20.0], [18.0, 16.0, 14.0]])
+
+
+def test_extrapolate_clips_to_field_and_steers_to_ball():
+    px, py = extrapolate(np.array([119.0]), np.array([1.0]), np.array([5.0]), np.array([-5.0]), np.array([2.0]))
+    assert (px[0], py[0]) == (120.0, 0.0)
+
+    fx, fy = extrapolate(np.array([50.0]), np.array([20.0]), np.array([5.0]), np.array([0.0]), np.array([1.0]),
+                         ball_x=np.array([50.0]), ball_y=np.array([40.0]), steer=1.0)
+    np.testing.assert_allclose([fx[0], fy[0]], [50.0, 25.0], atol=1e-5)
+
+
+def test_extrapolate_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        extrapolate(0.0, 0.0, 1.0, 0.0, 1.0, mode="spline")
+
+
+def test_physics_features_extrapolate_the_last_input_frame_to_the_target_frame():
+    """row k pairs with output frame k: phys_x / phys_y is the baseline position of that frame"""
+    tracking = sort_tracking(make_tracking(n_plays=2))
+    features, names = compute_features(tracking, [1, 2, 3], physics_mode="ca", physics_steer=0.5)
+    last, positions, _ = PhysicsBaselinePredictor(mode="ca", steer=0.5, clip=True).predict_trajectories(tracking)
+    keys = ["game_id", "play_id", "nfl_id"]
+    player = tracking[keys].merge(last[keys].reset_index(), on=keys, how="left")["index"].to_numpy()
+    k = tracking["frame_id"].to_numpy()
+    rows = np.flatnonzero(~np.isnan(player) & (k <= positions.shape[1]))
+    player = player[rows].astype(np.int64)
+    left = (tracking["play_direction"] == "left").to_numpy()[rows]
+    x, y = normalize_play_direction(positions[player, k[rows] - 1, 0], positions[player, k[rows] - 1, 1], left)
+    assert len(rows) > 20
+    np.testing.assert_allclose(features[rows, names.index("phys_x")], x, atol=1e-3)
+    np.testing.assert_allclose(features[rows, names.index("phys_y")], y, atol=1e-3)
+
+    # training rows (a subset joined to the full input tracking) get the same anchor
+    subset = tracking[tracking["frame_id"] <= 5].reset_index(drop=True)
+    training, _ = compute_features(subset, [1, 2, 3], physics_mode="ca", physics_steer=0.5, tracking=tracking)
+    phys = [names.index("phys_x"), names.index("phys_y")]
+    np.testing.assert_allclose(training[:, phys], features[np.flatnonzero(tracking["frame_id"] <= 5)][:, phys])
+
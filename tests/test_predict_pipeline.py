@@ -0,0 +1,95 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from src.nfl_game_competition.entity.predict_entity import PredictionRequest
+from src.nfl_game_competition.pipeline.predict_pipeline import PredictPipeline
+
+
+def _play(tracking: pd.DataFrame, i: int) -> pd.DataFrame:
+    keys = tracking[["game_id", "play_id"]].drop_duplicates().iloc[i]
+    return tracking[(tracking["game_id"] == keys["game_id"]) & (tracking["play_id"] == keys["play_id"])]
+
+
+def _separately(config, requests):
+    return [PredictPipeline(config).predict([request])[0].predictions for request in requests]
+
+
+def test_same_play_twice_in_a_batch_matches_separate_calls(model_config, tracking):
+    play = _play(tracking, 0)
+    early = play[play["frame_id"] <= play["frame_id"].max() - 3]  # same play, fewer frames so far
+    requests = [PredictionRequest(tracking=play, request_id="full"),
+                PredictionRequest(tracking=early, request_id="early"),
+                PredictionRequest(tracking=_play(tracking, 1), request_id="other"),
+                PredictionRequest(tracking=play.copy(), request_id="full again")]
+
+    batched = PredictPipeline(model_config).predict(requests)
+
+    assert [r.request_id for r in batched] == ["full", "early", "other", "full again"]
+    for response, expected in zip(batched, _separately(model_config, requests)):
+        assert response.batch_size == len(requests)
+        pdt.assert_frame_equal(response.predictions, expected)
+
+
+def test_batch_of_distinct_plays_matches_separate_calls(model_config, tracking):
+    requests = [PredictionRequest(tracking=_play(tracking, i), request_id=str(i)) for i in range(3)]
+    batched = PredictPipeline(model_config).predict(requests)
+    for response, expected in zip(batched, _separately(model_config, requests)):
+        pdt.assert_frame_equal(response.predictions, expected)
+        assert set(zip(response.predictions["game_id"], response.predictions["play_id"])) == \
+            set(zip(expected["game_id"], expected["play_id"]))
+
+
+def test_output_frames_past_the_input_history_keep_moving(model_config, tracking):
+    """frames after the last input frame get their own horizon instead of repeating its prediction"""
+    play = _play(tracking, 0)
+    early = play[play["frame_id"] <= 3]
+    predictions = PredictPipeline(model_config).predict([PredictionRequest(tracking=early)])[0].predictions
+    for _, player in predictions.groupby("nfl_id"):
+        beyond = player[player["frame_id"] > 3]
+        assert len(beyond) > 2
+        assert np.all(np.diff(beyond["x"].to_numpy()) != 0)
+
+
+def test_latency_recorded_once_per_request(model_config, tracking):
+    pipeline = PredictPipeline(model_config)
+    play = _play(tracking, 0)
+    pipeline.predict([PredictionRequest(tracking=play), PredictionRequest(tracking=play),
+                      PredictionRequest(tracking=_play(tracking, 1))])
+    assert pipeline.latency.report().count == 3
+
+
+def test_latency_includes_the_queue_wait(model_config, tracking):
+    pipeline = PredictPipeline(model_config)
+    queued = PredictionRequest(tracking=_play(tracking, 0), enqueued_at=time.perf_counter() - 0.5)
+    direct = PredictionRequest(tracking=_play(tracking, 1))
+    responses = pipeline.predict([queued, direct])
+    assert responses[0].latency_ms >= 500.0
+    assert responses[1].latency_ms < responses[0].latency_ms
+
+
+def test_physics_fallback_without_model(tmp_path, tracking):
+    from src.nfl_game_competition.entity.config_entity import PredictPipelineConfig
+    config = PredictPipelineConfig()
+    config.model_file_path, config.state_file_path = str(tmp_path / "none.pkl"), str(tmp_path / "none_state.pkl")
+    config.physics_fallback = True
+    play = _play(tracking, 0)
+    response = PredictPipeline(config).predict([PredictionRequest(tracking=play), PredictionRequest(tracking=play)])
+    assert response[0].model_version == "physics"
+    pdt.assert_frame_equal(response[0].predictions, response[1].predictions)
+    predicted = play[play["player_to_predict"]].groupby("nfl_id")["num_frames_output"].first().sum()
+    assert len(response[0].predictions) == predicted
+
+
+def test_physics_fallback_uses_the_configured_mode(tmp_path, tracking):
+    from src.nfl_game_competition.entity.config_entity import PredictPipelineConfig
+    from src.nfl_game_competition.pipeline.predict_pipeline import PhysicsBaselinePredictor
+    config = PredictPipelineConfig()
+    config.model_file_path, config.state_file_path = str(tmp_path / "none.pkl"), str(tmp_path / "none_state.pkl")
+    play = _play(tracking, 0)
+    for mode, steer in [("ca", 0.5), ("cv", 0.0)]:
+        config.physics_mode, config.physics_steer = mode, steer
+        response = PredictPipeline(config).predict([PredictionRequest(tracking=play)])[0]
+        pdt.assert_frame_equal(response.predictions, PhysicsBaselinePredictor(mode=mode, steer=steer).predict(play))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from src.nfl_game_competition.utils.sequence_store import SequenceStore, build_sequence_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    """3 players: 4 input rows (2 targets), 2 rows (5 targets, capped at 2), 3 rows (1 target)"""
+    keys = np.array([[2023090700, 1, 10]] * 4 + [[2023090700, 1, 11]] * 2 + [[2023090700, 2, 10]] * 3)
+    features = np.arange(len(keys) * 2, dtype=np.float32).reshape(-1, 2)
+    targets = np.stack([np.arange(len(keys)), -np.arange(len(keys))], axis=1).astype(np.float32)
+    np.save(tmp_path / "keys.npy", keys)
+    np.save(tmp_path / "features.npy", features)
+    np.save(tmp_path / "targets.npy", targets)
+    assert build_sequence_store(tmp_path, np.array([2] * 4 + [5] * 2 + [1] * 3)) == 3
+    return SequenceStore(tmp_path), features, targets
+
+
+def test_sequences_are_slices_of_the_blocks(store):
+    sequences, features, targets = store
+    np.testing.assert_array_equal(sequences.input_lengths, [4, 2, 3])
+    np.testing.assert_array_equal(sequences.target_lengths, [2, 2, 1])
+    inputs, trajectory = sequences[1]
+    np.testing.assert_array_equal(inputs, features[4:6])
+    np.testing.assert_array_equal(trajectory, targets[4:6])
+
+
+def test_find_by_play_and_player(store):
+    sequences, _, _ = store
+    np.testing.assert_array_equal(sequences.find(2023090700, 1), [0, 1])
+    np.testing.assert_array_equal(sequences.find(2023090700, 1, 11), [1])
+    assert sequences.find(2023090700, 1, 12).size == 0
+    assert sequences.find(2023090700, 3).size == 0
+
+
+def test_padded_batch_aligns_histories_right_and_trajectories_left(store):
+    sequences, features, targets = store
+    inputs, in_mask, trajectories, t_mask = sequences.padded_batch(np.array([1, 0]), max_input_len=3)
+    assert inputs.shape == (2, 3, 2) and trajectories.shape == (2, 2, 2)
+    np.testing.assert_array_equal(in_mask, [[False, True, True], [True, True, True]])
+    np.testing.assert_array_equal(inputs[0, 1:], features[4:6])
+    np.testing.assert_array_equal(inputs[0, 0], [0, 0])
+    np.testing.assert_array_equal(inputs[1], features[1:4])  # most recent 3 of 4 frames
+    np.testing.assert_array_equal(trajectories[1], targets[0:2])
+    assert t_mask.all()
@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.nfl_game_competition.utils.common import (load_feature_store, load_split_data, load_split_keys, play_keys,
+                                                   save_split_keys)
+
+
+def test_play_keys_are_unique_and_keep_key_order():
+    game_id = np.array([2023090700, 2023090700, 2023090701, 2024010100])
+    play_id = np.array([1, 65535, 0, 12])
+    keys = play_keys(game_id, play_id)
+    assert len(np.unique(keys)) == len(keys)
+    assert np.all(np.diff(keys) > 0)
+    np.testing.assert_array_equal(keys >> 16, game_id)
+    np.testing.assert_array_equal(keys & 0xFFFF, play_id)
+
+
+def test_split_keys_roundtrip(tmp_path):
+    keys = np.array([[2023090700, 56], [2023090700, 80]])
+    save_split_keys(tmp_path / "split" / "train_keys.npy", keys)
+    loaded = load_split_keys(tmp_path / "split" / "train_keys.npy")
+    assert loaded.dtype == np.int32
+    np.testing.assert_array_equal(loaded, keys)
+
+
+def test_train_and_test_plays_partition_the_store(pipeline_run):
+    artifact = pipeline_run.ingestion_artifact
+    train, test = load_split_keys(artifact.train_file_path), load_split_keys(artifact.test_file_path)
+    train_plays, test_plays = play_keys(train[:, 0], train[:, 1]), play_keys(test[:, 0], test[:, 1])
+    assert not np.intersect1d(train_plays, test_plays).size
+
+    store = load_feature_store(artifact.feature_store_file_path, columns=["game_id", "play_id"])
+    all_plays = np.unique(play_keys(store["game_id"].to_numpy(), store["play_id"].to_numpy()))
+    np.testing.assert_array_equal(np.union1d(train_plays, test_plays), all_plays)
+
+    rows = load_split_data(artifact.feature_store_file_path, artifact.test_file_path, columns=["game_id", "play_id", "x"])
+    assert set(play_keys(rows["game_id"].to_numpy(), rows["play_id"].to_numpy())) == set(test_plays)
@@ -0,0 +1,77 @@
+import json
+import os
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+
+from src.nfl_game_competition.utils.manifest import IngestionManifest
+from src.nfl_game_competition.utils.stage_cache import HASHES_FILE_NAME, StageCache
+
+MODULE = "src.nfl_game_competition.utils.stage_cache"
+
+
+@dataclass
+class OutputArtifact:
+    output_file_path: str
+    rows: int
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StageCache(str(tmp_path / "cache"), max_bytes=1 << 30, max_age_days=30, run_dir=str(tmp_path / "run"),
+                      ingestion_manifest_path=str(tmp_path / "ingestion_manifest.json"))
+
+
+def _key(cache, *inputs):
+    return cache.key("stage", SimpleNamespace(setting=1), MODULE, list(inputs))
+
+
+def test_rewrite_with_same_size_and_mtime_changes_the_key(cache, tmp_path):
+    source = tmp_path / "input.csv"
+    source.write_text("a,b\n1,2\n")
+    before = _key(cache, str(source))
+    stat = os.stat(source)
+    source.write_text("a,b\n9,9\n")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _key(cache, str(source)) != before
+
+
+def test_rewrite_with_same_content_keeps_the_key(cache, tmp_path):
+    source = tmp_path / "inputs" / "input.csv"
+    source.parent.mkdir()
+    source.write_text("a,b\n1,2\n")
+    before = _key(cache, str(source.parent))
+    source.write_text("a,b\n1,2\n")
+    os.utime(source, ns=(0, 10 ** 9))
+    assert _key(cache, str(source.parent)) == before
+
+
+def test_ingestion_manifest_hashes_are_reused(cache, tmp_path):
+    source = tmp_path / "raw" / "input_2023_w01.csv"
+    source.parent.mkdir()
+    source.write_text("a,b\n1,2\n")
+    manifest = IngestionManifest(cache.ingestion_manifest_path)
+    manifest.record_file(source, {**manifest.file_state(source), "hash": "sha256:recorded"})
+    manifest.save()
+    first = _key(cache, str(source.parent))
+    hashes = json.loads((tmp_path / "cache" / HASHES_FILE_NAME).read_text())
+    assert str(source) not in hashes["files"]
+
+    manifest.record_file(source, {**manifest.file_state(source), "hash": "sha256:other"})
+    manifest.save()
+    assert _key(cache, str(source.parent)) != first
+
+
+def test_store_and_load_move_outputs_into_the_cache(cache, tmp_path):
+    output_dir = tmp_path / "run" / "stage"
+    output_dir.mkdir(parents=True)
+    (output_dir / "out.npy").write_bytes(b"rows")
+    key = _key(cache, 1)
+    assert cache.load("stage", key) is None
+    stored = cache.store("stage", key, OutputArtifact(str(output_dir / "out.npy"), 4), str(output_dir))
+    assert stored.output_file_path.startswith(str(tmp_path / "cache"))
+    assert cache.load("stage", key) == stored
+
+    os.remove(stored.output_file_path)
+    assert cache.load("stage", key) is None
@@ -0,0 +1,30 @@
+import filecmp
+import json
+
+import pandas as pd
+
+from benchmarks.synthetic_data import BASE_ROWS, INPUT_COLS, META_FILE_NAME, OUTPUT_COLS, write_weeks
+
+
+def test_weeks_match_competition_layout_and_scale(tmp_path):
+    meta = write_weeks(str(tmp_path), scale=0.01, weeks=2)
+    assert json.loads((tmp_path / META_FILE_NAME).read_text()) == meta
+    assert abs(meta["output_rows"] - 0.01 * BASE_ROWS) / (0.01 * BASE_ROWS) < 0.25
+
+    inputs = pd.read_csv(tmp_path / "train" / "input_2023_w01.csv")
+    outputs = pd.read_csv(tmp_path / "train" / "output_2023_w01.csv")
+    assert list(inputs.columns) == INPUT_COLS and list(outputs.columns) == OUTPUT_COLS
+    assert not inputs.duplicated(["game_id", "play_id", "nfl_id", "frame_id"]).any()
+    targets = inputs.loc[inputs["player_to_predict"], ["game_id", "play_id", "nfl_id"]].drop_duplicates()
+    predicted = outputs[["game_id", "play_id", "nfl_id"]].drop_duplicates()
+    assert len(predicted.merge(targets)) == len(predicted)
+    assert (outputs.groupby(["game_id", "play_id", "nfl_id"])["frame_id"].min() == 1).all()
+
+
+def test_same_seed_gives_identical_files(tmp_path):
+    write_weeks(str(tmp_path / "a"), scale=0.002, weeks=1, seed=3)
+    write_weeks(str(tmp_path / "b"), scale=0.002, weeks=1, seed=3)
+    write_weeks(str(tmp_path / "c"), scale=0.002, weeks=1, seed=4)
+    files = ["input_2023_w01.csv", "output_2023_w01.csv"]
+    assert filecmp.cmpfiles(tmp_path / "a" / "train", tmp_path / "b" / "train", files, shallow=False)[0] == files
+    assert not filecmp.cmp(tmp_path / "a" / "train" / files[0], tmp_path / "c" / "train" / files[0], shallow=False)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.nfl_game_competition.utils.tracking_index import (KEY_COLS, TrackingIndex, pack_game_id, pack_keys,
+                                                           sorted_merge_join, unpack_game_id, unpack_keys)
+
+
+def _keys(n: int = 500, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    games = rng.choice([2023090700, 2023091001, 2023123199, 2024010127], n)
+    return pd.DataFrame({"game_id": games, "play_id": rng.integers(1, 16384, n),
+                         "nfl_id": rng.integers(0, 131072, n), "frame_id": rng.integers(1, 512, n)})
+
+
+def test_pack_unpack_roundtrip():
+    df = _keys()
+    unpacked = unpack_keys(pack_keys(*(df[c].to_numpy() for c in KEY_COLS)))
+    for column, values in zip(KEY_COLS, unpacked):
+        np.testing.assert_array_equal(values, df[column].to_numpy())
+
+
+def test_packed_order_is_key_order():
+    df = _keys()
+    packed = pack_keys(*(df[c].to_numpy() for c in KEY_COLS))
+    expected = df.sort_values(KEY_COLS, kind="stable").index.to_numpy()
+    np.testing.assert_array_equal(np.argsort(packed, kind="stable"), expected)
+
+
+@pytest.mark.parametrize("game_id", [1999090700, 2128090700, 2023990700, 2023093200, -1])
+def test_game_id_outside_its_fields_is_rejected(game_id):
+    with pytest.raises(ValueError):
+        pack_game_id(np.array([game_id]))
+
+
+def test_largest_game_fields_fit():
+    assert unpack_game_id(pack_game_id(np.array([2127153199])))[0] == 2127153199
+
+
+@pytest.mark.parametrize("column, value", [("play_id", 16384), ("nfl_id", 131072), ("frame_id", 512), ("frame_id", -1)])
+def test_other_fields_are_range_checked(column, value):
+    df = _keys(3)
+    df.loc[0, column] = value
+    with pytest.raises(ValueError):
+        pack_keys(*(df[c].to_numpy() for c in KEY_COLS))
+
+
+def test_rows_of_key_prefixes_match_masks():
+    df = _keys(2000)
+    index = TrackingIndex.from_frame(df)
+    assert not index.is_sorted
+    game, play, nfl = df.iloc[7][["game_id", "play_id", "nfl_id"]]
+    np.testing.assert_array_equal(np.sort(index.rows(game)), np.flatnonzero(df["game_id"] == game))
+    mask = (df["game_id"] == game) & (df["play_id"] == play)
+    np.testing.assert_array_equal(np.sort(index.rows(game, play)), np.flatnonzero(mask))
+    mask &= df["nfl_id"] == nfl
+    np.testing.assert_array_equal(np.sort(index.rows(game, play, nfl)), np.flatnonzero(mask))
+    with pytest.raises(ValueError):
+        index.rows(game, None, nfl)
+
+
+def test_lookup_finds_rows_and_flags_missing_keys():
+    df = _keys(100).drop_duplicates(KEY_COLS).reset_index(drop=True)
+    index = TrackingIndex.from_frame(df)
+    packed = pack_keys(*(df[c].to_numpy() for c in KEY_COLS))
+    np.testing.assert_array_equal(index.lookup(packed), np.arange(len(df)))
+    assert index.lookup(pack_keys([2025010101], [1], [1], [1]))[0] == -1
+
+
+def test_sorted_merge_join_matches_pd_merge():
+    left = _keys(3000, seed=1).drop_duplicates(KEY_COLS)
+    right = pd.concat([left.sample(frac=0.5, random_state=0), _keys(500, seed=2)]).drop_duplicates(KEY_COLS)
+    left = left.assign(x=np.arange(len(left)), shared=1.0)
+    right = right.assign(target_x=np.arange(len(right)) * 2.0, shared=2.0)
+    expected = pd.merge(left, right, on=KEY_COLS, how="inner").sort_values(KEY_COLS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(sorted_merge_join(left, right), expected, check_dtype=False)
+
+
+def test_sorted_merge_join_rejects_duplicate_right_keys():
+    left = _keys(10)
+    with pytest.raises(ValueError):
+        sorted_merge_join(left, pd.concat([left, left.iloc[:1]]))